@@ -0,0 +1,191 @@
+# Config/cache.py
+"""
+Cache دو لایه:
+    - جلو: LocMemCache داخل همان پروسه (LRU، با TTL کوتاه)
+    - پشت: یک cache مشترک بین همه‌ی workerها (Redis یا جدول دیتابیس)
+
+خواندن‌ها اول از لایه‌ی جلو جواب داده می‌شوند؛ نوشتن‌ها به هر دو می‌روند.
+شمارنده‌ها (incr/decr) همیشه مستقیم روی لایه‌ی مشترک اجرا می‌شوند.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options.get("SHARED", "shared")
+        self._front_timeout = options.get("FRONT_TIMEOUT", 5)
+        self._front = LocMemCache(
+            location or f"tiered-{self._shared_alias}",
+            {
+                "TIMEOUT": self._front_timeout,
+                "OPTIONS": {"MAX_ENTRIES": options.get("FRONT_MAX_ENTRIES", 1000)},
+            },
+        )
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _front_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self._front_timeout
+        return min(timeout, self._front_timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self._front.set(key, value, self._front_ttl(timeout), version)
+        return added
+
+    def get(self, key, default=None, version=None):
+        value = self._front.get(key, _MISSING, version)
+        if value is not _MISSING:
+            return value
+
+        value = self.shared.get(key, _MISSING, version)
+        if value is _MISSING:
+            return default
+
+        self._front.set(key, value, version=version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version)
+        self._front.set(key, value, self._front_ttl(timeout), version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        self._front.delete(key, version)
+        return self.shared.delete(key, version)
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._front.get(key, _MISSING, version)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing:
+            from_shared = self.shared.get_many(missing, version)
+            for key, value in from_shared.items():
+                self._front.set(key, value, version=version)
+            found.update(from_shared)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version)
+        self._front.set_many(
+            {k: v for k, v in data.items() if k not in failed},
+            self._front_ttl(timeout),
+            version,
+        )
+        return failed
+
+    def delete_many(self, keys, version=None):
+        self._front.delete_many(keys, version)
+        self.shared.delete_many(keys, version)
+
+    def has_key(self, key, version=None):
+        return self._front.has_key(key, version) or self.shared.has_key(key, version)
+
+    def incr(self, key, delta=1, version=None):
+        self._front.delete(key, version)
+        return self.shared.incr(key, delta, version)
+
+    def decr(self, key, delta=1, version=None):
+        self._front.delete(key, version)
+        return self.shared.decr(key, delta, version)
+
+    def clear(self):
+        self._front.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+# ---------- atomic counters ----------
+
+def _shared_backend(alias="default"):
+    backend = caches[alias]
+    if isinstance(backend, TieredCache):
+        return backend.shared
+    return backend
+
+
+def supports_atomic_incr(alias="default"):
+    """
+    فقط Redis و Memcached افزایش اتمیک بین چند پروسه دارند.
+    DatabaseCache و FileBasedCache در incr یک get + set انجام می‌دهند.
+    """
+    from django.core.cache.backends.memcached import BaseMemcachedCache
+    from django.core.cache.backends.redis import RedisCache
+
+    return isinstance(_shared_backend(alias), (RedisCache, BaseMemcachedCache))
+
+
+def incr_counter(key, delta=1, alias="default"):
+    """
+    افزایش اتمیک یک شمارنده در cache مشترک (بدون انقضا).
+    فقط وقتی supports_atomic_incr() برقرار است معنی دارد.
+    """
+    backend = _shared_backend(alias)
+    # add روی Redis/Memcached اتمیک است (SET NX)
+    backend.add(key, 0, timeout=None)
+    return backend.incr(key, delta)
+
+
+def take_counter(key, amount, alias="default"):
+    """
+    دقیقاً amount را از شمارنده کم می‌کند (نه صفر کردن)،
+    تا افزایش‌هایی که همزمان رسیده‌اند از دست نروند.
+    """
+    backend = _shared_backend(alias)
+    return backend.decr(key, amount)
+
+
+def incr_window(key, timeout, alias="default"):
+    """
+    شمارنده‌ی یک بازه‌ی زمانی (با انقضا) برای rate limit؛ مقدار جدید را برمی‌گرداند.
+    روی Redis/Memcached اتمیک است؛ روی DatabaseCache تقریبی (get + set).
+    """
+    backend = _shared_backend(alias)
+    backend.add(key, 0, timeout=timeout)
+    try:
+        return backend.incr(key)
+    except ValueError:
+        # بین add و incr منقضی شد
+        backend.set(key, 1, timeout=timeout)
+        return 1
+
+
+def get_counter(key, alias="default"):
+    return _shared_backend(alias).get(key) or 0
+
+
+def add_once(key, value, timeout=None, alias="default"):
+    """فقط اگر کلید وجود نداشته باشد ست می‌شود (روی Redis/Memcached اتمیک)."""
+    return _shared_backend(alias).add(key, value, timeout=timeout)
+
+
+def clear_key(key, alias="default"):
+    _shared_backend(alias).delete(key)
+
+
+def acquire_lock(key, timeout=30, alias="default"):
+    return add_once(key, 1, timeout=timeout, alias=alias)
+
+
+def release_lock(key, alias="default"):
+    clear_key(key, alias=alias)
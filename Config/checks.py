@@ -0,0 +1,54 @@
+# Config/checks.py
+"""
+System check های cache مشترک (CACHES["shared"]).
+
+- جدول DatabaseCache وجود ندارد => Error (روی migrate / test / check --database)
+- cache مشترک incr اتمیک ندارد (یعنی Redis نیست) => Warning در check --deploy
+
+ثبت: HomeConfig.ready
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.checks import Error, Tags, Warning, register
+from django.db import connections, router
+
+from Config.cache import supports_atomic_incr
+
+
+@register(Tags.caches, Tags.database)
+def check_cache_tables(app_configs=None, databases=None, **kwargs):
+    """بدون جدول، هر get/incr روی DatabaseCache با خطای دیتابیس می‌خوابد."""
+    if not databases:
+        return []
+
+    errors = []
+    for alias in settings.CACHES:
+        backend = caches[alias]
+        if not isinstance(backend, DatabaseCache):
+            continue
+
+        db = router.db_for_write(backend.cache_model_class)
+        if db not in databases:
+            continue
+
+        with connections[db].cursor() as cursor:
+            tables = connections[db].introspection.table_names(cursor)
+        if backend._table not in tables:
+            errors.append(Error(
+                f"جدول cache «{backend._table}» (CACHES[\"{alias}\"]) در دیتابیس «{db}» وجود ندارد.",
+                hint="python manage.py createcachetable (یا REDIS_URL را ست کنید)",
+                id="Config.E001",
+            ))
+    return errors
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache_atomic(app_configs=None, **kwargs):
+    if supports_atomic_incr():
+        return []
+    return [Warning(
+        "cache مشترک Redis نیست: شمارنده‌های بازدید و rate limit بدون incr اتمیک اجرا می‌شوند.",
+        hint="در production متغیر REDIS_URL را ست کنید.",
+        id="Config.W001",
+    )]
@@ -0,0 +1,117 @@
+# Config/ratelimit.py
+"""
+محدودیت نرخ برای فرم‌های عمومی (ReCode، درخواست قرارداد).
+
+هر POST برای هر کلید (IP، شماره تماس) یک incr اتمیک در cache مشترک است؛
+شمارش با «پنجره‌ی لغزان» تقریب زده می‌شود:
+    estimate = previous * (1 - elapsed) + current
+چند نرخ روی یک کلید (مثلاً "3/m" و "20/h") مثل token bucket رفتار می‌کند:
+انفجار کوتاه با نرخ کوچک و سقف بلندمدت با نرخ بزرگ محدود می‌شود.
+
+تنظیمات (settings.RATELIMITS):
+    RATELIMITS = {
+        "recode": {"ip": ["3/m", "20/h"], "phone": ["3/h"]},
+    }
+
+استفاده (urls.py):
+    path("ReCode/", ratelimit("recode")(views.ReCodeView.as_view()), ...)
+
+جواب رد شدن: 429 با {"ok": False, "message": ...} و هدر Retry-After؛
+قبل از هر کار دیگری (فرم، دیتابیس، پیامک).
+"""
+import hashlib
+import math
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+
+from accounts.utils.normalize import canonical_phone
+from .cache import get_counter, incr_window
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+
+RATE_LIMITED_MESSAGE = "تعداد درخواست‌ها زیاد است. لطفاً چند دقیقه بعد دوباره تلاش کنید."
+
+
+def parse_rate(rate):
+    """'5/m' -> (5, 60) ؛ '20/10m' -> (20, 600)"""
+    match = _RATE_RE.match(str(rate))
+    if not match:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    count, size, unit = match.groups()
+    return int(count), int(size or 1) * _UNITS[unit]
+
+
+def client_ip(request):
+    # پشت nginx، REMOTE_ADDR خود پروکسی است؛ RATELIMIT_IP_HEADER مثلاً HTTP_X_REAL_IP
+    header = getattr(settings, "RATELIMIT_IP_HEADER", "")
+    forwarded = request.META.get(header, "") if header else ""
+    return forwarded.split(",")[0].strip() or request.META.get("REMOTE_ADDR", "")
+
+
+def _request_phone(request):
+    return canonical_phone(request.POST.get("phone"))
+
+
+KEY_FUNCTIONS = {
+    "ip": client_ip,
+    "phone": _request_phone,
+}
+
+
+def _hit(scope, kind, ident, rate, now):
+    """(allowed, retry_after) برای یک نرخ"""
+    limit, period = parse_rate(rate)
+    window, offset = divmod(now, period)
+    digest = hashlib.sha1(ident.encode()).hexdigest()[:16]
+    base = f"rl:{scope}:{kind}:{period}:{digest}"
+
+    current = incr_window(f"{base}:{int(window)}", timeout=period * 2)
+    previous = get_counter(f"{base}:{int(window) - 1}")
+    estimate = previous * (1 - offset / period) + current
+    if estimate <= limit:
+        return True, 0
+    return False, max(1, math.ceil(period - offset))
+
+
+def check_rate_limit(request, scope):
+    """None اگر مجاز است، وگرنه retry_after (ثانیه)"""
+    rules = getattr(settings, "RATELIMITS", {}).get(scope)
+    if not rules or not getattr(settings, "RATELIMIT_ENABLED", True):
+        return None
+
+    now = time.time()
+    for kind, rates in rules.items():
+        ident = KEY_FUNCTIONS[kind](request)
+        if not ident:
+            continue
+        for rate in rates:
+            allowed, retry_after = _hit(scope, kind, ident, rate, now)
+            if not allowed:
+                # بقیه‌ی نرخ‌ها دیگر شمرده نمی‌شوند؛ جواب رد باید ارزان بماند
+                return retry_after
+    return None
+
+
+def rate_limited_response(retry_after):
+    response = JsonResponse({"ok": False, "message": RATE_LIMITED_MESSAGE}, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def ratelimit(scope, methods=("POST",)):
+    """دکوریتور view: فقط متدهای methods شمرده می‌شوند"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                retry_after = check_rate_limit(request, scope)
+                if retry_after:
+                    return rate_limited_response(retry_after)
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
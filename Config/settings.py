@@ -22,6 +22,19 @@ CSRF_TRUSTED_ORIGINS = config("CSRF_TRUSTED_ORIGINS", cast=Csv())
 
 GHASEDAK_API_KEY = config("GHASEDAK_API_KEY", default="")
 GHASEDAK_LINE_NUMBER = config("GHASEDAK_LINE_NUMBER", default="")
+
+# لاگ فعالیت‌ها در پایان هر request با یک bulk_create نوشته می‌شوند؛
+# با True نوشتن به یک thread پس‌زمینه سپرده می‌شود.
+ACTIVITY_LOG_DEFERRED = config("ACTIVITY_LOG_DEFERRED", default=False, cast=bool)
+
+# صف پیامک (zlink.SmsOutbox) — worker: python manage.py send_sms_outbox --loop
+# برای توسعه/تست: SMS_BACKEND=zlink.service.sms.LocalStubBackend
+SMS_BACKEND = config("SMS_BACKEND", default="zlink.service.sms.GhasedakBackend")
+SMS_OUTBOX_BATCH_SIZE = config("SMS_OUTBOX_BATCH_SIZE", default=50, cast=int)
+SMS_OUTBOX_MAX_ATTEMPTS = config("SMS_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+SMS_OUTBOX_RETRY_BASE_SECONDS = 30
+SMS_OUTBOX_RETRY_MAX_SECONDS = 3600
+SMS_OUTBOX_LEASE_SECONDS = 300
 # -------------------------
 # INSTALLED APPS
 # -------------------------
@@ -61,6 +74,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
 
     'accounts.middleware.CurrentUserMiddleware',
+    'admin_panel.middleware.ActivityLogBufferMiddleware',
 
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -103,13 +117,59 @@ DATABASES = {
         }
     }
 }
+# -------------------------
+# CACHE
+# -------------------------
+# default: LRU داخل هر پروسه جلوی cache مشترک (Config.cache.TieredCache)
+# shared: اگر REDIS_URL ست شده باشد Redis (پکیج redis در requirements.txt)، وگرنه جدول دیتابیس
+#
+# production: REDIS_URL الزامی است. DatabaseCache incr اتمیک ندارد، پس شمارنده‌ی بازدید
+# (home.counters) و rate limit (Config.ratelimit) روی آن فقط حالت کمکی/تقریبی دارند
+# (check --deploy هشدار Config.W001 می‌دهد).
+# بدون Redis (توسعه) قبل از migrate یک بار: python manage.py createcachetable
+# (migrate و test بدون این جدول با خطای Config.E001 متوقف می‌شوند)
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "anam_cache",
+    }
+
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
-        "LOCATION": BASE_DIR / "cache",
-    }
+        "BACKEND": "Config.cache.TieredCache",
+        "OPTIONS": {
+            "SHARED": "shared",
+            "FRONT_TIMEOUT": 5,
+            "FRONT_MAX_ENTRIES": 1000,
+        },
+    },
+    "shared": SHARED_CACHE,
 }
 
+# محدودیت نرخ فرم‌های عمومی (Config.ratelimit): برای هر کلید چند نرخ "تعداد/بازه"
+RATELIMIT_ENABLED = config("RATELIMIT_ENABLED", default=True, cast=bool)
+# پشت nginx: HTTP_X_REAL_IP یا HTTP_X_FORWARDED_FOR (فقط اگر پروکسی خودش ستش می‌کند)
+RATELIMIT_IP_HEADER = config("RATELIMIT_IP_HEADER", default="")
+RATELIMITS = {
+    "recode": {"ip": ["3/m", "20/h"], "phone": ["3/h"]},
+    "contract": {"ip": ["3/m", "20/h"], "phone": ["3/h"]},
+}
+
+# بافر بازدید صفحه اصلی (home.counters): flush بعد از این تعداد یا این چند ثانیه
+VIEW_COUNTER_FLUSH_THRESHOLD = 100
+VIEW_COUNTER_MAX_AGE = 60
+
+# داشبوردهای worklog ادمین از جدول DailyComplianceSnapshot می‌خوانند
+# (migration worklog 0006 جدول را پر می‌کند؛ بعد از آن signals به‌روز نگهش می‌دارند)
+WORKLOG_USE_COMPLIANCE_SNAPSHOT = True
+
 # -------------------------
 # PASSWORD VALIDATION
 # -------------------------
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_role'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='date_joined',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
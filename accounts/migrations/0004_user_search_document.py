@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:42
+
+import accounts.utils.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_date_joined_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_document',
+            field=accounts.utils.search.SearchDocumentField(blank=True, default='', editable=False),
+        ),
+        accounts.utils.search.backfill_search_documents(
+            'accounts', 'user',
+            texts=("username", "full_name", "email"),
+            phones=("phone",),
+        ),
+        accounts.utils.search.fulltext_index('accounts_user', 'accounts_user_search_ft'),
+    ]
@@ -6,6 +6,9 @@ from django.contrib.auth.models import (
 )
 from django.utils import timezone
 
+from .utils.search import SearchDocumentField, SearchDocumentMixin
+from .utils.tracking import TrackedFieldsMixin
+
 
 class UserManager(BaseUserManager):
 
@@ -38,7 +41,7 @@ class UserManager(BaseUserManager):
         return self.create_user(username, password, **extra_fields)
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(SearchDocumentMixin, TrackedFieldsMixin, AbstractBaseUser, PermissionsMixin):
     # ---- رول‌ها ----
     ROLE_ADMIN = "admin"
     ROLE_STAFF = "staff"
@@ -89,10 +92,19 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
-    date_joined = models.DateTimeField(default=timezone.now)
+    date_joined = models.DateTimeField(default=timezone.now, db_index=True)
+
+    # جستجوی پنل ادمین (accounts/utils/search.py)
+    search_document = SearchDocumentField()
 
     objects = UserManager()
 
+    # فیلدهایی که تغییرشان در ActivityLog ثبت می‌شود
+    TRACKED_FIELDS = ("full_name", "email", "phone", "role", "is_active", "is_staff", "is_superuser")
+
+    SEARCH_FIELDS = ("username", "full_name", "email")
+    SEARCH_PHONE_FIELDS = ("phone",)
+
     USERNAME_FIELD = "username"  # ورود با یوزرنیم
     REQUIRED_FIELDS = []  # هنگام ساخت سوپریوزر فقط پسورد می‌پرسد
 
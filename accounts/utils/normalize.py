@@ -0,0 +1,151 @@
+# accounts/utils/normalize.py
+"""
+نرمال‌سازی متن فارسی برای ذخیره، جستجو و تشخیص تکراری‌ها.
+
+همه‌ی جایگزینی‌های تک‌کاراکتری در جدول‌های str.maketrans از قبل ساخته
+شده‌اند و با یک translate (در C) انجام می‌شوند، نه حلقه‌ی کاراکتر به کاراکتر:
+
+    normalize_text("علي  رضايي ۰۹۱۲")  -> "علی رضایی 0912"      (برای ذخیره/نمایش)
+    normalize_key("مي‌خواهم")          -> "میخواهم"            (برای مقایسه/جستجو)
+    canonical_phone("+98 912 123 4567") -> "09121234567"
+
+مقایسه با helper قدیمی: python manage.py benchmark_normalize
+"""
+import re
+
+from django.core.validators import MaxLengthValidator
+
+PERSIAN_DIGITS = "۰۱۲۳۴۵۶۷۸۹"
+ARABIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+ZWNJ = "\u200c"
+
+LATIN_DIGITS = str.maketrans(PERSIAN_DIGITS + ARABIC_DIGITS, "0123456789" * 2)
+
+# ذخیره: ارقام لاتین، ی/ک فارسی، بدون کشیده و کاراکترهای نامرئی (غیر از نیم‌فاصله)
+TEXT_TABLE = str.maketrans({
+    **{ord(ch): str(i) for i, ch in enumerate(PERSIAN_DIGITS)},
+    **{ord(ch): str(i) for i, ch in enumerate(ARABIC_DIGITS)},
+    "ي": "ی",
+    "ى": "ی",
+    "ك": "ک",
+    "ـ": None,  # کشیده
+    "\u200b": None,  # zero width space
+    "\u200d": None,  # ZWJ
+    "\u200e": None,  # LRM
+    "\u200f": None,  # RLM
+    "\ufeff": None,  # BOM
+})
+
+# مقایسه: بدون اعراب و نیم‌فاصله، همزه‌ها و ة یکسان
+KEY_TABLE = str.maketrans({
+    **{code: None for code in range(0x064B, 0x0653)},  # فتحه، کسره، تشدید، ...
+    0x0670: None,  # الف مقصوره‌ی کوچک
+    ZWNJ: None,
+    "أ": "ا",
+    "إ": "ا",
+    "ٱ": "ا",
+    "ؤ": "و",
+    "ة": "ه",
+    "ۀ": "ه",
+    "ە": "ه",
+})
+
+_SPACING = re.compile(r"[\s\u200c]+")
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def _collapse(match):
+    # فقط نیم‌فاصله => یک نیم‌فاصله ؛ هر ترکیبی با فاصله => یک فاصله
+    run = match.group()
+    return ZWNJ if run.count(ZWNJ) == len(run) else " "
+
+
+def fold_digits(value) -> str:
+    """'۱۴۰۴/٠٩' -> '1404/09'"""
+    if not value:
+        return ""
+    return str(value).translate(LATIN_DIGITS)
+
+
+def normalize_text(value) -> str:
+    """
+    متنی که ذخیره می‌شود: حروف و ارقام یکسان، فاصله‌ها و نیم‌فاصله‌های
+    پشت‌سرهم یکی، بدون نیم‌فاصله/فاصله در ابتدا و انتها.
+    """
+    if not value:
+        return ""
+    text = str(value).translate(TEXT_TABLE)
+    if ZWNJ not in text:
+        # حالت رایج؛ split/join در C از regex خیلی سریع‌تر است
+        return " ".join(text.split())
+    return _SPACING.sub(_collapse, text).strip(" " + ZWNJ)
+
+
+def normalize_key(value) -> str:
+    """کلید مقایسه: normalize_text + بدون اعراب/نیم‌فاصله + casefold"""
+    text = normalize_text(value)
+    if not text:
+        return ""
+    return " ".join(text.translate(KEY_TABLE).casefold().split())
+
+
+def phone_digits(value) -> str:
+    """'+98 (912) ۱۲۳-4567' -> '989121234567'"""
+    if not value:
+        return ""
+    return _NON_DIGITS.sub("", str(value).translate(LATIN_DIGITS))
+
+
+def canonical_phone(value) -> str:
+    """
+    موبایل ایران به شکل 09xxxxxxxxx (از +98، 0098، 98، 9xxxxxxxxx یا 09...)؛
+    شماره‌ی دیگر => فقط ارقامش (اعتبارسنجی با فرم/مدل است).
+    """
+    digits = phone_digits(value)
+    if digits.startswith("0098"):
+        digits = digits[2:]
+    if len(digits) == 12 and digits.startswith("989"):
+        return "0" + digits[2:]
+    if len(digits) == 10 and digits.startswith("9"):
+        return "0" + digits
+    return digits
+
+
+def canonical_email(value) -> str:
+    """'  Ali.R@Gmail.COM ' -> 'ali.r@gmail.com'"""
+    if not value:
+        return ""
+    return str(value).strip().lower()
+
+
+class NormalizedFieldsMixin:
+    """
+    برای ModelFormهای ورودی کاربر: قبل از ذخیره فیلدهای متنی با normalize_text
+    و شماره‌ها با canonical_phone یکسان می‌شوند.
+
+        class ContractForm(NormalizedFieldsMixin, forms.ModelForm):
+            NORMALIZE_TEXT_FIELDS = ("full_name", "startup_name")
+            NORMALIZE_PHONE_FIELDS = ("phone",)
+    """
+    NORMALIZE_TEXT_FIELDS = ()
+    NORMALIZE_PHONE_FIELDS = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # '+98 912 123 4567' از max_length ستون بلندتر است؛ طول شکل نهایی را مدل چک می‌کند
+        for name in self.NORMALIZE_PHONE_FIELDS:
+            field = self.fields.get(name)
+            if field is not None and getattr(field, "max_length", None):
+                field.max_length = None
+                field.validators = [v for v in field.validators if not isinstance(v, MaxLengthValidator)]
+                field.widget.attrs.pop("maxlength", None)
+
+    def clean(self):
+        cleaned = super().clean()
+        for field in self.NORMALIZE_TEXT_FIELDS:
+            if cleaned.get(field):
+                cleaned[field] = normalize_text(cleaned[field])
+        for field in self.NORMALIZE_PHONE_FIELDS:
+            if cleaned.get(field):
+                cleaned[field] = canonical_phone(cleaned[field])
+        return cleaned
@@ -0,0 +1,219 @@
+# accounts/utils/search.py
+"""
+سند جستجو (search_document) برای جستجوی پنل ادمین روی User / Contract / ReCode.
+
+به جای چند icontains که با OR به هم وصل می‌شوند (و روی MySQL هیچ ایندکسی
+برای LIKE '%q%' استفاده نمی‌شود)، هر ردیف یک ستون متنی نرمال‌شده دارد که
+موقع save پر می‌شود: نام‌ها/ایمیل/شهر با normalize_key (accounts/utils/normalize.py)
+به‌علاوه‌ی شکل‌های مختلف شماره تماس (0912... و 98912...).
+
+- MySQL: ایندکس FULLTEXT با parser ngram روی همین ستون (در migration هر اپ)
+  و فیلتر MATCH ... AGAINST در BOOLEAN MODE؛ زیررشته‌ها هم پیدا می‌شوند.
+- بقیه‌ی دیتابیس‌ها (و توکن‌های کوتاه‌تر از ngram_token_size): یک LIKE برای
+  هر توکن، ولی فقط روی یک ستون و بدون join.
+
+    qs = apply_search(ReCode.objects.all(), request.GET.get("q"))
+
+بعد از تغییر قواعد نرمال‌سازی: python manage.py rebuild_search_documents
+"""
+import re
+
+from django.db import migrations, models
+from django.db.models import Lookup
+
+from .normalize import canonical_phone, normalize_key
+
+SEARCH_DOCUMENT_MAX_LENGTH = 2000
+
+# ngram_token_size پیش‌فرض MySQL؛ توکن کوتاه‌تر در FULLTEXT پیدا نمی‌شود
+NGRAM_TOKEN_SIZE = 2
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_search_text(value) -> str:
+    """'علي  رضايي ۰۹۱۲' -> 'علی رضایی 0912' (علائم نگارشی => فاصله)"""
+    return " ".join(_TOKEN_RE.findall(normalize_key(value)))
+
+
+def phone_search_tokens(phone):
+    """'+98 912 345 6789' -> ['09123456789', '989123456789']"""
+    phone = canonical_phone(phone)
+    if len(phone) == 11 and phone.startswith("09"):
+        return [phone, f"98{phone[1:]}"]
+    return [phone] if phone else []
+
+
+def build_search_document(texts=(), phones=()) -> str:
+    parts = [normalize_search_text(value) for value in texts]
+    for phone in phones:
+        parts.extend(phone_search_tokens(phone))
+    return " ".join(p for p in parts if p)[:SEARCH_DOCUMENT_MAX_LENGTH]
+
+
+# ---------- field / lookup ----------
+
+class SearchDocumentField(models.TextField):
+    """ستون search_document؛ فقط برای lookup «match» (پایین) جدا تعریف شده"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("default", "")
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+
+@SearchDocumentField.register_lookup
+class SearchMatch(Lookup):
+    """
+    search_document__match="<متن نرمال‌شده>"
+    همه‌ی توکن‌ها باید (به‌صورت زیررشته) در سند باشند.
+    """
+    lookup_name = "match"
+    prepare_rhs = False
+
+    def _tokens(self):
+        return str(self.rhs).split()
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        tokens = self._tokens()
+        sql = " AND ".join([f"{lhs} LIKE %s"] * len(tokens))
+        params = []
+        for token in tokens:
+            params.extend(lhs_params)
+            params.append(f"%{connection.ops.prep_for_like_query(token)}%")
+        return f"({sql})", params
+
+    def as_mysql(self, compiler, connection):
+        tokens = self._tokens()
+        if any(len(token) < NGRAM_TOKEN_SIZE for token in tokens):
+            return self.as_sql(compiler, connection)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        # هر توکن یک phrase اجباری؛ با ngram یعنی «زیررشته‌ی پشت‌سرهم»
+        against = " ".join(f'+"{token}"' for token in tokens)
+        return f"MATCH ({lhs}) AGAINST (%s IN BOOLEAN MODE)", [*lhs_params, against]
+
+
+def apply_search(queryset, query, field="search_document"):
+    """query خالی (یا بعد از نرمال‌سازی خالی) => همان queryset"""
+    normalized = normalize_search_text(query)
+    if not normalized:
+        return queryset
+    return queryset.filter(**{f"{field}__match": normalized})
+
+
+# ---------- model mixin ----------
+
+class SearchDocumentMixin:
+    """
+    مثل TrackedFieldsMixin قبل از models.Model می‌آید؛ مدل باید
+    search_document = SearchDocumentField() داشته باشد.
+
+    SEARCH_FIELDS: فیلدهای متنی، SEARCH_PHONE_FIELDS: شماره‌ها.
+    برای فیلدهای رابطه‌ای get_search_texts را override کنید و نام FK را
+    در SEARCH_SOURCE_FIELDS بگذارید تا save(update_fields=...) هم سند را به‌روز کند.
+    """
+    SEARCH_FIELDS = ()
+    SEARCH_PHONE_FIELDS = ()
+    SEARCH_SOURCE_FIELDS = ()
+    SEARCH_SELECT_RELATED = ()
+
+    def get_search_texts(self):
+        return [getattr(self, f, None) for f in self.SEARCH_FIELDS]
+
+    def build_search_document(self):
+        return build_search_document(
+            self.get_search_texts(),
+            [getattr(self, f, None) for f in self.SEARCH_PHONE_FIELDS],
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.search_document = self.build_search_document()
+        else:
+            sources = {*self.SEARCH_FIELDS, *self.SEARCH_PHONE_FIELDS, *self.SEARCH_SOURCE_FIELDS}
+            if sources.intersection(update_fields):
+                self.search_document = self.build_search_document()
+                kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
+
+
+def rebuild_search_documents(model, queryset=None, batch_size=500):
+    """بازسازی search_document برای همه‌ی ردیف‌ها (یا queryset)؛ تعداد ردیف‌های عوض‌شده"""
+    qs = queryset if queryset is not None else model._default_manager.all()
+    if model.SEARCH_SELECT_RELATED:
+        qs = qs.select_related(*model.SEARCH_SELECT_RELATED)
+    qs = qs.order_by("pk")
+
+    changed = 0
+    last_pk = None
+    while True:
+        page = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        rows = list(page[:batch_size])
+        if not rows:
+            return changed
+        dirty = []
+        for obj in rows:
+            document = obj.build_search_document()
+            if document != obj.search_document:
+                obj.search_document = document
+                dirty.append(obj)
+        if dirty:
+            model._default_manager.bulk_update(dirty, ["search_document"])
+            changed += len(dirty)
+        last_pk = rows[-1].pk
+
+
+# ---------- migrations ----------
+
+def backfill_search_documents(app_label, model_name, texts, phones=(), batch_size=500):
+    """
+    RunPython برای پر کردن search_document ردیف‌های موجود.
+    مدل تاریخی متدهای mixin را ندارد؛ texts/phones مسیرهای values_list هستند
+    (به همان ترتیبی که get_search_texts برمی‌گرداند، مثل "referrer__name").
+    """
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        manager = model._base_manager.using(schema_editor.connection.alias)
+        qs = manager.order_by("pk").values_list("pk", *texts, *phones)
+        last_pk = None
+        while True:
+            page = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            rows = list(page[:batch_size])
+            if not rows:
+                return
+            objs = []
+            for pk, *values in rows:
+                obj = model(pk=pk)
+                obj.search_document = build_search_document(values[:len(texts)], values[len(texts):])
+                objs.append(obj)
+            manager.bulk_update(objs, ["search_document"])
+            last_pk = rows[-1][0]
+
+    return migrations.RunPython(forwards, migrations.RunPython.noop)
+
+
+def fulltext_index(table, name, column="search_document"):
+    """
+    RunPython که فقط روی MySQL ایندکس FULLTEXT با parser ngram می‌سازد.
+    stopwordها خاموش می‌شوند: ngram هر توکنی را که «شامل» یک stopword
+    باشد (مثل a یا i) دور می‌ریزد و جستجوی لاتین خراب می‌شود.
+    """
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "mysql":
+            return
+        qn = schema_editor.quote_name
+        schema_editor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {qn(name)} ON {qn(table)} ({qn(column)}) WITH PARSER ngram"
+        )
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "mysql":
+            return
+        qn = schema_editor.quote_name
+        schema_editor.execute(f"DROP INDEX {qn(name)} ON {qn(table)}")
+
+    return migrations.RunPython(forwards, backwards)
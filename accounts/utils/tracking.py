@@ -0,0 +1,63 @@
+# accounts/utils/tracking.py
+
+
+class TrackedFieldsMixin:
+    """
+    مقدار فیلدهای TRACKED_FIELDS را موقع لود از دیتابیس (from_db) و بعد از هر save
+    نگه می‌دارد تا سیگنال‌های pre_save بدون SELECT دوباره بفهمند چه چیزی عوض شده.
+
+    باید قبل از models.Model در لیست والدها بیاید:
+        class ReCode(TrackedFieldsMixin, models.Model): ...
+    """
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self):
+        deferred = self.get_deferred_fields()
+        self._tracked_snapshot = {
+            f: getattr(self, f)
+            for f in self.TRACKED_FIELDS
+            if f not in deferred
+        }
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def get_old_tracked_values(self, update_fields=None):
+        """
+        مقدار قبلی فیلدهای ردیابی‌شده (dict) یا None.
+
+        None یعنی چیزی برای مقایسه نیست: رکورد جدید است، یا update_fields
+        هیچ فیلد ردیابی‌شده‌ای ندارد (مثلاً last_login موقع لاگین).
+        فقط اگر snapshot ناقص باشد (مثلاً instance با only() لود شده) از دیتابیس خوانده می‌شود.
+        """
+        if self.pk is None or self._state.adding:
+            return None
+
+        fields = list(self.TRACKED_FIELDS)
+        if update_fields is not None:
+            fields = [f for f in fields if f in update_fields]
+            if not fields:
+                return None
+
+        snapshot = getattr(self, "_tracked_snapshot", None) or {}
+        if all(f in snapshot for f in fields):
+            return {f: snapshot[f] for f in fields}
+
+        return (
+            type(self)._base_manager
+            .using(self._state.db)
+            .filter(pk=self.pk)
+            .values(*fields)
+            .first()
+        )
@@ -0,0 +1,139 @@
+# admin_panel/activity.py
+"""
+بافر لاگ فعالیت‌ها در طول یک request.
+
+سیگنال‌ها به جای ActivityLog.objects.create از log_activity استفاده می‌کنند.
+هر لاگ بعد از commit تراکنش خودش (transaction.on_commit) وارد بافر می‌شود؛
+پس اگر تراکنش rollback شود لاگ هم ثبت نمی‌شود (مثل قبل).
+در پایان request کل بافر با یک bulk_create نوشته می‌شود.
+
+اگر ACTIVITY_LOG_DEFERRED=True باشد نوشتن در یک thread پس‌زمینه انجام می‌شود.
+"""
+import atexit
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def _truncate(field_name, value):
+    max_length = ActivityLog._meta.get_field(field_name).max_length
+    value = "" if value is None else str(value)
+    if max_length and len(value) > max_length:
+        return value[: max_length - 1] + "…"
+    return value
+
+
+def log_activity(title, category, meta="", level=ActivityLog.LEVEL_INFO, actor=None):
+    entry = ActivityLog(
+        title=_truncate("title", title),
+        meta=_truncate("meta", meta),
+        category=category,
+        level=level,
+        actor=actor,
+    )
+
+    entries = getattr(_local, "entries", None)
+    if entries is None:
+        # بیرون از request (shell / management command): بعد از commit مستقیم نوشته می‌شود
+        transaction.on_commit(lambda: write_activity_logs([entry]))
+    else:
+        transaction.on_commit(lambda: entries.append(entry))
+
+    return entry
+
+
+def write_activity_logs(entries):
+    if entries:
+        ActivityLog.objects.bulk_create(entries)
+
+
+@contextmanager
+def activity_buffer():
+    """
+    همه‌ی لاگ‌های داخل این بلاک با یک INSERT نوشته می‌شوند.
+    """
+    previous = getattr(_local, "entries", None)
+    entries = []
+    _local.entries = entries
+    try:
+        yield entries
+    finally:
+        _local.entries = previous
+        flush_activity_logs(entries)
+
+
+def flush_activity_logs(entries):
+    if not entries:
+        return
+
+    if getattr(settings, "ACTIVITY_LOG_DEFERRED", False):
+        _writer.submit(list(entries))
+        return
+
+    write_activity_logs(entries)
+
+
+# ---------- deferred mode ----------
+
+class _BackgroundWriter:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, entries):
+        self._ensure_started()
+        self._queue.put(entries)
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+            self._thread.start()
+
+    def _write(self, entries):
+        try:
+            write_activity_logs(entries)
+        except Exception:
+            logger.exception("Failed to write %s activity log entries", len(entries))
+        finally:
+            close_old_connections()
+
+    def _run(self):
+        while True:
+            entries = self._queue.get()
+            # هر چه در صف جمع شده یکجا نوشته می‌شود
+            while True:
+                try:
+                    entries.extend(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(entries)
+
+    def drain(self):
+        """در خروج پروسه، باقی‌مانده صف را همین‌جا می‌نویسد."""
+        pending = []
+        while True:
+            try:
+                pending.extend(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if pending:
+            self._write(pending)
+
+
+_writer = _BackgroundWriter()
+atexit.register(_writer.drain)
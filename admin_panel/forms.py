@@ -3,6 +3,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.forms import formset_factory
 
+from accounts.utils.normalize import NormalizedFieldsMixin
 from worklog.models import Project, ProjectMember
 
 User = get_user_model()
@@ -11,7 +12,10 @@ User = get_user_model()
 # ----------------------------
 # Users
 # ----------------------------
-class UserEditForm(forms.ModelForm):
+class UserEditForm(NormalizedFieldsMixin, forms.ModelForm):
+    NORMALIZE_TEXT_FIELDS = ("full_name",)
+    NORMALIZE_PHONE_FIELDS = ("phone",)
+
     class Meta:
         model = User
         fields = ["full_name", "email", "phone", "role", "is_active"]
@@ -24,7 +28,10 @@ class UserEditForm(forms.ModelForm):
         }
 
 
-class UserCreateForm(forms.ModelForm):
+class UserCreateForm(NormalizedFieldsMixin, forms.ModelForm):
+    NORMALIZE_TEXT_FIELDS = ("full_name",)
+    NORMALIZE_PHONE_FIELDS = ("phone",)
+
     password = forms.CharField(
         widget=forms.PasswordInput(attrs={"class": "form-control"}),
         required=True,
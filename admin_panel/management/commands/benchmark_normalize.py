@@ -0,0 +1,80 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.utils import normalize
+
+SAMPLES = [
+    "علي رضايي",
+    "كريم  مير‌‌زاده",
+    "۰۹۱۲۱۲۳۴۵۶۷",
+    "+98 912 123 4567",
+    "تهران ـ منطقه ٢٢",
+    "Ali.Rezaei@Gmail.com",
+    "استارتاپ آنام ۱۴۰۴",
+    "شركت  فن‌آوري  ‌ نوين",
+]
+
+
+def _fa_to_en_digits_legacy(value):
+    # helper قبلی admin_panel/views_worklog.py: حلقه‌ی کاراکتر به کاراکتر با str.index
+    if not value:
+        return ""
+    fa = "۰۱۲۳۴۵۶۷۸۹"
+    ar = "٠١٢٣٤٥٦٧٨٩"
+    out = []
+    for ch in str(value):
+        if ch in fa:
+            out.append(str(fa.index(ch)))
+        elif ch in ar:
+            out.append(str(ar.index(ch)))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _normalize_text_legacy(value):
+    # همان خروجی normalize_text با replaceهای پشت‌سرهم
+    text = _fa_to_en_digits_legacy(value)
+    for old, new in (("ي", "ی"), ("ى", "ی"), ("ك", "ک"), ("ـ", ""),
+                     ("\u200b", ""), ("\u200d", ""), ("\u200e", ""), ("\u200f", ""), ("\ufeff", "")):
+        text = text.replace(old, new)
+    text = re.sub(r"[\s\u200c]+", lambda m: "\u200c" if set(m.group()) == {"\u200c"} else " ", text)
+    return text.strip(" \u200c")
+
+
+class Command(BaseCommand):
+    help = "مقایسه‌ی زمان نرمال‌سازی متن با helperهای قبلی و با accounts.utils.normalize (str.translate)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def _measure(self, fn, values, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for value in values:
+                fn(value)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _report(self, label, legacy, current, values, repeat):
+        if any(legacy(v) != current(v) for v in SAMPLES):
+            self.stderr.write(f"{label}: خروجی دو روش یکسان نیست.")
+            return
+        old = self._measure(legacy, values, repeat)
+        new = self._measure(current, values, repeat)
+        self.stdout.write(f"{label}: legacy {old * 1000:.1f} ms | translate {new * 1000:.1f} ms | x{old / new:.1f}")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        values = [rng.choice(SAMPLES) for _ in range(options["rows"])]
+        repeat = options["repeat"]
+
+        self.stdout.write(f"rows={len(values)}")
+        self._report("digits", _fa_to_en_digits_legacy, normalize.fold_digits, values, repeat)
+        self._report("text  ", _normalize_text_legacy, normalize.normalize_text, values, repeat)
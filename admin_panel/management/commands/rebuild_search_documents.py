@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from accounts.utils.search import rebuild_search_documents
+from home.models import Contract
+from zlink.models import ReCode
+
+MODELS = {
+    "users": User,
+    "contracts": Contract,
+    "recodes": ReCode,
+}
+
+
+class Command(BaseCommand):
+    help = "بازسازی search_document (جستجوی پنل ادمین) برای کاربران، قراردادها و درخواست‌های Recode"
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help=f"از بین {', '.join(MODELS)} (پیش‌فرض: همه)")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        unknown = set(options["models"]) - set(MODELS)
+        if unknown:
+            raise CommandError(f"مدل ناشناخته: {', '.join(sorted(unknown))}")
+
+        for name in options["models"] or MODELS:
+            changed = rebuild_search_documents(MODELS[name], batch_size=options["batch_size"])
+            self.stdout.write(f"{name}: changed={changed}")
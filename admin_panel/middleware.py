@@ -0,0 +1,14 @@
+from .activity import activity_buffer
+
+
+class ActivityLogBufferMiddleware:
+    """
+    لاگ‌های فعالیت یک request را جمع می‌کند و در پایان با یک bulk_create می‌نویسد.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with activity_buffer():
+            return self.get_response(request)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['created_at', 'id'], name='admin_panel_created_4ca038_idx'),
+        ),
+    ]
@@ -52,6 +52,9 @@ class ActivityLog(models.Model):
         ordering = ["-created_at"]
         verbose_name = "فعالیت"
         verbose_name_plural = "فعالیت‌ها"
+        indexes = [
+            models.Index(fields=["created_at", "id"]),  # صفحه‌بندی cursor
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,225 @@
+# admin_panel/pagination.py
+"""
+صفحه‌بندی keyset (cursor) برای لیست‌های بزرگ پنل ادمین.
+
+Paginator جنگو برای هر صفحه یک COUNT(*) و یک OFFSET می‌زند؛ صفحه‌های عمیق
+به نسبت شماره‌ی صفحه کند می‌شوند. اینجا صفحه‌ی بعد با «بعد از آخرین ردیف»
+پیدا می‌شود (WHERE (created_at, id) < (...) ORDER BY ... LIMIT n+1) و
+هزینه‌ی هر صفحه ثابت است.
+
+کلیدها باید روی هم یکتا باشند (آخرینشان معمولاً id)، و بهتر است ایندکس داشته باشند.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connections
+from django.db.models import Q
+
+NEXT = "n"
+PREV = "p"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _split(key):
+    return (key[1:], True) if key.startswith("-") else (key, False)
+
+
+def _dump(value):
+    # DjangoJSONEncoder میکروثانیه را تا میلی‌ثانیه کوتاه می‌کند؛ برای مقایسه‌ی دقیق isoformat کامل
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def approximate_count(queryset, cap=1000):
+    """
+    (count, is_estimate)
+
+    - تا cap ردیف: شمارش دقیق (COUNT روی یک subquery با LIMIT)
+    - بیشتر از cap و کوئری بدون فیلتر روی MySQL: TABLE_ROWS از information_schema (بدون اسکن جدول)
+    - بیشتر از cap در بقیه‌ی حالت‌ها: cap با is_estimate=True (نمایش «cap+»)
+    """
+    qs = queryset.order_by()
+    count = qs[: cap + 1].count()
+    if count <= cap:
+        return count, False
+
+    conn = connections[qs.db]
+    if conn.vendor == "mysql" and not qs.query.where:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                    [qs.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] is not None:
+                return max(int(row[0]), cap), True
+        except DatabaseError:
+            pass
+
+    return cap, True
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_next, has_previous, count=None, count_is_estimate=False):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.count = count
+        self.count_is_estimate = count_is_estimate
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], NEXT)
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], PREV)
+
+    @property
+    def count_display(self):
+        if self.count is None:
+            return ""
+        return f"{self.count}+" if self.count_is_estimate else str(self.count)
+
+
+class KeysetPaginator:
+    """
+    KeysetPaginator(qs, per_page=20, ordering=("-created_at", "-id"))
+    page = paginator.get_page(request.GET.get("cursor"))
+    """
+
+    def __init__(self, queryset, per_page, ordering=("-created_at", "-id"), with_count=True, count_cap=1000):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.with_count = with_count
+        self.count_cap = count_cap
+
+    # ---------- cursor ----------
+
+    def encode_cursor(self, obj, direction):
+        values = [_dump(getattr(obj, _split(key)[0])) for key in self.ordering]
+        raw = json.dumps([direction, values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in (NEXT, PREV) or len(values) != len(self.ordering):
+                raise InvalidCursor(cursor)
+            opts = self.queryset.model._meta
+            values = [
+                opts.get_field(_split(key)[0]).to_python(value)
+                for key, value in zip(self.ordering, values)
+            ]
+        except (InvalidCursor, ValueError, TypeError, binascii.Error, ValidationError):
+            raise InvalidCursor(cursor)
+        return direction, values
+
+    # ---------- query ----------
+
+    def _after(self, values, reverse):
+        """
+        شرط «بعد از» برای کلیدهای چندتایی:
+        (a < va) OR (a = va AND b < vb) OR ...
+        """
+        condition = Q()
+        equal = Q()
+        for (key, value) in zip(self.ordering, values):
+            field, desc = _split(key)
+            op = "lt" if desc != reverse else "gt"
+            condition |= equal & Q(**{f"{field}__{op}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _order(self, reverse):
+        if not reverse:
+            return self.ordering
+        return tuple(key[1:] if key.startswith("-") else f"-{key}" for key in self.ordering)
+
+    def get_page(self, cursor=None):
+        direction, values = NEXT, None
+        if cursor:
+            try:
+                direction, values = self.decode_cursor(cursor)
+            except InvalidCursor:
+                direction, values = NEXT, None
+
+        reverse = direction == PREV
+        qs = self.queryset.order_by(*self._order(reverse))
+        if values is not None:
+            qs = qs.filter(self._after(values, reverse))
+
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        count, estimate = (None, False)
+        if self.with_count:
+            count, estimate = approximate_count(self.queryset, self.count_cap)
+
+        return KeysetPage(rows, self, has_next, has_previous, count, estimate)
+
+
+class KeysetPaginationMixin:
+    """
+    برای ListView: به جای Paginator جنگو از KeysetPaginator استفاده می‌کند.
+    در قالب: page_obj.next_cursor / page_obj.previous_cursor و page_obj.count_display
+    """
+    keyset_ordering = ("-created_at", "-id")
+    cursor_kwarg = "cursor"
+    count_cap = 1000
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            ordering=self.keyset_ordering,
+            count_cap=self.count_cap,
+        )
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # بقیه‌ی پارامترهای GET (فیلترها) برای لینک‌های قبلی/بعدی
+        params = self.request.GET.copy()
+        params.pop(self.cursor_kwarg, None)
+        params.pop("page", None)
+        ctx["cursor_query"] = params.urlencode()
+        return ctx
@@ -4,26 +4,19 @@ from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from accounts.models import User
 from .models import ActivityLog
+from .activity import log_activity
 from accounts.utils.threadlocal import get_current_user
 
-# فیلدهایی که می‌خوای روی تغییرشون لاگ ثبت بشه
-TRACKED_USER_FIELDS = ["full_name", "email", "phone", "role", "is_active", "is_staff", "is_superuser"]
+ROLE_LABELS = dict(User.ROLE_CHOICES)
 
 
 @receiver(pre_save, sender=User)
-def user_pre_save(sender, instance, **kwargs):
+def user_pre_save(sender, instance, update_fields=None, **kwargs):
     """
-    قبل از ذخیره، نسخه قبلی کاربر رو نگه می‌داریم تا بفهمیم چه فیلدهایی عوض شده.
+    قبل از ذخیره، مقادیر قبلی فیلدهای User.TRACKED_FIELDS رو نگه می‌داریم تا بفهمیم چه فیلدهایی عوض شده.
+    مقادیر از snapshot خود instance میاد؛ save(update_fields=["last_login"]) اصلاً کاری نمی‌کنه.
     """
-    if not instance.pk:
-        instance._old_state = None
-        return
-
-    try:
-        old_obj = sender.objects.get(pk=instance.pk)
-        instance._old_state = old_obj
-    except sender.DoesNotExist:
-        instance._old_state = None
+    instance._old_state = instance.get_old_tracked_values(update_fields)
 
 
 @receiver(post_save, sender=User)
@@ -37,7 +30,7 @@ def log_user_save(sender, instance, created, **kwargs):
     #  حالت ایجاد
     # -------------------------
     if created:
-        ActivityLog.objects.create(
+        log_activity(
             title=f"ایجاد کاربر جدید: {instance.username}",
             meta=f"نقش: {instance.get_role_display()}",
             category=ActivityLog.CATEGORY_USERS,
@@ -56,8 +49,7 @@ def log_user_save(sender, instance, created, **kwargs):
     changed_fields = []
     changes_detail = []
 
-    for field in TRACKED_USER_FIELDS:
-        old_val = getattr(old, field, None)
+    for field, old_val in old.items():
         new_val = getattr(instance, field, None)
 
         if old_val == new_val:
@@ -65,7 +57,7 @@ def log_user_save(sender, instance, created, **kwargs):
 
         # نمایش قشنگ‌تر برای بعضی فیلدها
         if field == "role":
-            old_val_disp = old.get_role_display()
+            old_val_disp = ROLE_LABELS.get(old_val, old_val)
             new_val_disp = instance.get_role_display()
             label = "نقش"
         elif field == "is_active":
@@ -93,7 +85,7 @@ def log_user_save(sender, instance, created, **kwargs):
 
     changes_str = " | ".join(changes_detail)
 
-    ActivityLog.objects.create(
+    log_activity(
         title=f"ویرایش مشخصات کاربر: {instance.username}",
         meta=f"تغییرات: {changes_str}",
         category=ActivityLog.CATEGORY_USERS,
@@ -109,7 +101,7 @@ def log_user_delete(sender, instance, **kwargs):
     """
     actor = get_current_user()  # کسی که حذف کرده
 
-    ActivityLog.objects.create(
+    log_activity(
         title=f"حذف کاربر: {instance.username}",
         meta=f"کاربر با نقش {instance.get_role_display()} حذف شد.",
         category=ActivityLog.CATEGORY_USERS,
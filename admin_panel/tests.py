@@ -1,3 +1,110 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from admin_panel.views_worklog import AdminWorklogPlansListView
+from worklog.models import DailyPlan, DailyReport, Project, ProjectMember
+
+
+class PlanStatsFallbackTests(TestCase):
+    """
+    _compute_stats (plan_status_counts در SQL) و _compute_stats_python (fallback)
+    باید برای هر روز و هر ترکیب عضویت فعال/غیرفعال دقیقاً یک عدد بدهند.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        cls.days = {
+            "past": cls.today - datetime.timedelta(days=1),
+            "today": cls.today,
+            "future": cls.today + datetime.timedelta(days=1),
+        }
+        project = Project.objects.create(title="p1", sheet_url="https://example.com/1")
+        other = Project.objects.create(title="p2", sheet_url="https://example.com/2")
+
+        def user(name, phone, is_active=True):
+            return User.objects.create_user(
+                username=name, password="x", phone=phone, email=f"{name}@example.com", is_active=is_active,
+            )
+
+        def member(u, p=project, is_active=True):
+            return ProjectMember.objects.create(project=p, user=u, is_active=is_active)
+
+        def plan(m, day, report=False):
+            p = DailyPlan.objects.create(project_member=m, date=day, locked_at=timezone.now())
+            if report:
+                DailyReport.objects.create(project_member=m, plan=p, date=day, locked_at=timezone.now())
+            return p
+
+        # پلن + گزارش
+        done = member(user("done", "09120000001"))
+        # فقط پلن
+        waiting = member(user("waiting", "09120000002"))
+        # بدون پلن
+        member(user("absent", "09120000003"))
+        # پلن و گزارش فقط روی عضویت غیرفعال؛ عضویت فعالش خالی است
+        mixed = user("mixed", "09120000004")
+        inactive = member(mixed, is_active=False)
+        member(mixed, p=other)
+        # دو عضویت فعال: پلن روی یکی، گزارش روی دیگری
+        split = user("split", "09120000005")
+        split_a = member(split)
+        split_b = member(split, p=other)
+        # فقط عضویت غیرفعال
+        only_inactive = member(user("only_inactive", "09120000006"), is_active=False)
+        # کاربر غیرفعال با عضویت فعال
+        disabled = member(user("disabled", "09120000007", is_active=False))
+
+        for day in cls.days.values():
+            plan(done, day, report=True)
+            plan(waiting, day)
+            plan(inactive, day, report=True)
+            plan(split_a, day)
+            plan(split_b, day, report=True)
+            plan(only_inactive, day, report=True)
+            plan(disabled, day, report=True)
+
+    def _querysets(self):
+        return {
+            # همان کوئری پایه‌ی AdminWorklogPlansListView
+            "members": (
+                User.objects
+                .filter(is_active=True, project_memberships__is_active=True)
+                .distinct()
+                .order_by("-date_joined")
+            ),
+            "all_users": User.objects.order_by("-date_joined"),
+        }
+
+    def _assert_same(self):
+        view = AdminWorklogPlansListView()
+        for label, day in self.days.items():
+            for name, qs in self._querysets().items():
+                with self.subTest(day=label, users=name):
+                    self.assertEqual(
+                        view._compute_stats(qs, day, self.today),
+                        view._compute_stats_python(qs, day, self.today),
+                    )
+
+    @override_settings(WORKLOG_USE_COMPLIANCE_SNAPSHOT=True)
+    def test_snapshot_matches_python(self):
+        self._assert_same()
+
+    @override_settings(WORKLOG_USE_COMPLIANCE_SNAPSHOT=False)
+    def test_live_query_matches_python(self):
+        self._assert_same()
+
+    def test_expected_counts(self):
+        view = AdminWorklogPlansListView()
+        qs = self._querysets()["members"]
+        self.assertEqual(
+            view._compute_stats_python(qs, self.days["past"], self.today),
+            {"total": 5, "done": 2, "waiting": 1, "planned": 0, "absent": 2},
+        )
+        self.assertEqual(
+            view._compute_stats_python(qs, self.days["future"], self.today),
+            {"total": 5, "done": 0, "waiting": 0, "planned": 3, "absent": 2},
+        )
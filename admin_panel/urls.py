@@ -17,6 +17,7 @@ urlpatterns = [
 
     path("recode/", views.ReCodeListView.as_view(), name="recode_list"),
     path("recode/<int:pk>/", views.ReCodeDetailView.as_view(), name="recode_detail"),
+    path("recode/duplicates/", views.ReCodeDuplicatesView.as_view(), name="recode_duplicates"),
 
     path("portfolio/projects/", AdminPortfolioProjectListView.as_view(), name="portfolio_projects"),
     path("portfolio/projects/create/", AdminPortfolioProjectCreateView.as_view(), name="portfolio_project_create"),
@@ -55,9 +56,11 @@ urlpatterns = [
 
     path("worklog/plans/", AdminWorklogPlansListView.as_view(), name="worklog_plans"),
     path('worklog/plans/<int:pk>/', AdminDailyPlanDetailView.as_view(), name='worklog_plan_detail'),
+    path("worklog/export/", AdminWorklogExportView.as_view(), name="worklog_export"),
 
     path('worklog/reports/', AdminWorklogReportListView.as_view(), name='worklog_reports'),
     path('worklog/reports/<int:pk>/', AdminReportDetailView.as_view(), name='worklog_report_detail'),
 
     path('worklog/status-overview/', AdminWorklogStatusOverview.as_view(), name='worklog_status_overview'),
+    path("worklog/heatmap/", AdminWorklogHeatmapView.as_view(), name="worklog_heatmap"),
 ]
@@ -11,9 +11,14 @@ from .forms import *
 from accounts.models import User
 from home.models import Contract
 from .models import ActivityLog
+from .pagination import KeysetPaginationMixin
+from accounts.utils.search import apply_search
 from home.models import SiteStat
-from django.db.models import Q, Count
+from home.counters import views_trend
+from worklog.dates import format_jalali_date
+from django.db.models import Count
 from zlink.models import ReCode, Referrer
+from zlink.service.dedupe import find_duplicates
 
 
 class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -56,6 +61,19 @@ class DashboardView(FullAdminRequiredMixin, TemplateView):
         stats = SiteStat.get_solo()
         ctx["active_users_count"] = stats.total_views  # 👈 اینجا عدد میره تو همون قالب قبلی
 
+        # روند بازدید ۱۴ روز اخیر
+        trend = views_trend(days=14)
+        peak = max((v for _, v in trend), default=0) or 1
+        ctx["views_trend"] = [
+            {
+                "date_j": format_jalali_date(day),
+                "views": views,
+                "percent": int(views * 100 / peak),
+            }
+            for day, views in trend
+        ]
+        ctx["today_views"] = trend[-1][1] if trend else 0
+
         # تعداد درخواست‌های ثبت‌شده امروز
         ctx["today_new_contracts"] = Contract.objects.filter(
             created_at__date=today
@@ -79,12 +97,20 @@ class DashboardView(FullAdminRequiredMixin, TemplateView):
         return ctx
 
 
-class ContractListView(FullAdminRequiredMixin, ListView):
+class ContractListView(KeysetPaginationMixin, FullAdminRequiredMixin, ListView):
     template_name = "admin-panel/contracts_list.html"
     model = Contract
     context_object_name = "contracts"
     paginate_by = 20
 
+    def get_queryset(self):
+        return apply_search(super().get_queryset(), self.request.GET.get("q"))
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["query"] = (self.request.GET.get("q") or "").strip()
+        return ctx
+
 
 class ContractDetailView(FullAdminRequiredMixin, DetailView):
     template_name = "admin-panel/contract_detail.html"
@@ -113,35 +139,16 @@ class ContractDetailView(FullAdminRequiredMixin, DetailView):
         return redirect("admin_panel:contract_detail", pk=self.object.pk)
 
 
-class UserListView(FullAdminRequiredMixin, ListView):
+class UserListView(KeysetPaginationMixin, FullAdminRequiredMixin, ListView):
     template_name = "admin-panel/user_list.html"
     model = User
     context_object_name = "users"
     paginate_by = 10
-    ordering = "-date_joined"
+    keyset_ordering = ("-date_joined", "-id")
 
     def get_queryset(self):
-        qs = super().get_queryset()
-
-        q = (self.request.GET.get("q") or "").strip()
-        if not q:
-            return qs
-
-        # فقط فیلدهایی که واقعاً تو مدل هست
-        lookup = (
-                Q(username__icontains=q) |
-                Q(full_name__icontains=q) |
-                Q(email__icontains=q) |
-                Q(phone__icontains=q)
-        )
-
-        # اگر بعداً فیلد شرکت/استارتاپ اضافه کردی اینجا اضافه میشه
-        existing = {f.name for f in User._meta.get_fields() if hasattr(f, "name")}
-        for f in ("startup", "startup_name", "company", "company_name"):
-            if f in existing:
-                lookup |= Q(**{f"{f}__icontains": q})
-
-        return qs.filter(lookup)
+        # username / نام / ایمیل / شماره از search_document (User.SEARCH_FIELDS)
+        return apply_search(super().get_queryset(), self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -154,7 +161,6 @@ class UserListView(FullAdminRequiredMixin, ListView):
             return super().render_to_response(context, **response_kwargs)
 
         page_obj = context["page_obj"]
-        paginator = context["paginator"]
 
         results = []
         for u in context["users"]:
@@ -170,13 +176,12 @@ class UserListView(FullAdminRequiredMixin, ListView):
 
         return JsonResponse({
             "results": results,
-            "count": paginator.count,
-            "page": page_obj.number,
-            "num_pages": paginator.num_pages,
+            "count": page_obj.count_display,
+            "count_is_estimate": page_obj.count_is_estimate,
             "has_next": page_obj.has_next(),
             "has_previous": page_obj.has_previous(),
-            "next_page": page_obj.next_page_number() if page_obj.has_next() else None,
-            "prev_page": page_obj.previous_page_number() if page_obj.has_previous() else None,
+            "next_cursor": page_obj.next_cursor,
+            "prev_cursor": page_obj.previous_cursor,
         })
 
 
@@ -213,7 +218,7 @@ class UserResetPasswordView(FullAdminRequiredMixin, FormView):
         return redirect("admin_panel:user_detail", pk=user.pk)
 
 
-class ReCodeListView(AdminRequiredMixin, ListView):
+class ReCodeListView(KeysetPaginationMixin, AdminRequiredMixin, ListView):
     template_name = "admin-panel/recode_list.html"
     model = ReCode
     context_object_name = "recode_list"
@@ -232,20 +237,8 @@ class ReCodeListView(AdminRequiredMixin, ListView):
         if ref:
             qs = qs.filter(referrer__code=ref)
 
-        # جستجو
-        q = (self.request.GET.get("q") or "").strip()
-        if q:
-            qs = qs.filter(
-                Q(first_name__icontains=q)
-                | Q(last_name__icontains=q)
-                | Q(phone__icontains=q)
-                | Q(email__icontains=q)
-                | Q(city__icontains=q)
-                | Q(referrer__name__icontains=q)
-                | Q(referrer__code__icontains=q)
-            )
-
-        return qs
+        # جستجو: نام، شماره، ایمیل، شهر و معرف همه در search_document هستند
+        return apply_search(qs, self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -263,6 +256,16 @@ class ReCodeListView(AdminRequiredMixin, ListView):
         return ctx
 
 
+class ReCodeDuplicatesView(AdminRequiredMixin, TemplateView):
+    # گروه‌های شماره/ایمیل یکسان با یک GROUP BY (zlink/service/dedupe.py)
+    template_name = "admin-panel/recode_duplicates.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["groups"] = find_duplicates()
+        return ctx
+
+
 class ReCodeDetailView(AdminRequiredMixin, DetailView):
     template_name = "admin-panel/recode_detail.html"
     model = ReCode
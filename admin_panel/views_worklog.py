@@ -1,27 +1,52 @@
 # admin_panel/views_worklog.py
 
+import csv
 import datetime
+import logging
 import re
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Set
 from urllib.parse import urlencode
 
-import jdatetime
 from django.apps import apps
 from django.conf import settings
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db import transaction
-from django.db.models import Prefetch, Q, OuterRef, Exists
-from django.http import Http404, HttpRequest, HttpResponse
+from django.db import DatabaseError, transaction
+from django.db.models import Prefetch, Q
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
+from django.views import View
 from django.views.generic import CreateView, ListView, TemplateView, DetailView
+from worklog.dates import (
+    fa_to_en_digits,
+    format_jalali_compact,
+    format_jalali_human,
+    format_jalali_pretty,
+    format_jalali_slash,
+    parse_jalali_to_gregorian,
+    to_jalali,
+    to_persian_digits,
+)
 from worklog.models import DailyPlan, DailyReport, Project, ProjectMember, ReportAchievement, ReportStatus
+from worklog.exports import EXPORT_HEADER, iter_export_rows
+from worklog.jcalendar import jalali_weekday, month_range, parse_jalali_month, shift_month
+from worklog.intervals import analyze_blocks, from_minutes
+from worklog.selectors import (
+    PLAN_STATUSES,
+    annotate_day_status,
+    annotate_plan_status,
+    day_status_counts,
+    month_compliance_bits,
+    plan_status_counts,
+)
 from .mixins import AdminRequiredMixin
+from .pagination import KeysetPaginator
 
 User = apps.get_model(settings.AUTH_USER_MODEL)
+logger = logging.getLogger(__name__)
 
 # ----------------------------
 # Constants
@@ -33,11 +58,8 @@ AVATAR_BG_MEMBER = "333"
 AVATAR_COLOR_MANAGER = "000"
 AVATAR_COLOR_MEMBER = "fff"
 
-PERSIAN_MONTHS = {
-    1: "فروردین", 2: "اردیبهشت", 3: "خرداد", 4: "تیر",
-    5: "مرداد", 6: "شهریور", 7: "مهر", 8: "آبان",
-    9: "آذر", 10: "دی", 11: "بهمن", 12: "اسفند",
-}
+# صفحه‌بندی keyset لیست‌های کاربران worklog (ایندکس accounts 0003)
+USER_KEYSET_ORDERING = ("-date_joined", "-id")
 
 
 # ----------------------------
@@ -57,72 +79,6 @@ def ui_avatar_url(name: str, is_manager: bool) -> str:
     return f"{UI_AVATAR_BASE}?name={safe}&background={AVATAR_BG_MEMBER}&color={AVATAR_COLOR_MEMBER}"
 
 
-def jalali_date_str(g_date) -> str:
-    """YYYY/MM/DD (انگلیسی) از date میلادی."""
-    if not g_date:
-        return ""
-    j = jdatetime.date.fromgregorian(date=g_date)
-    return f"{j.year:04d}/{j.month:02d}/{j.day:02d}"
-
-
-def fa_to_en_digits(value: str) -> str:
-    if not value:
-        return ""
-    fa = "۰۱۲۳۴۵۶۷۸۹"
-    ar = "٠١٢٣٤٥٦٧٨٩"
-    out = []
-    for ch in str(value):
-        if ch in fa:
-            out.append(str(fa.index(ch)))
-        elif ch in ar:
-            out.append(str(ar.index(ch)))
-        else:
-            out.append(ch)
-    return "".join(out)
-
-
-def to_persian_digits(value) -> str:
-    if value is None:
-        return ""
-    en = "0123456789"
-    fa = "۰۱۲۳۴۵۶۷۸۹"
-    return str(value).translate(str.maketrans({en[i]: fa[i] for i in range(10)}))
-
-
-def parse_jalali_to_gregorian(date_j: str):
-    """
-    '۱۴۰۴/۰۹/۰۱' یا '1404/09/01' => date میلادی
-    """
-    if not date_j:
-        return None
-    v = fa_to_en_digits(date_j).strip().replace("-", "/")
-    parts = v.split("/")
-    if len(parts) != 3:
-        return None
-    try:
-        jy, jm, jd = map(int, parts)
-        return jdatetime.date(jy, jm, jd).togregorian()
-    except Exception:
-        return None
-
-
-def jalali_human_from_gregorian(g_date) -> str:
-    """'۱ آذر ۱۴۰۴'"""
-    if not g_date:
-        return ""
-    j = jdatetime.date.fromgregorian(date=g_date)
-    return f"{to_persian_digits(j.day)} {PERSIAN_MONTHS.get(j.month, '')} {to_persian_digits(j.year)}"
-
-
-def jalali_compact_from_gregorian(g_date) -> str:
-    """'۱۴۰۴/۰۹/۰۱'"""
-    if not g_date:
-        return ""
-    j = jdatetime.date.fromgregorian(date=g_date)
-    s = f"{j.year:04d}/{j.month:02d}/{j.day:02d}"
-    return to_persian_digits(s)
-
-
 def user_role_label(user) -> str:
     """Label نقش کاربر (اگر get_role_display داشت)."""
     if hasattr(user, "get_role_display"):
@@ -139,16 +95,33 @@ def get_ui_avatar(name):
     return f"https://ui-avatars.com/api/?name={safe_name}&background=C5A059&color=000"
 
 
-def jalali_pretty(date_obj):
-    """نمایش تاریخ به صورت: ۲۵ آذر ۱۴۰۲"""
-    if not date_obj: return ""
-    j = jdatetime.date.fromgregorian(date=date_obj)
-    months = ["فروردین", "اردیبهشت", "خرداد", "تیر", "مرداد", "شهریور", "مهر", "آبان", "آذر", "دی", "بهمن", "اسفند"]
-    return f"{j.day} {months[j.month - 1]} {j.year}"
-
-
-def to_persian_digits(value):
-    return str(value).translate(str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹"))
+def minutes_text(minutes) -> str:
+    """۱۳۵ -> '۲ ساعت و ۱۵ دقیقه'"""
+    h, m = divmod(int(minutes or 0), 60)
+    if h and m:
+        return f"{to_persian_digits(h)} ساعت و {to_persian_digits(m)} دقیقه"
+    if h:
+        return f"{to_persian_digits(h)} ساعت"
+    return f"{to_persian_digits(m)} دقیقه"
+
+
+def schedule_summary_display(summary) -> dict:
+    """ScheduleSummary (worklog.intervals) -> مقادیر آماده برای تمپلیت"""
+    hhmm = lambda m: to_persian_digits(from_minutes(m).strftime("%H:%M"))
+    return {
+        "covered": minutes_text(summary.covered_minutes),
+        "required": minutes_text(summary.required_minutes),
+        "extra": minutes_text(summary.extra_minutes),
+        "free": minutes_text(summary.gap_minutes),
+        "utilisation": to_persian_digits(summary.utilisation_percent),
+        "utilisation_raw": summary.utilisation_percent,
+        "gaps": [{"start": hhmm(s), "end": hhmm(e)} for s, e in summary.gaps],
+        "overlaps": [
+            {"first": a.label, "second": b.label, "start": hhmm(b.start), "end": hhmm(min(a.end, b.end))}
+            for a, b in summary.overlaps
+        ],
+        "has_blocks": bool(summary.spans),
+    }
 
 
 # ----------------------------
@@ -264,7 +237,7 @@ class AdminWorklogProjectListView(AdminRequiredMixin, ListView):
                 "title": project.title,
                 "is_active": project.is_active,
                 "sheet_url": project.sheet_url,
-                "created_jalali": jalali_date_str(project.created_at.date() if project.created_at else None),
+                "created_jalali": format_jalali_slash(project.created_at.date() if project.created_at else None),
                 "avatars": avatars,
                 "remaining_count": remaining_count,
                 "team_is_grayscale": (not project.is_active),
@@ -622,13 +595,25 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
         return f"{y:04d}/{mo:02d}/{d:02d}"
 
     def _compute_stats(self, users_qs, selected_g, today) -> Dict[str, int]:
+        try:
+            return plan_status_counts(users_qs, selected_g, today)
+        except DatabaseError:
+            logger.exception("plan_status_counts failed; falling back to python stats")
+            return self._compute_stats_python(users_qs, selected_g, today)
+
+    def _compute_stats_python(self, users_qs, selected_g, today) -> Dict[str, int]:
+        """
+        همان طبقه‌بندی plan_status_counts ولی در پایتون (کند؛ با تعداد کاربران خطی).
+        فقط وقتی استفاده می‌شود که کوئری SQL خطا بدهد.
+        """
         user_ids = list(users_qs.values_list("id", flat=True))
         if not user_ids:
             return {"total": 0, "done": 0, "waiting": 0, "planned": 0, "absent": 0}
 
+        # کاربرها را users_qs انتخاب می‌کند (مثل مسیر SQL)؛ اینجا فقط عضویت فعال
         memberships = list(
             ProjectMember.objects
-            .filter(user_id__in=user_ids, is_active=True, user__is_active=True)
+            .filter(user_id__in=user_ids, is_active=True)
             .values("id", "user_id")
         )
         mem_ids = [m["id"] for m in memberships]
@@ -685,7 +670,6 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
         user_id = (req.GET.get("user") or "").strip()
         status = (req.GET.get("status") or "").strip()
         nav = (req.GET.get("nav") or "").strip()
-        page = req.GET.get("page") or 1
 
         today = timezone.localdate()
 
@@ -706,8 +690,8 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
         else:
             selected_g = base_g
 
-        date_j_display = jalali_compact_from_gregorian(selected_g)
-        date_title = jalali_human_from_gregorian(selected_g)
+        date_j_display = format_jalali_compact(selected_g)
+        date_title = format_jalali_human(selected_g)
 
         # ---------------------------
         # 1) Query پایه (بدون status)
@@ -716,7 +700,7 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
             User.objects
             .filter(is_active=True, project_memberships__is_active=True)
             .distinct()
-            .only("id", "username", "full_name", "role")
+            .only("id", "username", "full_name", "role", "date_joined")
             .order_by("-date_joined")
         )
 
@@ -734,42 +718,15 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
         # ---------------------------
         users_for_list = base_users_qs
 
-        if status:
-            plan_exists = DailyPlan.objects.filter(
-                date=selected_g,
-                project_member__user_id=OuterRef("pk"),
-                project_member__is_active=True,
-                project_member__user__is_active=True,
-            )
-            report_exists = DailyReport.objects.filter(
-                plan__date=selected_g,
-                plan__project_member__user_id=OuterRef("pk"),
-                plan__project_member__is_active=True,
-                plan__project_member__user__is_active=True,
-            )
-
-            users_for_list = users_for_list.annotate(
-                _has_plan=Exists(plan_exists),
-                _has_report=Exists(report_exists),
-            )
+        if status in PLAN_STATUSES:
+            users_for_list = annotate_plan_status(users_for_list, selected_g, today).filter(plan_status=status)
 
-            if status == "absent":
-                users_for_list = users_for_list.filter(_has_plan=False)
-            elif status == "planned":
-                users_for_list = users_for_list.filter(_has_plan=True) if selected_g > today else users_for_list.none()
-            elif status == "done":
-                users_for_list = users_for_list.filter(
-                    _has_report=True) if selected_g <= today else users_for_list.none()
-            elif status == "waiting":
-                if selected_g <= today:
-                    users_for_list = users_for_list.filter(_has_plan=True, _has_report=False)
-                else:
-                    users_for_list = users_for_list.none()
+        # keyset روی (date_joined, id)؛ آمار بالای صفحه total را دارد، پس COUNT جدا لازم نیست
+        page_obj = KeysetPaginator(
+            users_for_list, self.paginate_by, ordering=USER_KEYSET_ORDERING, with_count=False,
+        ).get_page(req.GET.get("cursor"))
 
-        paginator = Paginator(users_for_list, self.paginate_by)
-        page_obj = paginator.get_page(page)
-
-        page_user_ids = list(page_obj.object_list.values_list("id", flat=True))
+        page_user_ids = [u.id for u in page_obj.object_list]
 
         memberships = list(
             ProjectMember.objects
@@ -817,7 +774,6 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
                     user_has_report[uid] = True
 
         rows: List[DailyRow] = []
-        start_index = (page_obj.number - 1) * self.paginate_by
 
         visible_index = 0
         for u in page_obj.object_list:
@@ -834,7 +790,7 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
 
             visible_index += 1
             rows.append(DailyRow(
-                index=start_index + visible_index,
+                index=visible_index,
                 user_id=uid,
                 user_name=name,
                 user_role=user_role_label(u),
@@ -846,7 +802,7 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
                 plan_id=user_plan_id.get(uid),
             ))
 
-        # querystring برای pagination (بدون nav و بدون page)
+        # querystring برای pagination (بدون nav و بدون cursor)
         params = {}
         if date_j_display: params["date_j"] = date_j_display
         if q: params["q"] = q
@@ -863,28 +819,19 @@ class AdminWorklogPlansListView(AdminRequiredMixin, TemplateView):
 
             "rows": rows,
             "page_obj": page_obj,
-            "is_paginated": page_obj.paginator.num_pages > 1,
+            "is_paginated": page_obj.has_other_pages(),
             "query_params": query_params,
 
             "stat_total": stats["total"],
             "stat_done": stats["done"],
             "stat_waiting": stats["waiting"],
             "stat_absent": stats["absent"],
+
+            "export_projects": Project.objects.order_by("title").values("id", "title"),
         })
         return ctx
 
 
-def jalali_human_from_dt(dt) -> str:
-    """ '۲۴ آذر ۱۴۰۴ - ۲۲:۳۰' """
-    if not dt:
-        return ""
-    g_date = dt.date()
-    j = jdatetime.date.fromgregorian(date=g_date)
-    hh = to_persian_digits(f"{dt.hour:02d}")
-    mm = to_persian_digits(f"{dt.minute:02d}")
-    return f"{to_persian_digits(j.day)} {PERSIAN_MONTHS.get(j.month, '')} {to_persian_digits(j.year)} - {hh}:{mm}"
-
-
 # ----------------------------
 # Detail View
 # ----------------------------
@@ -916,8 +863,8 @@ class AdminDailyPlanDetailView(AdminRequiredMixin, DetailView):
         ctx['project_name'] = plan.project_member.project.title
 
         # 2. تبدیل تاریخ‌ها به شمسی و فارسی
-        ctx['date_pretty'] = to_persian_digits(jalali_pretty(plan.date))
-        ctx['created_at_pretty'] = to_persian_digits(jalali_pretty(plan.created_at.date()))
+        ctx['date_pretty'] = to_persian_digits(format_jalali_pretty(plan.date))
+        ctx['created_at_pretty'] = to_persian_digits(format_jalali_pretty(plan.created_at.date()))
 
         # 3. بررسی وضعیت اهداف (Achievements)
         # اگر گزارشی برای این پلن ثبت شده باشد، وضعیت تیک خوردن اهداف را می‌کشیم
@@ -958,6 +905,9 @@ class AdminDailyPlanDetailView(AdminRequiredMixin, DetailView):
             })
         ctx['schedule_display'] = schedule_list
 
+        # 5. خلاصه‌ی زمان‌بندی (هم‌پوشانی، زمان خالی، سهم تسک اصلی/اضافه)
+        ctx['schedule_summary'] = schedule_summary_display(analyze_blocks(plan.schedule_blocks.all()))
+
         return ctx
 
 
@@ -988,7 +938,6 @@ class AdminWorklogReportListView(AdminRequiredMixin, TemplateView):
         q = (req.GET.get("q") or "").strip()
         filter_status = (req.GET.get("status") or "").strip()
         nav = (req.GET.get("nav") or "").strip()
-        page = int(req.GET.get("page") or 1)
 
         today = timezone.localdate()
 
@@ -1006,8 +955,8 @@ class AdminWorklogReportListView(AdminRequiredMixin, TemplateView):
         else:
             selected_g = base_g
 
-        date_j_display = jalali_compact_from_gregorian(selected_g)
-        date_title = jalali_human_from_gregorian(selected_g)
+        date_j_display = format_jalali_compact(selected_g)
+        date_title = format_jalali_human(selected_g)
 
         # ---- base users ----
         users_base = (
@@ -1023,16 +972,13 @@ class AdminWorklogReportListView(AdminRequiredMixin, TemplateView):
                 Q(full_name__icontains=q) | Q(username__icontains=q)
             )
 
-        # ---- annotate has_report (برای همین تاریخ) ----
-        report_exists_qs = DailyReport.objects.filter(
-            date=selected_g,
-            project_member__user_id=OuterRef("pk")
-        )
-        users_base = users_base.annotate(has_report=Exists(report_exists_qs))
-
         # ---- stats (همه‌ی یوزرها بعد از q، مستقل از status filter) ----
-        total = users_base.count()
-        registered = users_base.filter(has_report=True).count()
+        counts = day_status_counts(users_base, selected_g)
+        total = counts["total"]
+        registered = counts["with_report"]
+
+        # ---- annotate has_report (برای همین تاریخ) ----
+        users_base = annotate_day_status(users_base, selected_g)
 
         if selected_g < today:
             waiting = 0
@@ -1066,10 +1012,11 @@ class AdminWorklogReportListView(AdminRequiredMixin, TemplateView):
             else:
                 users_for_list = users_for_list.none()
 
-        # ---- paginate ----
-        paginator = Paginator(users_for_list, self.paginate_by)
-        page_obj = paginator.get_page(page)
-        page_user_ids = list(page_obj.object_list.values_list("id", flat=True))
+        # ---- paginate (keyset؛ total در stats هست) ----
+        page_obj = KeysetPaginator(
+            users_for_list, self.paginate_by, ordering=USER_KEYSET_ORDERING, with_count=False,
+        ).get_page(req.GET.get("cursor"))
+        page_user_ids = [u.id for u in page_obj.object_list]
 
         # ---- fetch reports only for page users ----
         reports_qs = (
@@ -1123,6 +1070,9 @@ class AdminWorklogReportListView(AdminRequiredMixin, TemplateView):
 
             rows.append(row)
 
+        params = {"date_j": date_j_display, "q": q, "status": filter_status}
+        query_params = urlencode({k: v for k, v in params.items() if v})
+
         ctx.update({
             "rows": rows,
             "stats": stats,
@@ -1134,8 +1084,8 @@ class AdminWorklogReportListView(AdminRequiredMixin, TemplateView):
             "selected_date_title": date_title,
 
             "page_obj": page_obj,
-            "paginator": paginator,
-            "is_paginated": paginator.num_pages > 1,
+            "is_paginated": page_obj.has_other_pages(),
+            "query_params": query_params,
         })
         return ctx
 
@@ -1174,7 +1124,7 @@ class AdminReportDetailView(AdminRequiredMixin, DetailView):
         ctx['project_title'] = report.project_member.project.title
 
         # تاریخ و زمان
-        ctx['date_pretty'] = jalali_human_from_gregorian(report.date)
+        ctx['date_pretty'] = format_jalali_human(report.date)
         # ساعت ثبت (از created_at یا locked_at)
         time_obj = report.created_at
         ctx['time_pretty'] = f"{to_persian_digits(time_obj.hour):0>2}:{to_persian_digits(time_obj.minute):0>2}"
@@ -1288,7 +1238,6 @@ class AdminWorklogStatusOverview(AdminRequiredMixin, TemplateView):
         q = (req.GET.get("q") or "").strip()
         status_filter = (req.GET.get("status") or "").strip()  # missing_plan | missing_report | all_ok
         nav = (req.GET.get("nav") or "").strip()
-        page_num = req.GET.get("page") or 1
 
         today = timezone.localdate()
 
@@ -1306,8 +1255,8 @@ class AdminWorklogStatusOverview(AdminRequiredMixin, TemplateView):
         else:
             selected_g = base_g
 
-        date_j_display = jalali_compact_from_gregorian(selected_g)
-        date_title = jalali_human_from_gregorian(selected_g)
+        date_j_display = format_jalali_compact(selected_g)
+        date_title = format_jalali_human(selected_g)
 
         # 3. کوئری اصلی کاربران (Active)
         users_qs = User.objects.filter(is_active=True).order_by("-date_joined")
@@ -1317,21 +1266,7 @@ class AdminWorklogStatusOverview(AdminRequiredMixin, TemplateView):
 
         # 4. Annotate (بررسی وجود پلن و گزارش)
         # توجه: پلن و گزارش به ProjectMember وصل هستند، پس باید از طریق آن چک کنیم.
-
-        has_plan_subquery = DailyPlan.objects.filter(
-            project_member__user=OuterRef('pk'),
-            date=selected_g
-        )
-
-        has_report_subquery = DailyReport.objects.filter(
-            project_member__user=OuterRef('pk'),
-            date=selected_g
-        )
-
-        users_qs = users_qs.annotate(
-            has_plan=Exists(has_plan_subquery),
-            has_report=Exists(has_report_subquery)
-        )
+        users_qs = annotate_day_status(users_qs, selected_g)
 
         # 5. اعمال فیلتر وضعیت (اختیاری)
         if status_filter == "missing_plan":
@@ -1343,22 +1278,16 @@ class AdminWorklogStatusOverview(AdminRequiredMixin, TemplateView):
         elif status_filter == "has_report":
             users_qs = users_qs.filter(has_report=True)
 
-        # 6. آمار سریع (Stats) برای بالای صفحه (روی کل کوئری فیلتر نشده بر اساس وضعیت)
-        # برای آمار دقیق باید یک کوئری جدا بدون فیلتر status بزنیم یا همین را قبل فیلتر استفاده کنیم.
-        # اینجا برای سادگی روی همین لیست فیلتر شده یا کل یوزرها آمار میگیریم:
-        total_users = User.objects.filter(is_active=True).count()
-        # تعداد کسانی که پلن دارند
-        total_plans = User.objects.filter(is_active=True).annotate(
-            has_p=Exists(has_plan_subquery)
-        ).filter(has_p=True).count()
-        # تعداد کسانی که گزارش دارند
-        total_reports = User.objects.filter(is_active=True).annotate(
-            has_r=Exists(has_report_subquery)
-        ).filter(has_r=True).count()
-
-        # 7. صفحه بندی
-        paginator = Paginator(users_qs, self.paginate_by)
-        page_obj = paginator.get_page(page_num)
+        # 6. آمار سریع (Stats) برای بالای صفحه: همه‌ی کاربران فعال، مستقل از q و status، در یک کوئری
+        counts = day_status_counts(User.objects.filter(is_active=True), selected_g)
+        total_users = counts["total"]
+        total_plans = counts["with_plan"]
+        total_reports = counts["with_report"]
+
+        # 7. صفحه بندی (keyset؛ بدون COUNT و OFFSET)
+        page_obj = KeysetPaginator(
+            users_qs, self.paginate_by, ordering=USER_KEYSET_ORDERING, with_count=False,
+        ).get_page(req.GET.get("cursor"))
 
         # 8. آماده‌سازی داده برای نمایش
         rows = []
@@ -1398,3 +1327,186 @@ class AdminWorklogStatusOverview(AdminRequiredMixin, TemplateView):
         })
 
         return ctx
+
+
+class _Echo:
+    """csv.writer روی این می‌نویسد و خط را برمی‌گرداند تا مستقیم stream شود."""
+
+    def write(self, value):
+        return value
+
+
+class AdminWorklogExportView(AdminRequiredMixin, View):
+    """
+    GET worklog/export/?from_j=1404/01/01&to_j=1404/12/29&project=<id>
+        یا ?month_j=1404/09 برای یک ماه کامل
+
+    خروجی CSV پلن‌ها، بلاک‌ها، وضعیت ReportEntry و انجام دستاوردها به صورت stream؛
+    خواندن تکه‌ای در worklog/exports.py است و حافظه به طول بازه بستگی ندارد.
+    """
+    max_days = 400
+
+    def get(self, request):
+        month_j = (request.GET.get("month_j") or "").strip()
+        if month_j:
+            try:
+                start, end = month_range(*parse_jalali_month(month_j))
+            except ValueError:
+                start = end = None
+        else:
+            start = parse_jalali_to_gregorian(request.GET.get("from_j") or "")
+            end = parse_jalali_to_gregorian(request.GET.get("to_j") or "") or start
+        project = (request.GET.get("project") or "").strip()
+        project_id = int(project) if project.isdigit() else None
+
+        if not start or end < start:
+            messages.error(request, "بازه‌ی تاریخ خروجی نامعتبر است.")
+            return redirect("admin_panel:worklog_plans")
+        if (end - start).days >= self.max_days:
+            messages.error(request, f"بازه‌ی خروجی حداکثر {self.max_days} روز است.")
+            return redirect("admin_panel:worklog_plans")
+
+        writer = csv.writer(_Echo())
+
+        def rows():
+            # BOM تا Excel فارسی را درست باز کند
+            yield "\ufeff"
+            yield writer.writerow(EXPORT_HEADER)
+            for row in iter_export_rows(start, end, project_id):
+                yield writer.writerow(row)
+
+        filename = f"worklog_{start:%Y%m%d}_{end:%Y%m%d}.csv"
+        response = StreamingHttpResponse(rows(), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+def heatmap_cells(plan_bits, report_bits, start, days, today):
+    """
+    بیت‌ست‌های یک کاربر -> وضعیت هر روز برای نمایش:
+    done / waiting / planned / absent ؛ "" برای روز آینده‌ی بدون پلن
+    """
+    cells = []
+    for i in range(days):
+        day = start + datetime.timedelta(days=i)
+        has_plan = (plan_bits >> i) & 1
+        has_report = (report_bits >> i) & 1
+        if has_report:
+            cells.append("done")
+        elif has_plan:
+            cells.append("planned" if day > today else "waiting")
+        else:
+            cells.append("" if day > today else "absent")
+    return cells
+
+
+class AdminWorklogHeatmapView(AdminRequiredMixin, TemplateView):
+    """
+    وضعیت پلن/گزارش یک ماه شمسی: کاربران × روزها، با یک کوئری برای کل ماتریس.
+
+    GET worklog/heatmap/?month_j=1404/09&q=&page=
+    ?format=json همان داده را فشرده برمی‌گرداند؛ برای هر کاربر دو عدد plan و report
+    که بیت i آن‌ها یعنی روز i+1 ماه پلن/گزارش دارد.
+    """
+    template_name = "admin-panel/worklog/heatmap.html"
+    paginate_by = 30
+
+    def _month(self, today):
+        raw = fa_to_en_digits(self.request.GET.get("month_j") or "").strip()
+        if raw:
+            try:
+                return parse_jalali_month(raw)
+            except ValueError:
+                messages.error(self.request, "ماه انتخاب‌شده نامعتبر است.")
+        j = to_jalali(today)
+        return j.year, j.month
+
+    def get_heatmap(self):
+        req = self.request
+        today = timezone.localdate()
+        jy, jm = self._month(today)
+        start, end = month_range(jy, jm)
+        days = (end - start).days + 1
+
+        q = (req.GET.get("q") or "").strip()
+        users_qs = User.objects.filter(is_active=True).only("id", "username", "full_name").order_by("-date_joined")
+        if q:
+            users_qs = users_qs.filter(Q(full_name__icontains=q) | Q(username__icontains=q))
+
+        page_obj = Paginator(users_qs, self.paginate_by).get_page(req.GET.get("page") or 1)
+        users = list(page_obj.object_list)
+        bits = month_compliance_bits([u.id for u in users], start, end)
+
+        return {
+            "jy": jy,
+            "jm": jm,
+            "start": start,
+            "days": days,
+            "today": today,
+            "q": q,
+            "page_obj": page_obj,
+            "users": [(u, *bits.get(u.id, (0, 0))) for u in users],
+        }
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") != "json":
+            return super().get(request, *args, **kwargs)
+
+        data = self.get_heatmap()
+        page_obj = data["page_obj"]
+        return JsonResponse({
+            "ok": True,
+            "month_j": f"{data['jy']:04d}/{data['jm']:02d}",
+            "start": data["start"].isoformat(),
+            "days": data["days"],
+            "weekday_offset": jalali_weekday(data["start"]),
+            "page": page_obj.number,
+            "num_pages": page_obj.paginator.num_pages,
+            "users": [
+                {"id": u.id, "name": user_display_name(u), "plan": plan_bits, "report": report_bits}
+                for u, plan_bits, report_bits in data["users"]
+            ],
+        })
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        data = self.get_heatmap()
+        start, days, today = data["start"], data["days"], data["today"]
+
+        day_headers = []
+        for i in range(days):
+            day = start + datetime.timedelta(days=i)
+            day_headers.append({
+                "num": to_persian_digits(i + 1),
+                "is_friday": jalali_weekday(day) == 6,
+                "is_today": day == today,
+            })
+
+        rows = []
+        for user, plan_bits, report_bits in data["users"]:
+            cells = heatmap_cells(plan_bits, report_bits, start, days, today)
+            rows.append({
+                "user": user,
+                "name": user_display_name(user),
+                "cells": cells,
+                "done": to_persian_digits(cells.count("done")),
+                "absent": to_persian_digits(cells.count("absent")),
+            })
+
+        jy, jm = data["jy"], data["jm"]
+        month_j = f"{jy:04d}/{jm:02d}"
+        params = {"q": data["q"]} if data["q"] else {}
+        ctx.update({
+            "month_j": month_j,
+            "month_title": f"{to_jalali(start).month_name} {to_persian_digits(jy)}",
+            "prev_month_j": "%04d/%02d" % shift_month(jy, jm, -1),
+            "next_month_j": "%04d/%02d" % shift_month(jy, jm, 1),
+            "q": data["q"],
+            "day_headers": day_headers,
+            "rows": rows,
+            "page_obj": data["page_obj"],
+            "is_paginated": data["page_obj"].has_other_pages(),
+            "query_params": urlencode({"month_j": month_j, **params}),
+            "json_url": f"{reverse('admin_panel:worklog_heatmap')}?{urlencode({'month_j': month_j, 'format': 'json', **params})}",
+        })
+        return ctx
@@ -1,7 +1,7 @@
 # home/admin.py
 
 from django.contrib import admin
-from .models import Contract, SiteStat
+from .models import Contract, SiteDailyStat, SiteStat
 
 
 @admin.register(Contract)
@@ -81,3 +81,15 @@ class SiteStatAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         # نذار پاکش کنن، چون آمار سایت هست
         return False
+
+
+@admin.register(SiteDailyStat)
+class SiteDailyStatAdmin(admin.ModelAdmin):
+    list_display = ("date", "path", "views")
+    list_filter = ("date",)
+    search_fields = ("path",)
+    readonly_fields = ("date", "path", "views")
+
+    def has_add_permission(self, request):
+        # فقط شمارنده‌ی بازدید پرش می‌کند
+        return False
@@ -6,4 +6,5 @@ class HomeConfig(AppConfig):
     name = "home"
 
     def ready(self):
+        import Config.checks
         import home.signals
\ No newline at end of file
@@ -0,0 +1,253 @@
+# home/counters.py
+"""
+شمارنده‌ی بازدید با بافر در cache مشترک.
+
+- هر بازدید با incr اتمیک به بافرِ (روز، مسیر) خودش اضافه می‌شود.
+- flush وقتی انجام می‌شود که بافر به flush_threshold برسد یا قدیمی‌ترین
+  بازدید flush‌نشده از max_age ثانیه گذشته باشد.
+- flush دقیقاً همان مقداری را که به دیتابیس برده از بافر کم می‌کند (صفر نمی‌کند).
+- flush دستی: python manage.py flush_view_counters ؛ و در خروج پروسه (atexit).
+
+اگر cache مشترک incr اتمیک نداشته باشد (DatabaseCache)، بافر داخل همان پروسه
+(worker) نگه داشته می‌شود با همان flush_threshold / max_age و atexit؛ هر flush یک
+UPDATE ... F() برای هر (روز، مسیر) است، نه برای هر بازدید. بازدیدهای بافرشده‌ی
+worker ای که kill -9 شود از دست می‌روند؛ برای production از Redis استفاده کنید.
+"""
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from Config.cache import (
+    acquire_lock,
+    add_once,
+    clear_key,
+    get_counter,
+    incr_counter,
+    release_lock,
+    supports_atomic_incr,
+    take_counter,
+)
+from .models import SiteDailyStat, SiteStat
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    def __init__(self, name, flush_threshold=100, max_age=60, lookback_days=7):
+        self.name = name
+        self.flush_threshold = flush_threshold
+        self.max_age = max_age
+        self.lookback_days = lookback_days
+
+        self._registered = set()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+        # بافر داخل پروسه وقتی cache مشترک incr اتمیک ندارد: {(day, path): views}
+        self._local = {}
+        self._local_pending = 0
+        self._local_since = None
+
+    # ---------- keys ----------
+
+    @property
+    def pending_key(self):
+        return f"{self.name}:pending"
+
+    @property
+    def pending_since_key(self):
+        return f"{self.name}:pending_since"
+
+    @property
+    def flush_lock_key(self):
+        return f"{self.name}:flush_lock"
+
+    def bucket_key(self, day, path):
+        digest = hashlib.md5(path.encode("utf-8")).hexdigest()[:16]
+        return f"{self.name}:{day.isoformat()}:{digest}"
+
+    @staticmethod
+    def normalize_path(path):
+        path = (path or "/").split("?", 1)[0]
+        return path[: SiteDailyStat._meta.get_field("path").max_length]
+
+    # ---------- write ----------
+
+    def _register_bucket(self, day, path):
+        """
+        ردیف SiteDailyStat همان فهرست باکت‌هاست؛ flush از روی آن کلیدها را پیدا می‌کند.
+        در هر پروسه برای هر (روز، مسیر) فقط یک بار کوئری می‌زند.
+        """
+        if (day, path) in self._registered:
+            return
+        SiteDailyStat.objects.get_or_create(date=day, path=path)
+        with self._lock:
+            if len(self._registered) > 1000:
+                self._registered.clear()
+            self._registered.add((day, path))
+
+    def hit(self, path="/", step=1):
+        path = self.normalize_path(path)
+        day = timezone.localdate()
+
+        if not supports_atomic_incr():
+            self._hit_local(day, path, step)
+            return
+
+        self._register_bucket(day, path)
+        self._ensure_atexit()
+
+        incr_counter(self.bucket_key(day, path), step)
+        pending = incr_counter(self.pending_key, step)
+        add_once(self.pending_since_key, int(time.time()))
+
+        if pending >= self.flush_threshold or self._is_stale():
+            self.flush()
+
+    def _hit_local(self, day, path, step):
+        self._ensure_atexit()
+        with self._lock:
+            self._local[(day, path)] = self._local.get((day, path), 0) + step
+            self._local_pending += step
+            if self._local_since is None:
+                self._local_since = time.time()
+            due = (
+                self._local_pending >= self.flush_threshold
+                or time.time() - self._local_since >= self.max_age
+            )
+        if due:
+            self._flush_local()
+
+    def _is_stale(self):
+        since = get_counter(self.pending_since_key)
+        return bool(since) and (time.time() - since) >= self.max_age
+
+    # ---------- flush ----------
+
+    def flush(self):
+        """
+        بافر همه‌ی باکت‌های اخیر را به دیتابیس منتقل می‌کند و تعداد منتقل‌شده را برمی‌گرداند.
+        اگر پروسه‌ی دیگری در حال flush باشد، کاری نمی‌کند.
+        """
+        if not supports_atomic_incr():
+            return self._flush_local()
+        if not acquire_lock(self.flush_lock_key):
+            return 0
+
+        try:
+            return self._flush_locked()
+        finally:
+            release_lock(self.flush_lock_key)
+
+    def _flush_locked(self):
+        since_day = timezone.localdate() - timedelta(days=self.lookback_days)
+        rows = list(SiteDailyStat.objects.filter(date__gte=since_day).only("id", "date", "path"))
+
+        taken = []
+        for row in rows:
+            key = self.bucket_key(row.date, row.path)
+            amount = get_counter(key)
+            if amount > 0:
+                take_counter(key, amount)
+                taken.append((row, key, amount))
+
+        if not taken:
+            # شمارنده‌ی کل از باکت‌ها جلو افتاده (مثلاً باکت خارج از lookback)؛ صفرش کن
+            stale = get_counter(self.pending_key)
+            if stale > 0:
+                take_counter(self.pending_key, stale)
+            clear_key(self.pending_since_key)
+            return 0
+
+        total = sum(amount for _, _, amount in taken)
+        try:
+            with transaction.atomic():
+                for row, _, amount in taken:
+                    SiteDailyStat.objects.filter(pk=row.pk).update(views=F("views") + amount)
+                SiteStat.increase_views(total)
+        except Exception:
+            # برگرداندن به بافر تا بازدیدها از دست نروند
+            logger.exception("view counter %s: flush of %s views failed; restored to buffer", self.name, total)
+            for _, key, amount in taken:
+                incr_counter(key, amount)
+            raise
+
+        take_counter(self.pending_key, total)
+        clear_key(self.pending_since_key)
+        return total
+
+    def _flush_local(self):
+        """بافر همین پروسه؛ بین workerها قفل لازم نیست چون UPDATE ها F() هستند."""
+        with self._lock:
+            taken, self._local = self._local, {}
+            total, self._local_pending = self._local_pending, 0
+            self._local_since = None
+        if not taken:
+            return 0
+
+        try:
+            with transaction.atomic():
+                for (day, path), amount in taken.items():
+                    qs = SiteDailyStat.objects.filter(date=day, path=path)
+                    if not qs.update(views=F("views") + amount):
+                        SiteDailyStat.objects.get_or_create(date=day, path=path)
+                        qs.update(views=F("views") + amount)
+                SiteStat.increase_views(total)
+        except Exception:
+            logger.exception("view counter %s: flush of %s views failed; restored to buffer", self.name, total)
+            with self._lock:
+                for bucket, amount in taken.items():
+                    self._local[bucket] = self._local.get(bucket, 0) + amount
+                self._local_pending += total
+                if self._local_since is None:
+                    self._local_since = time.time()
+            raise
+        return total
+
+    def _ensure_atexit(self):
+        if self._atexit_registered:
+            return
+        with self._lock:
+            if not self._atexit_registered:
+                atexit.register(self._flush_on_exit)
+                self._atexit_registered = True
+
+    def _flush_on_exit(self):
+        # در atexit خطا را بالا نمی‌بریم، ولی بدون log هم نمی‌گذاریم (بازدیدها در بافر می‌مانند)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("view counter %s: flush on exit failed", self.name)
+
+
+site_views = ViewCounter(
+    "site_views",
+    flush_threshold=getattr(settings, "VIEW_COUNTER_FLUSH_THRESHOLD", 100),
+    max_age=getattr(settings, "VIEW_COUNTER_MAX_AGE", 60),
+)
+
+
+def views_trend(days=14, path=None):
+    """
+    [(date, views), ...] برای days روز اخیر (روزهای بدون بازدید هم با صفر).
+    """
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+
+    qs = SiteDailyStat.objects.filter(date__gte=start, date__lte=today)
+    if path:
+        qs = qs.filter(path=path)
+
+    per_day = {}
+    for day, views in qs.values_list("date", "views"):
+        per_day[day] = per_day.get(day, 0) + views
+
+    return [(start + timedelta(days=i), per_day.get(start + timedelta(days=i), 0)) for i in range(days)]
@@ -1,8 +1,13 @@
 from django import forms
+
+from accounts.utils.normalize import NormalizedFieldsMixin
 from .models import Contract
 
 
-class ContractForm(forms.ModelForm):
+class ContractForm(NormalizedFieldsMixin, forms.ModelForm):
+    NORMALIZE_TEXT_FIELDS = ("full_name", "startup_name", "departments")
+    NORMALIZE_PHONE_FIELDS = ("phone",)
+
     class Meta:
         model = Contract
         fields = [
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from home.counters import site_views
+
+
+class Command(BaseCommand):
+    help = "انتقال بافر بازدیدها از cache به SiteStat و SiteDailyStat"
+
+    def handle(self, *args, **options):
+        flushed = site_views.flush()
+        self.stdout.write(f"flushed={flushed}")
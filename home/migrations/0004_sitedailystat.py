@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_alter_contract_departments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='تاریخ')),
+                ('path', models.CharField(max_length=200, verbose_name='مسیر')),
+                ('views', models.PositiveBigIntegerField(default=0, verbose_name='تعداد بازدید')),
+            ],
+            options={
+                'verbose_name': 'آمار روزانه بازدید',
+                'verbose_name_plural': 'آمار روزانه بازدید',
+                'ordering': ['-date', 'path'],
+                'indexes': [models.Index(fields=['date'], name='home_siteda_date_aa2e08_idx')],
+                'unique_together': {('date', 'path')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:42
+
+import accounts.utils.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_sitedailystat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='search_document',
+            field=accounts.utils.search.SearchDocumentField(blank=True, default='', editable=False),
+        ),
+        accounts.utils.search.backfill_search_documents(
+            'home', 'contract',
+            texts=("full_name", "startup_name", "departments"),
+            phones=("phone",),
+        ),
+        accounts.utils.search.fulltext_index('home_contract', 'home_contract_search_ft'),
+    ]
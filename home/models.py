@@ -1,9 +1,17 @@
 from django.db import models
 from django.core.validators import RegexValidator
+from django.db.models import F
+from django.utils import timezone
 from .status import *
+from accounts.utils.search import SearchDocumentField, SearchDocumentMixin
+from accounts.utils.tracking import TrackedFieldsMixin
 
 
-class Contract(models.Model):
+class Contract(SearchDocumentMixin, TrackedFieldsMixin, models.Model):
+    TRACKED_FIELDS = ("status",)
+    SEARCH_FIELDS = ("full_name", "startup_name", "departments")
+    SEARCH_PHONE_FIELDS = ("phone",)
+
     full_name = models.CharField(
         'نام و نام خانوادگی',
         max_length=150
@@ -62,6 +70,9 @@ class Contract(models.Model):
         auto_now=True
     )
 
+    # جستجوی پنل ادمین (accounts/utils/search.py)
+    search_document = SearchDocumentField()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'درخواست شتاب‌دهی / قرارداد'
@@ -100,7 +111,30 @@ class SiteStat(models.Model):
 
     @classmethod
     def increase_views(cls, step=1):
-        obj = cls.get_solo()
-        obj.total_views = (obj.total_views or 0) + step
-        obj.save(update_fields=["total_views", "updated_at"])
-        return obj.total_views
+        # UPDATE ... SET total_views = total_views + step (اتمیک بین چند worker)
+        qs = cls.objects.filter(pk=1)
+        if not qs.update(total_views=F("total_views") + step, updated_at=timezone.now()):
+            cls.get_solo()
+            qs.update(total_views=F("total_views") + step, updated_at=timezone.now())
+
+
+class SiteDailyStat(models.Model):
+    """
+    بازدید هر مسیر در هر روز (برای نمودار روند داشبورد).
+    ردیف‌ها با home.counters.ViewCounter پر می‌شوند.
+    """
+    date = models.DateField("تاریخ")
+    path = models.CharField("مسیر", max_length=200)
+    views = models.PositiveBigIntegerField("تعداد بازدید", default=0)
+
+    class Meta:
+        verbose_name = "آمار روزانه بازدید"
+        verbose_name_plural = "آمار روزانه بازدید"
+        ordering = ["-date", "path"]
+        unique_together = ("date", "path")
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.path}: {self.views}"
@@ -1,21 +1,16 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from admin_panel.models import ActivityLog
+from admin_panel.activity import log_activity
 from home.models import Contract
 from accounts.utils.threadlocal import get_current_user
 
 
 @receiver(pre_save, sender=Contract)
-def contract_before_save(sender, instance, **kwargs):
-    """ذخیره وضعیت قبلی قبل از ذخیره جدید"""
-    if instance.pk:
-        try:
-            old_obj = Contract.objects.get(pk=instance.pk)
-            instance._old_status = old_obj.status
-        except Contract.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
+def contract_before_save(sender, instance, update_fields=None, **kwargs):
+    """ذخیره وضعیت قبلی قبل از ذخیره جدید (از snapshot خود instance)"""
+    old = instance.get_old_tracked_values(update_fields)
+    instance._old_status = old.get("status") if old else None
 
 
 @receiver(post_save, sender=Contract)
@@ -25,7 +20,7 @@ def contract_after_save(sender, instance, created, **kwargs):
 
     # حالت ایجاد
     if created:
-        ActivityLog.objects.create(
+        log_activity(
             title=f"ثبت درخواست جدید از طرف {instance.full_name}",
             meta=f"استارتاپ: {instance.startup_name} · وضعیت: {status_display}",
             category=ActivityLog.CATEGORY_CONTRACTS,
@@ -57,7 +52,7 @@ def contract_after_save(sender, instance, created, **kwargs):
         level = ActivityLog.LEVEL_INFO
         title = f"تغییر وضعیت درخواست {instance.startup_name}"
 
-    ActivityLog.objects.create(
+    log_activity(
         title=title,
         meta=f"وضعیت از «{old_status_display}» به «{status_display}» تغییر کرد.",
         category=ActivityLog.CATEGORY_CONTRACTS,
@@ -70,7 +65,7 @@ def contract_after_save(sender, instance, created, **kwargs):
 def contract_after_delete(sender, instance, **kwargs):
     user = get_current_user()  # 🔥 دریافت ادمین حذف‌کننده
 
-    ActivityLog.objects.create(
+    log_activity(
         title=f"حذف درخواست مربوط به {instance.full_name}",
         meta=f"استارتاپ: {instance.startup_name}",
         category=ActivityLog.CATEGORY_CONTRACTS,
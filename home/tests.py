@@ -1,3 +1,128 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.checks import run_checks
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from Config.checks import check_cache_tables, check_shared_cache_atomic
+from home.counters import ViewCounter
+from home.models import SiteDailyStat, SiteStat
+
+DB_CACHES = {
+    "default": {
+        "BACKEND": "Config.cache.TieredCache",
+        "OPTIONS": {"SHARED": "shared"},
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "anam_cache_check",
+    },
+}
+
+
+@override_settings(CACHES=DB_CACHES)
+class SharedCacheCheckTests(TestCase):
+    """Config.checks: جدول DatabaseCache و هشدار نبود Redis"""
+
+    def _ids(self, errors):
+        return [e.id for e in errors]
+
+    def test_missing_table_is_an_error(self):
+        errors = check_cache_tables(databases=["default"])
+        self.assertEqual(self._ids(errors), ["Config.E001"])
+        self.assertIn("createcachetable", errors[0].hint)
+
+    def test_existing_table_passes(self):
+        tables = connection.introspection.table_names() + ["anam_cache_check"]
+        with mock.patch.object(connection.introspection, "table_names", return_value=tables):
+            self.assertEqual(check_cache_tables(databases=["default"]), [])
+
+    def test_skipped_without_databases(self):
+        # runserver و check بدون --database به دیتابیس دست نمی‌زنند
+        self.assertEqual(check_cache_tables(), [])
+
+    def test_deploy_warns_without_redis(self):
+        self.assertEqual(self._ids(check_shared_cache_atomic()), ["Config.W001"])
+        self.assertIn("Config.W001", self._ids(run_checks(include_deployment_checks=True)))
+        self.assertNotIn("Config.W001", self._ids(run_checks()))
+
+    @override_settings(CACHES={
+        **DB_CACHES,
+        "shared": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://127.0.0.1:6379"},
+    })
+    def test_redis_passes(self):
+        self.assertEqual(check_shared_cache_atomic(), [])
+        self.assertEqual(check_cache_tables(databases=["default"]), [])
+
+
+class LocalViewCounterTests(TestCase):
+    """ViewCounter روی cache بدون incr اتمیک (DatabaseCache): بافر داخل پروسه"""
+
+    def setUp(self):
+        self.counter = ViewCounter("test_views", flush_threshold=10, max_age=60)
+        # بدون atexit: بافر باقی‌مانده بعد از حذف دیتابیس تست flush نشود
+        self.counter._atexit_registered = True
+        self.today = timezone.localdate()
+
+    def _views(self, path):
+        return SiteDailyStat.objects.get(date=self.today, path=path).views
+
+    def _total(self):
+        return SiteStat.objects.get(pk=1).total_views
+
+    def test_hits_are_buffered_without_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(9):
+                self.counter.hit("/")
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertFalse(SiteDailyStat.objects.exists())
+
+    def test_threshold_flushes_once_per_bucket(self):
+        SiteStat.get_solo()
+        SiteDailyStat.objects.create(date=self.today, path="/")
+        SiteDailyStat.objects.create(date=self.today, path="/about/")
+        for _ in range(6):
+            self.counter.hit("/")
+        for _ in range(3):
+            self.counter.hit("/about/?utm=x")
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.counter.hit("/")
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].lstrip().upper().startswith("UPDATE")]
+
+        # ۱۰ بازدید => یک UPDATE برای هر باکت و یکی برای SiteStat
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(self._views("/"), 7)
+        self.assertEqual(self._views("/about/"), 3)
+        self.assertEqual(self._total(), 10)
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_missing_row_is_created(self):
+        for _ in range(10):
+            self.counter.hit("/new/")
+        self.assertEqual(self._views("/new/"), 10)
+
+    def test_stale_buffer_is_flushed(self):
+        self.counter.hit("/")
+        self.counter._local_since = time.time() - 61
+        self.counter.hit("/")
+        self.assertEqual(self._views("/"), 2)
+
+    def test_manual_flush(self):
+        for _ in range(3):
+            self.counter.hit("/")
+        self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual(self._total(), 3)
+
+    def test_failed_flush_is_restored(self):
+        for _ in range(3):
+            self.counter.hit("/")
+        with mock.patch.object(SiteStat, "increase_views", side_effect=RuntimeError), \
+                self.assertLogs("home.counters", "ERROR"), self.assertRaises(RuntimeError):
+            self.counter.flush()
+
+        self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual(self._views("/"), 3)
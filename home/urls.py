@@ -1,9 +1,11 @@
 from django.urls import path
+
+from Config.ratelimit import ratelimit
 from . import views
 
 app_name = 'home'
 
 urlpatterns = [
     path('' , views.HomeView.as_view() , name='home' ),
-    path('contract/create/', views.ContractCreateView.as_view(), name='contract_create'),
+    path('contract/create/', ratelimit("contract")(views.ContractCreateView.as_view()), name='contract_create'),
 ]
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.views.generic import *
 from django.http import JsonResponse
-from portfolio.models import PortfolioProject
+from portfolio.cache import home_featured_projects
 from .forms import ContractForm
 from .models import *
 from .utils import increase_views_cached
@@ -11,20 +11,15 @@ class HomeView(TemplateView):
     template_name = 'home/index.html'
 
     def dispatch(self, request, *args, **kwargs):
-        increase_views_cached()
+        increase_views_cached(request.path)
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['contract_form'] = ContractForm()
 
-        # 🔹 پروژه‌های ویژه برای صفحه اصلی (مثلا 3 تا اول)
-        context['featured_projects'] = (
-            PortfolioProject.active
-            .filter(is_featured_home=True)
-            .select_related('category')
-            .order_by('home_order', '-created_at')[:3]
-        )
+        # 🔹 پروژه‌های ویژه برای صفحه اصلی (مثلا 3 تا اول)؛ از cache نسخه‌دار portfolio
+        context['featured_projects'] = home_featured_projects(3)
         return context
 
 
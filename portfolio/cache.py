@@ -0,0 +1,98 @@
+# portfolio/cache.py
+"""
+cache نسخه‌دار داده‌های صفحه‌ی اصلی و پورتفوی.
+
+همه‌ی کلیدها شماره‌ی نسخه دارند (portfolio:<version>:<name>) و هر تغییری در
+پروژه‌ها/دسته‌ها/نقش‌ها/هایلایت‌ها/متریک‌ها/مراحل (portfolio/signals.py) فقط
+نسخه را یک واحد بالا می‌برد؛ کلیدهای قدیمی دیگر خوانده نمی‌شوند و خودشان منقضی می‌شوند.
+
+خود HTML کش نمی‌شود (صفحه‌ی اصلی فرم با csrf_token دارد)؛ فقط نتیجه‌ی کوئری‌ها
+(instanceها همراه select_related/prefetch) کش می‌شود، پس بازدید ناشناس بعد از
+اولین درخواست هیچ کوئری‌ای نمی‌زند.
+
+لایه‌ی جلوی TieredCache تا FRONT_TIMEOUT ثانیه نسخه‌ی قبلی را در workerهای دیگر
+نگه می‌دارد؛ یعنی تغییرات ادمین حداکثر چند ثانیه بعد دیده می‌شوند.
+"""
+import time
+
+from django.core.cache import cache
+
+from .models import PortfolioProject, ProjectCategory, ProjectStatus
+
+VERSION_KEY = "portfolio:version"
+TIMEOUT = 60 * 60 * 24
+
+PROJECT_PREFETCH = (
+    "highlights",
+    "metrics",
+    "journey_steps",
+    "role_assignments__role",
+)
+
+_MISSING = object()
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # اگر کلید نسخه evict شده باشد، با زمان شروع می‌شود تا به کلیدهای قدیمی نرسد
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def cached(name, builder, timeout=TIMEOUT):
+    key = f"portfolio:{current_version()}:{name}"
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = builder()
+        if value is not None:
+            cache.set(key, value, timeout)
+    return value
+
+
+# ---------- data ----------
+
+def home_featured_projects(limit=3):
+    return cached(f"home_featured:{limit}", lambda: list(
+        PortfolioProject.active
+        .filter(is_featured_home=True)
+        .select_related("category")
+        .order_by("home_order", "-created_at")[:limit]
+    ))
+
+
+def active_projects():
+    return cached("active_projects", lambda: list(
+        PortfolioProject.active
+        .select_related("category")
+        .prefetch_related(*PROJECT_PREFETCH)
+    ))
+
+
+def active_categories():
+    # دسته‌بندی‌هایی که حداقل یک پروژه فعال دارند
+    return cached("active_categories", lambda: list(
+        ProjectCategory.objects
+        .filter(projects__status=ProjectStatus.ACTIVE)
+        .distinct()
+        .order_by("name")
+    ))
+
+
+def project_by_slug(slug):
+    """پروژه با prefetchها یا None (slug ناموجود کش نمی‌شود)"""
+    return cached(f"project:{slug}", lambda: (
+        PortfolioProject.objects
+        .select_related("category")
+        .prefetch_related(*PROJECT_PREFETCH)
+        .filter(slug=slug)
+        .first()
+    ))
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+
+from .cache import bump_version
+from .models import (
+    PortfolioProject,
+    ProjectCategory,
+    ProjectHighlight,
+    ProjectJourneyStep,
+    ProjectMetric,
+    ProjectRole,
+    ProjectRoleAssignment,
+)
+
+# هر چیزی که در صفحه‌ی اصلی یا صفحه‌های پورتفوی نمایش داده می‌شود
+CACHED_MODELS = (
+    PortfolioProject,
+    ProjectCategory,
+    ProjectHighlight,
+    ProjectMetric,
+    ProjectJourneyStep,
+    ProjectRole,
+    ProjectRoleAssignment,
+)
+
+
+def portfolio_changed(sender, **kwargs):
+    bump_version()
+
+
+for model in CACHED_MODELS:
+    post_save.connect(portfolio_changed, sender=model, dispatch_uid=f"portfolio_cache_save_{model.__name__}")
+    post_delete.connect(portfolio_changed, sender=model, dispatch_uid=f"portfolio_cache_delete_{model.__name__}")
@@ -1,7 +1,9 @@
+from django.http import Http404
 from django.shortcuts import render
 from django.views.generic import *
 
-from portfolio.models import PortfolioProject, ProjectCategory, ProjectStatus
+from portfolio.models import PortfolioProject
+from . import cache as portfolio_cache
 
 
 # Create your views here.
@@ -15,35 +17,17 @@ class PortfolioListView(ListView):
     /portfolio/
     """
     model = PortfolioProject
-    template_name = "portfolio/portfolio-list.html"
+    template_name = "portfolio/portfolio_list.html"
     context_object_name = "projects"
 
     def get_queryset(self):
-        # فقط پروژه‌های فعال + بهینه‌سازی کوئری‌ها
-        return (
-            PortfolioProject.active
-            .select_related("category")
-            .prefetch_related(
-                "highlights",
-                "metrics",
-                "journey_steps",
-                "role_assignments__role",
-            )
-        )
+        # فقط پروژه‌های فعال (با prefetchها) از cache نسخه‌دار portfolio/cache.py
+        return portfolio_cache.active_projects()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-
-        # دسته‌بندی‌هایی که حداقل یک پروژه فعال دارند
-        categories = (
-            ProjectCategory.objects
-            .filter(projects__status=ProjectStatus.ACTIVE)
-            .distinct()
-            .order_by("name")
-        )
-
-        context["categories"] = categories
-        context["active_count"] = PortfolioProject.active.count()
+        context["categories"] = portfolio_cache.active_categories()
+        context["active_count"] = len(context["projects"])
         return context
 
 
@@ -58,18 +42,12 @@ class PortfolioDetailView(DetailView):
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
-    def get_queryset(self):
-        # برای جزئیات هم همون prefetch ها
-        return (
-            PortfolioProject.objects
-            .select_related("category")
-            .prefetch_related(
-                "highlights",
-                "metrics",
-                "journey_steps",
-                "role_assignments__role",
-            )
-        )
+    def get_object(self, queryset=None):
+        # برای جزئیات هم همون prefetch ها، از cache نسخه‌دار
+        project = portfolio_cache.project_by_slug(self.kwargs.get(self.slug_url_kwarg))
+        if project is None:
+            raise Http404("پروژه پیدا نشد.")
+        return project
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -112,12 +112,10 @@ document.addEventListener("DOMContentLoaded", function () {
 
     const qEl = filtersForm.querySelector('input[name="q"]');
     const statusEl = filtersForm.querySelector('select[name="status"]');
-    const pageEl = filtersForm.querySelector('input[name="page"]');
 
     let t = null;
 
     const submitFilters = () => {
-        if (pageEl) pageEl.value = "1";
         filtersForm.submit();
     };
 
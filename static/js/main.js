@@ -181,6 +181,9 @@ document.addEventListener("DOMContentLoaded", () => {
                         msgs.push(Array.isArray(errors) ? errors.join("، ") : String(errors));
                     }
                     showMessage(msgs.join(" | "));
+                } else if (data && data.message) {
+                    // مثل 429 محدودیت تعداد درخواست (Config/ratelimit.py)
+                    showMessage(data.message);
                 } else {
                     showMessage("خطایی رخ داد. لطفاً بعداً دوباره تلاش کنید.");
                 }
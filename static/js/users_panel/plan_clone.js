@@ -0,0 +1,120 @@
+// پنل «کپی برنامه روی چند روز» در صفحه‌ی ثبت برنامه
+// api/plans/clone/ و api/plan-templates/ (worklog/views.py)
+document.addEventListener("DOMContentLoaded", () => {
+    const panel = document.getElementById("clonePanel");
+    if (!panel) return;
+
+    const sourceEl = document.getElementById("cloneSource");
+    const templatesGroup = document.getElementById("cloneTemplates");
+    const startEl = document.getElementById("cloneStart");
+    const endEl = document.getElementById("cloneEnd");
+    const skipFridaysEl = document.getElementById("cloneSkipFridays");
+    const titleEl = document.getElementById("templateTitle");
+    const cloneBtn = document.getElementById("cloneBtn");
+    const saveTemplateBtn = document.getElementById("saveTemplateBtn");
+    const resultBox = document.getElementById("cloneResult");
+    const csrfToken = document.querySelector("[name=csrfmiddlewaretoken]")?.value || "";
+
+    function showResult(lines, isError) {
+        resultBox.innerHTML = "";
+        resultBox.className = "small mt-1 " + (isError ? "text-danger" : "text-success");
+        (lines || []).forEach(text => {
+            const div = document.createElement("div");
+            div.textContent = text;
+            resultBox.appendChild(div);
+        });
+    }
+
+    function selectedSource() {
+        const [kind, id] = (sourceEl.value || "").split(":");
+        return {kind, id: Number(id)};
+    }
+
+    function toggleSaveTemplate() {
+        // فقط برنامه‌ی یک روز را می‌شود قالب کرد
+        saveTemplateBtn.disabled = selectedSource().kind !== "plan";
+    }
+
+    async function postJson(url, payload) {
+        const res = await fetch(url, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "X-CSRFToken": csrfToken,
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            body: JSON.stringify(payload),
+        });
+        return res.json();
+    }
+
+    sourceEl.addEventListener("change", toggleSaveTemplate);
+    toggleSaveTemplate();
+
+    saveTemplateBtn.addEventListener("click", async () => {
+        const source = selectedSource();
+        const title = titleEl.value.trim();
+        if (source.kind !== "plan") return;
+        if (!title) {
+            showResult(["عنوان قالب را وارد کنید."], true);
+            return;
+        }
+
+        saveTemplateBtn.disabled = true;
+        try {
+            const data = await postJson(panel.dataset.templatesUrl, {plan_id: source.id, title});
+            if (!data.ok) {
+                showResult(data.errors, true);
+                return;
+            }
+            const option = document.createElement("option");
+            option.value = "template:" + data.template.id;
+            option.textContent = data.template.title;
+            templatesGroup.prepend(option);
+            sourceEl.value = option.value;
+            titleEl.value = "";
+            showResult(["قالب «" + data.template.title + "» ذخیره شد."], false);
+        } catch (e) {
+            showResult(["خطایی در ارتباط با سرور رخ داد."], true);
+        } finally {
+            toggleSaveTemplate();
+        }
+    });
+
+    cloneBtn.addEventListener("click", async () => {
+        const source = selectedSource();
+        if (!source.id) {
+            showResult(["برنامه یا قالب مبدأ را انتخاب کنید."], true);
+            return;
+        }
+
+        const payload = {
+            member_id: Number(panel.dataset.memberId),
+            start_date: startEl.value.trim(),
+            end_date: endEl.value.trim(),
+            skip_fridays: skipFridaysEl.checked,
+        };
+        payload[source.kind === "template" ? "template_id" : "source_plan_id"] = source.id;
+
+        cloneBtn.disabled = true;
+        try {
+            const data = await postJson(panel.dataset.cloneUrl, payload);
+            if (!data.ok) {
+                showResult(data.errors, true);
+                return;
+            }
+            const lines = ["برای " + data.created.length + " روز برنامه ثبت شد."];
+            if (data.skipped.length) {
+                lines.push("این روزها از قبل برنامه داشتند: " + data.skipped.join("، "));
+            }
+            showResult(lines, false);
+            if (data.created.length && data.redirect_url) {
+                setTimeout(() => { window.location.href = data.redirect_url; }, 1500);
+            }
+        } catch (e) {
+            showResult(["خطایی در ارتباط با سرور رخ داد."], true);
+        } finally {
+            cloneBtn.disabled = false;
+        }
+    });
+});
@@ -217,8 +217,60 @@ document.addEventListener('DOMContentLoaded', () => {
         });
         extrasJson.value = JSON.stringify(extras);
 
-        form.submit();
+        submitPlan({
+            member_id: Number(form.dataset.memberId),
+            jalali_date: document.getElementById("jalali_date").value.trim(),
+            achievements: ach,
+            blocks: blocks,
+            extras: extras,
+        });
     });
 
+    // --- ارسال JSON به API؛ اگر API در دسترس نبود همان فرم معمولی ---
+    const errorsBox = document.getElementById("wizardErrors");
+
+    function showErrors(errors) {
+        if (!errorsBox) return;
+        errorsBox.innerHTML = "";
+        (errors || []).forEach(msg => {
+            const div = document.createElement("div");
+            div.textContent = msg;
+            errorsBox.appendChild(div);
+        });
+        currentStep = 1;
+        updateWizard();
+    }
+
+    async function submitPlan(payload) {
+        if (!form.dataset.apiUrl) {
+            form.submit();
+            return;
+        }
+
+        submitBtn.disabled = true;
+        try {
+            const res = await fetch(form.dataset.apiUrl, {
+                method: "POST",
+                headers: {
+                    "Content-Type": "application/json",
+                    "X-CSRFToken": form.querySelector("[name=csrfmiddlewaretoken]").value,
+                    "X-Requested-With": "XMLHttpRequest",
+                },
+                body: JSON.stringify(payload),
+            });
+            const data = await res.json();
+
+            if (data.ok) {
+                window.location.href = data.redirect_url;
+                return;
+            }
+            showErrors(data.errors);
+        } catch (e) {
+            form.submit();
+        } finally {
+            submitBtn.disabled = false;
+        }
+    }
+
     updateWizard();
 });
@@ -47,6 +47,7 @@ function buildExtrasJson() {
         if (!title) return;
 
         arr.push({
+            id: it.dataset.extraId || null,
             start: start || null,
             end: end || null,
             title,
@@ -11,14 +11,15 @@ document.addEventListener("DOMContentLoaded", () => {
     // Filters + Search (Jalali)
     // ------------------------
     const filterBtns = document.querySelectorAll(".filter-btn");
-    const items = document.querySelectorAll(".report-item");
+    const grid = document.getElementById("reportsGrid");
     const search = document.getElementById("reportDateSearch");
 
     let activeFilter = "all";
     let activeDate = ""; // "YYYY-MM-DD" شمسی
 
     function applyFilters() {
-        items.forEach((item) => {
+        // کارت‌های «بارگذاری ماه قبل» هم بعداً اضافه می‌شوند، پس هر بار دوباره پیدا می‌کنیم
+        document.querySelectorAll(".report-item").forEach((item) => {
             const st = item.dataset.status || "";
             const jd = item.dataset.jalali || ""; // YYYY-MM-DD
 
@@ -47,6 +48,37 @@ document.addEventListener("DOMContentLoaded", () => {
 
     applyFilters();
 
+    // ------------------------
+    // Load more (ماه قبل)
+    // ------------------------
+    const loadMore = document.getElementById("loadMoreReports");
+
+    if (loadMore && grid) {
+        loadMore.addEventListener("click", async () => {
+            const before = loadMore.dataset.before;
+            if (!before) return;
+
+            loadMore.disabled = true;
+            try {
+                const url = `${loadMore.dataset.url}?before=${encodeURIComponent(before)}`;
+                const res = await fetch(url, {headers: {"X-Requested-With": "XMLHttpRequest"}});
+                const data = await res.json();
+                if (!data.ok) return;
+
+                grid.insertAdjacentHTML("beforeend", data.html);
+                applyFilters();
+
+                if (data.next_before) {
+                    loadMore.dataset.before = data.next_before;
+                } else {
+                    loadMore.closest("div").remove();
+                }
+            } finally {
+                loadMore.disabled = false;
+            }
+        });
+    }
+
     // ------------------------
     // Today Timer + Progress
     // ------------------------
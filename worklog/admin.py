@@ -11,6 +11,8 @@ from .models import (
     DailyReport,
     ReportEntry,
     ReportExtraAction,
+    PlanTemplate,
+    DailyComplianceSnapshot,
 )
 
 
@@ -204,3 +206,32 @@ class ReportExtraActionAdmin(admin.ModelAdmin):
     autocomplete_fields = ("report",)
     ordering = ("-created_at",)
     date_hierarchy = "created_at"
+
+
+@admin.register(PlanTemplate)
+class PlanTemplateAdmin(admin.ModelAdmin):
+    list_display = ("title", "owner", "created_at", "updated_at")
+    search_fields = ("title", "owner__username", "owner__full_name")
+    autocomplete_fields = ("owner",)
+    ordering = ("-updated_at",)
+
+
+@admin.register(DailyComplianceSnapshot)
+class DailyComplianceSnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "date",
+        "has_plan",
+        "has_report",
+        "has_active_plan",
+        "has_active_report",
+        "updated_at",
+    )
+    list_filter = ("date", "has_plan", "has_report")
+    search_fields = ("user__username", "user__full_name")
+    readonly_fields = list_display
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        # فقط سیگنال‌ها و rebuild_compliance این جدول را پر می‌کنند
+        return False
@@ -0,0 +1,139 @@
+# worklog/compliance.py
+"""
+نگهداری جدول DailyComplianceSnapshot.
+
+- refresh_compliance(user_id, dates): بعد از هر تغییر پلن/گزارش/عضویت (signals.py)
+- rebuild_compliance(start, end): بازسازی کامل یک بازه (manage.py rebuild_compliance
+  و migration 0006 که جدول را بعد از ساخته شدن پر می‌کند)
+
+هر دو از _collect_flags استفاده می‌کنند تا منطق یکی باشد.
+سرویس‌هایی که bulk_create می‌کنند (سیگنال اجرا نمی‌شود) باید خودشان refresh_compliance را صدا بزنند.
+"""
+from collections import defaultdict
+
+from django.db import connections, transaction
+
+from .models import DailyComplianceSnapshot, DailyPlan, DailyReport, ProjectMember
+
+FLAG_FIELDS = ("has_plan", "has_report", "has_active_plan", "has_active_report")
+
+
+def _models(apps=None):
+    """(snapshot, plan, report)؛ داخل migration مدل‌های تاریخی از apps"""
+    if apps is None:
+        return DailyComplianceSnapshot, DailyPlan, DailyReport
+    return tuple(
+        apps.get_model("worklog", name)
+        for name in ("DailyComplianceSnapshot", "DailyPlan", "DailyReport")
+    )
+
+
+def _collect_flags(plan_filter, report_filter, apps=None):
+    """
+    {(user_id, date): {flag: bool}} فقط برای (کاربر، روز)هایی که حداقل یک پلن یا گزارش دارند.
+    """
+    _, plan_model, report_model = _models(apps)
+    flags = defaultdict(lambda: dict.fromkeys(FLAG_FIELDS, False))
+
+    plans = (
+        plan_model.objects
+        .filter(**plan_filter)
+        .values_list("project_member__user_id", "date", "project_member__is_active")
+    )
+    for user_id, day, member_active in plans.iterator():
+        row = flags[(user_id, day)]
+        row["has_plan"] = True
+        if member_active:
+            row["has_active_plan"] = True
+
+    reports = (
+        report_model.objects
+        .filter(**report_filter)
+        .values_list("project_member__user_id", "date", "project_member__is_active")
+    )
+    for user_id, day, member_active in reports.iterator():
+        row = flags[(user_id, day)]
+        row["has_report"] = True
+        if member_active:
+            row["has_active_report"] = True
+
+    return flags
+
+
+def _upsert_options(connection):
+    """
+    kwargs برای bulk_create(update_conflicts=True).
+    MySQL هدف conflict نمی‌گیرد (supports_update_conflicts_with_target=False) و
+    unique_fields را رد می‌کند؛ آنجا ON DUPLICATE KEY UPDATE خودش روی unique (user, date) است.
+    """
+    options = {"update_conflicts": True, "update_fields": [*FLAG_FIELDS, "updated_at"]}
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["user", "date"]
+    return options
+
+
+def _write(flags, existing_qs, batch_size=500):
+    """
+    ردیف‌های flags را upsert می‌کند و ردیف‌هایی از existing_qs که دیگر پلن/گزارشی ندارند پاک می‌شوند.
+    خروجی: (تعداد upsert، تعداد حذف)
+    """
+    snapshot_model = existing_qs.model
+    stale_ids = [
+        pk
+        for pk, user_id, day in existing_qs.values_list("id", "user_id", "date").iterator()
+        if (user_id, day) not in flags
+    ]
+    rows = [
+        snapshot_model(user_id=user_id, date=day, **values)
+        for (user_id, day), values in flags.items()
+    ]
+
+    with transaction.atomic():
+        for i in range(0, len(stale_ids), batch_size):
+            snapshot_model.objects.filter(id__in=stale_ids[i:i + batch_size]).delete()
+
+        if rows:
+            snapshot_model.objects.bulk_create(
+                rows,
+                batch_size=batch_size,
+                **_upsert_options(connections[existing_qs.db]),
+            )
+
+    return len(rows), len(stale_ids)
+
+
+def refresh_compliance(user_id, dates):
+    """snapshot یک کاربر را برای چند روز از روی پلن‌ها و گزارش‌ها دوباره می‌سازد."""
+    dates = {d for d in dates if d}
+    if not user_id or not dates:
+        return
+
+    flags = _collect_flags(
+        {"project_member__user_id": user_id, "date__in": dates},
+        {"project_member__user_id": user_id, "date__in": dates},
+    )
+    _write(flags, DailyComplianceSnapshot.objects.filter(user_id=user_id, date__in=dates))
+
+
+def refresh_member_compliance(member_id):
+    """بعد از فعال/غیرفعال شدن عضویت: همه‌ی روزهایی که این عضو پلن یا گزارش دارد."""
+    user_id = ProjectMember.objects.filter(pk=member_id).values_list("user_id", flat=True).first()
+    if not user_id:
+        return
+
+    dates = set(DailyPlan.objects.filter(project_member_id=member_id).values_list("date", flat=True))
+    dates |= set(DailyReport.objects.filter(project_member_id=member_id).values_list("date", flat=True))
+    refresh_compliance(user_id, dates)
+
+
+def rebuild_compliance(start=None, end=None, batch_size=500, apps=None):
+    """بازسازی کامل جدول (یا فقط بازه‌ی [start, end])."""
+    snapshot_model = _models(apps)[0]
+    date_filter = {}
+    if start:
+        date_filter["date__gte"] = start
+    if end:
+        date_filter["date__lte"] = end
+
+    flags = _collect_flags(date_filter, date_filter, apps=apps)
+    return _write(flags, snapshot_model.objects.filter(**date_filter), batch_size=batch_size)
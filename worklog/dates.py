@@ -1,21 +1,174 @@
 # worklog/dates.py
+"""
+تبدیل تاریخ میلادی <-> شمسی و همه‌ی قالب‌های نمایشی، برای worklog و admin_panel.
+
+تبدیل‌ها با lru_cache نگه داشته می‌شوند: در یک صفحه یا خروجی، تعداد تاریخ‌های
+متمایز خیلی کمتر از تعداد ردیف‌هاست و jdatetime برای هر ردیف دوباره حساب نمی‌شود.
+در بازه‌ی 1300 تا 1500 خود تبدیل هم از جدول jcalendar است (بدون jdatetime).
+مقایسه: python manage.py benchmark_jalali
+"""
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 import jdatetime
-from datetime import date
+
+from accounts.utils.normalize import fold_digits
+
+from . import jcalendar
+
+PERSIAN_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+
+PERSIAN_MONTHS = {
+    1: "فروردین", 2: "اردیبهشت", 3: "خرداد", 4: "تیر",
+    5: "مرداد", 6: "شهریور", 7: "مهر", 8: "آبان",
+    9: "آذر", 10: "دی", 11: "بهمن", 12: "اسفند",
+}
+# weekday در jdatetime: شنبه=0 ... جمعه=6
+PERSIAN_WEEKDAYS = {
+    0: "شنبه",
+    1: "یکشنبه",
+    2: "دوشنبه",
+    3: "سه‌شنبه",
+    4: "چهارشنبه",
+    5: "پنجشنبه",
+    6: "جمعه",
+}
+FRIDAY = 6
+
+
+class JalaliDate(NamedTuple):
+    year: int
+    month: int
+    day: int
+    weekday: int
+
+    @property
+    def month_name(self):
+        return PERSIAN_MONTHS.get(self.month, "")
+
+    @property
+    def weekday_name(self):
+        return PERSIAN_WEEKDAYS.get(self.weekday, "")
+
+
+# ---------- digits ----------
+
+def to_persian_digits(value) -> str:
+    if value is None:
+        return ""
+    return str(value).translate(PERSIAN_DIGITS)
 
 
+def fa_to_en_digits(value) -> str:
+    return fold_digits(value)
+
+
+# ---------- conversion (cached) ----------
+
+@lru_cache(maxsize=8192)
+def _to_jalali(g_date: date) -> JalaliDate:
+    if jcalendar.in_range(g_date):
+        return JalaliDate(*jcalendar.month_of(g_date), jcalendar.jalali_weekday(g_date))
+    j = jdatetime.date.fromgregorian(date=g_date)
+    return JalaliDate(j.year, j.month, j.day, j.weekday())
+
+
+@lru_cache(maxsize=8192)
+def _to_gregorian(year: int, month: int, day: int) -> date:
+    if jcalendar.FIRST_YEAR <= year <= jcalendar.LAST_YEAR and 1 <= month <= 12:
+        if not 1 <= day <= jcalendar.days_in_month(year, month):
+            raise ValueError("day is out of range for month")
+        return jcalendar.month_range(year, month)[0] + timedelta(days=day - 1)
+    return jdatetime.date(year, month, day).togregorian()
+
+
+def to_jalali(value) -> JalaliDate:
+    """date یا datetime میلادی -> JalaliDate(year, month, day, weekday)"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return _to_jalali(value)
+
+
+def to_gregorian(year: int, month: int, day: int) -> date:
+    """تاریخ شمسی -> date میلادی (ValueError برای تاریخ نامعتبر)"""
+    return _to_gregorian(int(year), int(month), int(day))
+
+
+# ---------- parse ----------
+
 def parse_jalali_date(value: str) -> date:
-    value = value.strip().replace("/", "-")
+    value = fa_to_en_digits(value).strip().replace("/", "-")
     try:
         y, m, d = map(int, value.split("-"))
-        return jdatetime.date(y, m, d).togregorian()
+        return to_gregorian(y, m, d)
     except Exception:
         raise ValueError("Invalid jalali date")
 
+
+def parse_jalali_to_gregorian(date_j: str) -> Optional[date]:
+    """
+    '۱۴۰۴/۰۹/۰۱' یا '1404-09-01' => date میلادی ؛ نامعتبر => None
+    """
+    if not date_j:
+        return None
+    try:
+        return parse_jalali_date(date_j)
+    except ValueError:
+        return None
+
+
+# ---------- format ----------
+
 def format_jalali_date(g_date: date) -> str:
     """
     datetime.date -> '1404-09-26'
     """
     if not g_date:
         return ""
-    j = jdatetime.date.fromgregorian(date=g_date)
+    j = to_jalali(g_date)
     return f"{j.year}-{j.month:02d}-{j.day:02d}"
+
+
+def format_jalali_slash(g_date: date) -> str:
+    """'1404/09/26'"""
+    if not g_date:
+        return ""
+    j = to_jalali(g_date)
+    return f"{j.year:04d}/{j.month:02d}/{j.day:02d}"
+
+
+def format_jalali_compact(g_date: date) -> str:
+    """'۱۴۰۴/۰۹/۰۱'"""
+    return to_persian_digits(format_jalali_slash(g_date))
+
+
+def format_jalali_human(g_date: date) -> str:
+    """'۱ آذر ۱۴۰۴'"""
+    if not g_date:
+        return ""
+    j = to_jalali(g_date)
+    return f"{to_persian_digits(j.day)} {j.month_name} {to_persian_digits(j.year)}"
+
+
+def format_jalali_pretty(g_date: date) -> str:
+    """'25 آذر 1402' (ارقام لاتین)"""
+    if not g_date:
+        return ""
+    j = to_jalali(g_date)
+    return f"{j.day} {j.month_name} {j.year}"
+
+
+def format_jalali_datetime(dt) -> str:
+    """'۲۴ آذر ۱۴۰۴ - ۲۲:۳۰'"""
+    if not dt:
+        return ""
+    return f"{format_jalali_human(dt)} - {to_persian_digits(f'{dt.hour:02d}:{dt.minute:02d}')}"
+
+
+def jalali_month_start(g_date: date) -> date:
+    """
+    اولین روز ماه شمسیِ g_date (میلادی)
+    """
+    j = to_jalali(g_date)
+    return jcalendar.month_range(j.year, j.month)[0]
@@ -0,0 +1,155 @@
+# worklog/exports.py
+"""
+خروجی CSV پلن‌ها و گزارش‌ها برای یک بازه‌ی تاریخ (پنل ادمین).
+
+- پلن‌ها با keyset روی (date, id) تکه‌تکه خوانده می‌شوند و برای هر تکه فقط
+  یک کوئری بلاک‌ها (+ وضعیت ReportEntry) و یک کوئری دستاوردها (+ ReportAchievement).
+- MySQL (mysqlclient) کل نتیجه‌ی یک کوئری را در حافظه‌ی کلاینت می‌گیرد و
+  iterator() به‌تنهایی حافظه را ثابت نگه نمی‌دارد؛ برای همین تکه‌ها با LIMIT جدا هستند.
+- حافظه به اندازه‌ی یک تکه است، نه طول بازه.
+- متن‌های کاربر (پروژه، نام، عنوان‌ها) با safe_cell می‌آیند تا Excel آن‌ها را فرمول نخواند.
+"""
+from collections import defaultdict
+
+from django.db.models import Q
+
+from .dates import format_jalali_date
+from .models import DailyAchievement, DailyPlan, DailyScheduleBlock, ReportStatus
+
+EXPORT_HEADER = [
+    "تاریخ",
+    "پروژه",
+    "کاربر",
+    "نام کاربری",
+    "شناسه پلن",
+    "نوع",
+    "شروع",
+    "پایان",
+    "عنوان",
+    "اجباری",
+    "شناسه گزارش",
+    "وضعیت",
+]
+
+KIND_PLAN = "پلن"
+KIND_BLOCK = "بلاک"
+KIND_ACHIEVEMENT = "دستاورد"
+
+_STATUS_LABELS = dict(ReportStatus.choices)
+
+# شروع سلولی که Excel/LibreOffice فرمول حساب می‌کند (CSV injection)
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def safe_cell(value):
+    """'=HYPERLINK(...)' -> "'=HYPERLINK(...)" ؛ بقیه بدون تغییر"""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_plan_chunks(start, end, project_id=None, chunk_size=500):
+    """تکه‌های [(id, date, project, username, full_name), ...] به ترتیب (date, id)."""
+    qs = DailyPlan.objects.filter(date__gte=start, date__lte=end)
+    if project_id:
+        qs = qs.filter(project_member__project_id=project_id)
+    qs = qs.order_by("date", "id").values_list(
+        "id",
+        "date",
+        "project_member__project__title",
+        "project_member__user__username",
+        "project_member__user__full_name",
+    )
+
+    after = None
+    while True:
+        page = qs
+        if after:
+            page = qs.filter(Q(date__gt=after[0]) | Q(date=after[0], id__gt=after[1]))
+        rows = list(page[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        after = (rows[-1][1], rows[-1][0])
+
+
+def _blocks_by_plan(plan_ids):
+    out = defaultdict(list)
+    rows = (
+        DailyScheduleBlock.objects
+        .filter(plan_id__in=plan_ids)
+        .order_by("plan_id", "start_time", "id")
+        .values_list(
+            "plan_id",
+            "start_time",
+            "end_time",
+            "task_title",
+            "is_required",
+            "report_entries__report_id",
+            "report_entries__status",
+        )
+    )
+    for plan_id, *rest in rows:
+        out[plan_id].append(rest)
+    return out
+
+
+def _achievements_by_plan(plan_ids):
+    out = defaultdict(list)
+    rows = (
+        DailyAchievement.objects
+        .filter(plan_id__in=plan_ids)
+        .order_by("plan_id", "sort_order", "id")
+        .values_list("plan_id", "title", "report_states__report_id", "report_states__achieved")
+    )
+    for plan_id, *rest in rows:
+        out[plan_id].append(rest)
+    return out
+
+
+def iter_export_rows(start, end, project_id=None, chunk_size=500):
+    """
+    ردیف‌های CSV (بدون header): برای هر پلن، اول بلاک‌ها بعد دستاوردها؛
+    پلن خالی یک ردیف «پلن» می‌گیرد تا در خروجی دیده شود.
+    """
+    for chunk in iter_plan_chunks(start, end, project_id, chunk_size):
+        plan_ids = [row[0] for row in chunk]
+        blocks = _blocks_by_plan(plan_ids)
+        achievements = _achievements_by_plan(plan_ids)
+
+        for plan_id, day, project, username, full_name in chunk:
+            head = [
+                format_jalali_date(day),
+                safe_cell(project),
+                safe_cell(full_name or username),
+                safe_cell(username),
+                plan_id,
+            ]
+
+            plan_blocks = blocks.get(plan_id, ())
+            plan_achievements = achievements.get(plan_id, ())
+            if not plan_blocks and not plan_achievements:
+                yield head + [KIND_PLAN, "", "", "", "", "", ""]
+                continue
+
+            for start_time, end_time, title, is_required, report_id, status in plan_blocks:
+                yield head + [
+                    KIND_BLOCK,
+                    f"{start_time:%H:%M}",
+                    f"{end_time:%H:%M}",
+                    safe_cell(title),
+                    "بله" if is_required else "خیر",
+                    report_id or "",
+                    _STATUS_LABELS.get(status, "") if report_id else "",
+                ]
+
+            for title, report_id, achieved in plan_achievements:
+                yield head + [
+                    KIND_ACHIEVEMENT,
+                    "",
+                    "",
+                    safe_cell(title),
+                    "",
+                    report_id or "",
+                    ("انجام شده" if achieved else "انجام نشده") if report_id else "",
+                ]
@@ -0,0 +1,122 @@
+# worklog/intervals.py
+"""
+تحلیل بازه‌های زمانی یک پلن (DailyScheduleBlock یا dictهای payload ویزارد).
+
+همه چیز بعد از یک sort در یک پیمایش حساب می‌شود: O(n log n)
+    - هم‌پوشانی‌ها (جفت بلاک‌هایی که روی هم افتاده‌اند)
+    - مجموع دقیقه‌های پوشش داده‌شده (اجتماع بازه‌ها، هم‌پوشانی دوبار شمرده نمی‌شود)
+    - دقیقه‌های تسک اصلی / اضافه
+    - فاصله‌های خالی بین اولین شروع و آخرین پایان
+"""
+from dataclasses import dataclass, field
+from datetime import time
+
+
+def to_minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def from_minutes(m: int) -> time:
+    return time(m // 60, m % 60)
+
+
+@dataclass(frozen=True)
+class Span:
+    start: int  # دقیقه از ابتدای روز
+    end: int
+    required: bool = False
+    label: str = ""
+
+    @property
+    def minutes(self):
+        return max(self.end - self.start, 0)
+
+
+@dataclass
+class ScheduleSummary:
+    spans: list = field(default_factory=list)
+    overlaps: list = field(default_factory=list)  # [(Span, Span)]
+    gaps: list = field(default_factory=list)  # [(start_min, end_min)]
+    covered_minutes: int = 0
+    required_minutes: int = 0
+    extra_minutes: int = 0
+    first_start: int = None
+    last_end: int = None
+
+    @property
+    def span_minutes(self):
+        if self.first_start is None:
+            return 0
+        return self.last_end - self.first_start
+
+    @property
+    def gap_minutes(self):
+        return sum(end - start for start, end in self.gaps)
+
+    @property
+    def utilisation_percent(self):
+        """سهم زمان پوشش داده‌شده از فاصله‌ی اولین شروع تا آخرین پایان"""
+        if not self.span_minutes:
+            return 0
+        return round(self.covered_minutes * 100 / self.span_minutes)
+
+    @property
+    def has_overlaps(self):
+        return bool(self.overlaps)
+
+
+def _get(obj, name, default=None):
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def span_from_block(block) -> Span:
+    """DailyScheduleBlock یا dict با کلیدهای start_time / end_time / is_required / task_title"""
+    return Span(
+        start=to_minutes(_get(block, "start_time")),
+        end=to_minutes(_get(block, "end_time")),
+        required=bool(_get(block, "is_required", False)),
+        label=_get(block, "task_title", "") or "",
+    )
+
+
+def analyze_spans(spans) -> ScheduleSummary:
+    spans = sorted(spans, key=lambda s: (s.start, s.end))
+    summary = ScheduleSummary(spans=spans)
+    if not spans:
+        return summary
+
+    summary.first_start = spans[0].start
+
+    # بلاکی که تا الان دیرتر از همه تمام می‌شود؛ هر بلاکی که قبل از پایان آن شروع شود هم‌پوشانی دارد
+    active = []  # بلاک‌های هنوز باز، برای گزارش همه‌ی جفت‌ها (k = تعداد هم‌پوشانی‌ها)
+    cur_start, cur_end = spans[0].start, spans[0].end
+
+    for i, span in enumerate(spans):
+        if span.required:
+            summary.required_minutes += span.minutes
+        else:
+            summary.extra_minutes += span.minutes
+
+        active = [a for a in active if a.end > span.start]
+        for other in active:
+            summary.overlaps.append((other, span))
+        active.append(span)
+
+        if i == 0:
+            continue
+        if span.start > cur_end:
+            summary.covered_minutes += cur_end - cur_start
+            summary.gaps.append((cur_end, span.start))
+            cur_start, cur_end = span.start, span.end
+        else:
+            cur_end = max(cur_end, span.end)
+
+    summary.covered_minutes += cur_end - cur_start
+    summary.last_end = cur_end
+    return summary
+
+
+def analyze_blocks(blocks) -> ScheduleSummary:
+    return analyze_spans(span_from_block(b) for b in blocks)
@@ -0,0 +1,118 @@
+# worklog/jcalendar.py
+"""
+جدول ماه‌های شمسی 1300 تا 1500 برای فیلترهای ماهانه/هفتگی.
+
+برای هر ماه فقط ordinal میلادیِ روز اولش در یک array('l') نگه داشته می‌شود
+(حدود ۲۴۰۰ عدد)؛ پایان ماه = شروع ماه بعد - ۱.
+بازه‌ی یک ماه یا هفته بدون jdatetime به (start, end) میلادی تبدیل می‌شود و
+فیلتر روی DailyPlan.date / DailyReport.date یک BETWEEN روی ایندکس date است:
+
+    start, end = month_range(1404, 9)
+    DailyPlan.objects.filter(date__range=(start, end))
+
+جدول بار اول که لازم شود ساخته می‌شود (یک jdatetime برای هر سال).
+"""
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import date, timedelta
+
+import jdatetime
+
+FIRST_YEAR = 1300
+LAST_YEAR = 1500
+
+_index = None
+_lock = threading.Lock()
+
+
+def _build():
+    starts = array("l")
+    ordinal = jdatetime.date(FIRST_YEAR, 1, 1).togregorian().toordinal()
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        esfand = 30 if jdatetime.date(year, 1, 1).isleap() else 29
+        for month in range(1, 13):
+            starts.append(ordinal)
+            ordinal += 31 if month <= 6 else (30 if month <= 11 else esfand)
+    # شروع فروردینِ سال بعد از LAST_YEAR، برای پایان اسفند آخر
+    starts.append(ordinal)
+    return starts
+
+
+def _starts():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = _build()
+    return _index
+
+
+def _slot(jy, jm):
+    if not (FIRST_YEAR <= jy <= LAST_YEAR and 1 <= jm <= 12):
+        raise ValueError("Jalali month out of range")
+    return (jy - FIRST_YEAR) * 12 + (jm - 1)
+
+
+def in_range(g_date):
+    starts = _starts()
+    return starts[0] <= g_date.toordinal() < starts[-1]
+
+
+# ---------- month ----------
+
+def month_range(jy, jm):
+    """(روز اول، روز آخر) میلادیِ ماه شمسی jy/jm"""
+    starts = _starts()
+    i = _slot(jy, jm)
+    return date.fromordinal(starts[i]), date.fromordinal(starts[i + 1] - 1)
+
+
+def days_in_month(jy, jm):
+    starts = _starts()
+    i = _slot(jy, jm)
+    return starts[i + 1] - starts[i]
+
+
+def month_weekday_offset(jy, jm):
+    """روز اول ماه چندمین روز هفته است (شنبه=0 ... جمعه=6)؛ برای چیدن تقویم ماهانه"""
+    return jalali_weekday(month_range(jy, jm)[0])
+
+
+def month_of(g_date):
+    """(jy, jm, jd) برای یک date میلادی با جستجوی دودویی در جدول"""
+    starts = _starts()
+    ordinal = g_date.toordinal()
+    if not starts[0] <= ordinal < starts[-1]:
+        raise ValueError("Date out of Jalali calendar range")
+    i = bisect_right(starts, ordinal) - 1
+    return FIRST_YEAR + i // 12, i % 12 + 1, ordinal - starts[i] + 1
+
+
+def shift_month(jy, jm, delta):
+    """ماه delta تا جلوتر/عقب‌تر: shift_month(1404, 12, 1) -> (1405, 1)"""
+    y, m = divmod((jy * 12 + jm - 1) + delta, 12)
+    return y, m + 1
+
+
+def parse_jalali_month(value):
+    """'1404/09' یا '1404-9' -> (1404, 9) ؛ نامعتبر -> ValueError"""
+    try:
+        jy, jm = map(int, str(value or "").strip().replace("-", "/").split("/"))
+        _slot(jy, jm)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid jalali month")
+    return jy, jm
+
+
+# ---------- week ----------
+
+def jalali_weekday(g_date):
+    """شنبه=0 ... جمعه=6 (مثل jdatetime)"""
+    return (g_date.weekday() + 2) % 7
+
+
+def week_range(g_date):
+    """(شنبه، جمعه)ِ هفته‌ای که g_date در آن است"""
+    start = g_date - timedelta(days=jalali_weekday(g_date))
+    return start, start + timedelta(days=6)
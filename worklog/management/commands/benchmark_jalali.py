@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+import jdatetime
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from worklog import dates
+
+
+def _row_uncached(g_date):
+    # همان کاری که ویوها قبلاً برای هر ردیف می‌کردند
+    j = jdatetime.date.fromgregorian(date=g_date)
+    return {
+        "weekday": dates.PERSIAN_WEEKDAYS.get(j.weekday(), ""),
+        "day_num": str(j.day).translate(dates.PERSIAN_DIGITS),
+        "month_name": dates.PERSIAN_MONTHS.get(j.month, ""),
+        "jalali_full": f"{j.year:04d}-{j.month:02d}-{j.day:02d}",
+        "title": f"{dates.to_persian_digits(j.day)} {dates.PERSIAN_MONTHS.get(j.month, '')} {dates.to_persian_digits(j.year)}",
+    }
+
+
+def _row_cached(g_date):
+    j = dates.to_jalali(g_date)
+    return {
+        "weekday": j.weekday_name,
+        "day_num": dates.to_persian_digits(j.day),
+        "month_name": j.month_name,
+        "jalali_full": dates.format_jalali_date(g_date),
+        "title": dates.format_jalali_human(g_date),
+    }
+
+
+class Command(BaseCommand):
+    help = "مقایسه‌ی زمان ساخت ردیف‌های تاریخ شمسی با jdatetime مستقیم و با worklog.dates (کش‌شده)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--days", type=int, default=90, help="تعداد تاریخ‌های متمایز بین ردیف‌ها")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def _measure(self, fn, values, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for value in values:
+                fn(value)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        days = max(1, options["days"])
+        values = [today - timedelta(days=i % days) for i in range(options["rows"])]
+
+        if any(_row_uncached(v) != _row_cached(v) for v in values[:days]):
+            self.stderr.write("خروجی دو روش یکسان نیست.")
+            return
+
+        uncached = self._measure(_row_uncached, values, options["repeat"])
+        dates._to_jalali.cache_clear()
+        cached = self._measure(_row_cached, values, options["repeat"])
+
+        self.stdout.write(f"rows={len(values)} distinct_dates={days}")
+        self.stdout.write(f"jdatetime: {uncached * 1000:.1f} ms")
+        self.stdout.write(f"cached:    {cached * 1000:.1f} ms")
+        self.stdout.write(f"speedup:   x{uncached / cached:.1f}" if cached else "speedup: -")
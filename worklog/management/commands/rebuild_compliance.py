@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from worklog.compliance import rebuild_compliance
+from worklog.dates import parse_jalali_date
+
+
+class Command(BaseCommand):
+    help = "بازسازی جدول DailyComplianceSnapshot از روی پلن‌ها و گزارش‌ها (کل جدول یا یک بازه)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", default=None, help="تاریخ شروع (شمسی، مثل 1404/09/01)")
+        parser.add_argument("--to", dest="end", default=None, help="تاریخ پایان (شمسی)")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_jalali_date(options["start"]) if options["start"] else None
+            end = parse_jalali_date(options["end"]) if options["end"] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        upserted, deleted = rebuild_compliance(start, end, batch_size=options["batch_size"])
+        self.stdout.write(f"upserted={upserted} deleted={deleted}")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('worklog', '0002_reportachievement'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyComplianceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('has_plan', models.BooleanField(default=False)),
+                ('has_report', models.BooleanField(default=False)),
+                ('has_active_plan', models.BooleanField(default=False)),
+                ('has_active_report', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compliance_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='worklog_dai_date_6dc011_idx')],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('worklog', '0003_dailycompliancesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyreport',
+            name='plan_synced_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
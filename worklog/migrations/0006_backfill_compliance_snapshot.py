@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    # داشبوردهای ادمین (WORKLOG_USE_COMPLIANCE_SNAPSHOT) از همین جدول می‌خوانند؛
+    # بدون این مرحله بعد از deploy همه «بدون پلن/گزارش» نمایش داده می‌شوند
+    from worklog.compliance import rebuild_compliance
+
+    rebuild_compliance(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('worklog', '0005_plantemplate'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
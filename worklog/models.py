@@ -2,6 +2,8 @@
 from django.db import models
 from django.conf import settings
 
+from accounts.utils.tracking import TrackedFieldsMixin
+
 User = settings.AUTH_USER_MODEL
 
 
@@ -18,7 +20,7 @@ class Project(models.Model):
         return self.title
 
 
-class ProjectMember(models.Model):
+class ProjectMember(TrackedFieldsMixin, models.Model):
     ROLE_MEMBER = "member"
     ROLE_MANAGER = "manager"
 
@@ -27,6 +29,8 @@ class ProjectMember(models.Model):
         (ROLE_MANAGER, "مدیر پروژه"),
     )
 
+    TRACKED_FIELDS = ("is_active",)
+
     project = models.ForeignKey(
         Project,
         on_delete=models.CASCADE,
@@ -145,6 +149,9 @@ class DailyReport(models.Model):
     date = models.DateField()
     locked_at = models.DateTimeField()
 
+    # updated_at پلن در آخرین materialize_report؛ اگر برابر باشد entryها و اهداف به‌روزند
+    plan_synced_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -236,3 +243,64 @@ class ReportAchievement(models.Model):
 
     def __str__(self):
         return f"{self.achievement} => {self.achieved}"
+
+
+class PlanTemplate(models.Model):
+    """
+    قالب پلن روزانه که از یک DailyPlan ذخیره می‌شود و روی چند تاریخ کپی می‌شود.
+
+    payload:
+        {"achievements": ["..."],
+         "blocks": [{"start": "08:00", "end": "09:00", "title": "...", "desc": "", "is_required": true}]}
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="plan_templates"
+    )
+    title = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["owner", "-updated_at"]),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class DailyComplianceSnapshot(models.Model):
+    """
+    خلاصه‌ی «کاربر X در روز D پلن/گزارش دارد؟» برای داشبوردهای ادمین.
+    با سیگنال‌های worklog/signals.py به‌روز می‌ماند؛ بازسازی کامل: manage.py rebuild_compliance
+
+    has_plan / has_report: از هر عضویتی
+    has_active_plan / has_active_report: فقط از عضویت‌های فعال
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="compliance_snapshots"
+    )
+    date = models.DateField()
+
+    has_plan = models.BooleanField(default=False)
+    has_report = models.BooleanField(default=False)
+    has_active_plan = models.BooleanField(default=False)
+    has_active_report = models.BooleanField(default=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "date")
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} @ {self.date}"
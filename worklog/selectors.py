@@ -1,14 +1,21 @@
 # worklog/selectors.py
 from datetime import date as date_cls
-from django.db.models import Prefetch
 
+from django.conf import settings
+from django.db.models import Case, CharField, Count, Exists, Max, OuterRef, Prefetch, Q, Subquery, Value, When
+
+from .jcalendar import month_range, week_range
 from .models import (
     Project,
     ProjectMember,
     DailyPlan,
+    DailyAchievement,
     DailyReport,
     DailyScheduleBlock,
     ReportEntry,
+    ReportAchievement,
+    ReportStatus,
+    DailyComplianceSnapshot,
 )
 
 
@@ -60,6 +67,104 @@ def get_plan_with_details(member, date):
     )
 
 
+def list_user_plans(user, top_achievements=3):
+    """
+    پلن‌های کاربر برای صفحه‌ی «برنامه‌های من»، بدون N+1:
+        ach_count: تعداد کل دستاوردها
+        has_extra: بلاک غیرالزامی دارد؟
+        top_achievements: فقط چند دستاورد اول (prefetch پنجره‌ای)
+    """
+    return (
+        DailyPlan.objects
+        .select_related("project_member", "project_member__project")
+        .filter(project_member__user=user, project_member__is_active=True)
+        .annotate(
+            ach_count=Count("achievements"),
+            has_extra=Exists(
+                DailyScheduleBlock.objects.filter(plan_id=OuterRef("pk"), is_required=False)
+            ),
+        )
+        .prefetch_related(
+            Prefetch(
+                "achievements",
+                queryset=DailyAchievement.objects.order_by("sort_order", "id")[:top_achievements],
+                to_attr="top_achievements",
+            )
+        )
+        .order_by("-date")
+    )
+
+
+def list_user_report_timeline(user, start, end=None):
+    """
+    پلن‌های کاربر در بازه‌ی [start, end) به همراه گزارش هر پلن در همان کوئری:
+        report_id / report_locked_at: از DailyReport.plan (None یعنی گزارشی ثبت نشده)
+        ach_count: تعداد دستاوردها
+    """
+    report = DailyReport.objects.filter(plan_id=OuterRef("pk")).order_by("-id")
+
+    qs = (
+        DailyPlan.objects
+        .filter(
+            project_member__user=user,
+            project_member__is_active=True,
+            date__gte=start,
+        )
+        .annotate(
+            report_id=Subquery(report.values("id")[:1]),
+            report_locked_at=Subquery(report.values("locked_at")[:1]),
+            ach_count=Count("achievements"),
+        )
+        .order_by("-date")
+    )
+    if end is not None:
+        qs = qs.filter(date__lt=end)
+    return qs
+
+
+def filter_jalali_month(qs, jy, jm, field="date"):
+    """فقط ردیف‌های ماه شمسی jy/jm (یک BETWEEN روی ایندکس date)"""
+    return qs.filter(**{f"{field}__range": month_range(jy, jm)})
+
+
+def filter_jalali_week(qs, day, field="date"):
+    """فقط ردیف‌های هفته‌ی (شنبه تا جمعه) شاملِ day"""
+    return qs.filter(**{f"{field}__range": week_range(day)})
+
+
+def latest_user_plan_date_before(user, before):
+    """تاریخ جدیدترین پلنِ قبل از before (برای «بارگذاری بیشتر»)؛ None یعنی پلن قدیمی‌تری نیست."""
+    return (
+        DailyPlan.objects
+        .filter(project_member__user=user, project_member__is_active=True, date__lt=before)
+        .aggregate(last=Max("date"))["last"]
+    )
+
+
+def get_report_display_rows(report, plan):
+    """
+    (achievement_states, entries) برای صفحه‌ی مشاهده‌ی گزارش، بدون نوشتن در دیتابیس.
+    برای دستاورد/بلاکی که هنوز ردیف ندارد یک instance ذخیره‌نشده با مقدار پیش‌فرض ساخته می‌شود.
+    plan باید با prefetch دستاوردها و بلاک‌ها لود شده باشد.
+    """
+    states = {s.achievement_id: s for s in ReportAchievement.objects.filter(report=report)}
+    entries = {e.schedule_block_id: e for e in ReportEntry.objects.filter(report=report)}
+
+    achievement_states = []
+    for ach in sorted(plan.achievements.all(), key=lambda a: (a.sort_order, a.id)):
+        state = states.get(ach.id) or ReportAchievement(report=report, achieved=False)
+        state.achievement = ach
+        achievement_states.append(state)
+
+    entry_rows = []
+    for block in sorted(plan.schedule_blocks.all(), key=lambda b: (b.start_time, b.id)):
+        entry = entries.get(block.id) or ReportEntry(report=report, status=ReportStatus.NOT_DONE)
+        entry.schedule_block = block
+        entry_rows.append(entry)
+
+    return achievement_states, entry_rows
+
+
 def get_report(member, date):
     return (
         DailyReport.objects
@@ -82,3 +187,141 @@ def get_report_with_entries(member, date):
         .filter(project_member=member, date=date)
         .first()
     )
+
+
+# ---------- admin stats ----------
+
+def annotate_day_status(users_qs, day, active_only=False):
+    """
+    روی کوئری کاربران دو ستون has_plan و has_report (برای روز day) اضافه می‌کند.
+
+    active_only=True: فقط عضویت‌های فعال حساب می‌شوند (منطق صفحه‌ی برنامه‌ها).
+
+    به صورت پیش‌فرض از DailyComplianceSnapshot خوانده می‌شود (یک lookup روی ایندکس (user, date)).
+    با WORKLOG_USE_COMPLIANCE_SNAPSHOT = False مستقیم از پلن‌ها و گزارش‌ها حساب می‌شود.
+    """
+    if getattr(settings, "WORKLOG_USE_COMPLIANCE_SNAPSHOT", True):
+        snapshot = DailyComplianceSnapshot.objects.filter(user_id=OuterRef("pk"), date=day)
+        plan_flag, report_flag = (
+            ("has_active_plan", "has_active_report") if active_only else ("has_plan", "has_report")
+        )
+        return users_qs.annotate(
+            has_plan=Exists(snapshot.filter(**{plan_flag: True})),
+            has_report=Exists(snapshot.filter(**{report_flag: True})),
+        )
+
+    if active_only:
+        plans = DailyPlan.objects.filter(
+            date=day,
+            project_member__user_id=OuterRef("pk"),
+            project_member__is_active=True,
+        )
+        reports = DailyReport.objects.filter(
+            plan__date=day,
+            plan__project_member__user_id=OuterRef("pk"),
+            plan__project_member__is_active=True,
+        )
+    else:
+        plans = DailyPlan.objects.filter(date=day, project_member__user_id=OuterRef("pk"))
+        reports = DailyReport.objects.filter(date=day, project_member__user_id=OuterRef("pk"))
+
+    return users_qs.annotate(has_plan=Exists(plans), has_report=Exists(reports))
+
+
+def day_status_counts(users_qs, day, active_only=False):
+    """
+    همه‌ی شمارنده‌های بالای صفحه‌های worklog ادمین در یک کوئری:
+        {"total", "with_plan", "with_report", "with_plan_and_report"}
+    """
+    qs = annotate_day_status(users_qs.order_by(), day, active_only=active_only)
+    return qs.aggregate(
+        total=Count("pk"),
+        with_plan=Count("pk", filter=Q(has_plan=True)),
+        with_report=Count("pk", filter=Q(has_report=True)),
+        with_plan_and_report=Count("pk", filter=Q(has_plan=True, has_report=True)),
+    )
+
+
+PLAN_STATUSES = ("done", "waiting", "planned", "absent")
+
+
+def annotate_plan_status(users_qs, day, today):
+    """
+    وضعیت هر کاربر در صفحه‌ی برنامه‌ها به صورت ستون plan_status (داخل SQL):
+        absent: پلن ندارد | planned: پلن برای آینده | done: گزارش دارد | waiting: منتظر گزارش
+    """
+    qs = annotate_day_status(users_qs, day, active_only=True)
+
+    if day > today:
+        whens = [When(has_plan=True, then=Value("planned"))]
+    else:
+        whens = [
+            When(has_plan=True, has_report=True, then=Value("done")),
+            When(has_plan=True, then=Value("waiting")),
+        ]
+
+    return qs.annotate(
+        plan_status=Case(*whens, default=Value("absent"), output_field=CharField())
+    )
+
+
+def plan_status_counts(users_qs, day, today):
+    """
+    {"total", "done", "waiting", "planned", "absent"} با یک aggregate.
+    """
+    qs = annotate_plan_status(users_qs.order_by(), day, today)
+    return qs.aggregate(
+        total=Count("pk"),
+        **{key: Count("pk", filter=Q(plan_status=key)) for key in PLAN_STATUSES},
+    )
+
+
+def month_compliance_bits(user_ids, start, end):
+    """
+    {user_id: (plan_bits, report_bits)} برای روزهای [start, end]:
+    بیت i یعنی روز start + i پلن/گزارش دارد.
+
+    یک کوئری: از DailyComplianceSnapshot، یا (بدون snapshot) UNION گروه‌بندی‌شده‌ی
+    (user, date) روی DailyPlan و DailyReport.
+    """
+    user_ids = list(user_ids)
+    bits = {uid: [0, 0] for uid in user_ids}
+    if not user_ids:
+        return {}
+
+    if getattr(settings, "WORKLOG_USE_COMPLIANCE_SNAPSHOT", True):
+        rows = (
+            compliance_for_range(start, end, user_ids)
+            .filter(Q(has_plan=True) | Q(has_report=True))
+            .values_list("user_id", "date", "has_plan", "has_report")
+        )
+        for uid, day, has_plan, has_report in rows:
+            i = (day - start).days
+            bits[uid][0] |= has_plan << i
+            bits[uid][1] |= has_report << i
+    else:
+        plans = (
+            DailyPlan.objects
+            .filter(project_member__user_id__in=user_ids, date__gte=start, date__lte=end)
+            .values_list("project_member__user_id", "date", Value(0))
+        )
+        reports = (
+            DailyReport.objects
+            .filter(project_member__user_id__in=user_ids, date__gte=start, date__lte=end)
+            .values_list("project_member__user_id", "date", Value(1))
+        )
+        # UNION (بدون ALL) همان group by روی (user, date, kind) است
+        for uid, day, kind in plans.union(reports):
+            bits[uid][kind] |= 1 << (day - start).days
+
+    return {uid: tuple(pair) for uid, pair in bits.items()}
+
+
+def compliance_for_range(start, end, user_ids=None):
+    """
+    ردیف‌های snapshot برای بازه‌ی [start, end] (یک range scan روی ایندکس date).
+    """
+    qs = DailyComplianceSnapshot.objects.filter(date__gte=start, date__lte=end)
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    return qs.order_by("date", "user_id")
@@ -1,13 +1,21 @@
 # worklog/services.py
+from dataclasses import dataclass, field
 from datetime import datetime, time, timedelta
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Value, When
 from django.utils import timezone
 
+from .compliance import refresh_compliance
+from .intervals import analyze_blocks, from_minutes
 from .models import (
+    DailyAchievement,
     DailyPlan,
     DailyReport,
     DailyScheduleBlock,
+    PlanTemplate,
+    ReportAchievement,
     ReportEntry,
+    ReportExtraAction,
     ReportStatus,
 )
 
@@ -44,6 +52,295 @@ def ensure_plan_editable(plan):
     assert_plan_editable(plan)
 
 
+# ---------- plan submit (wizard / API) ----------
+
+class PlanPayloadError(ValueError):
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__(" | ".join(self.errors))
+
+
+@dataclass
+class PlanPayload:
+    date: object
+    achievements: list
+    blocks: list  # [{"start_time", "end_time", "task_title", "description", "is_required"}]
+
+
+def _parse_hhmm(value):
+    try:
+        return datetime.strptime((value or "").strip(), "%H:%M").time()
+    except (TypeError, ValueError):
+        return None
+
+
+def _list_value(data, key, errors):
+    """achievements/blocks/extras باید لیست باشند؛ "abc" نباید سه دستاورد 'a' و 'b' و 'c' بشود"""
+    value = data.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        errors.append(f"«{key}» باید لیست باشد.")
+        return []
+    return value
+
+
+def _clean_achievements(items, errors):
+    title_max = DailyAchievement._meta.get_field("title").max_length
+    achievements = []
+    for title in items:
+        if title is not None and not isinstance(title, (str, int, float)):
+            errors.append("عنوان دستاورد نامعتبر است.")
+            continue
+        title = str(title or "").strip()
+        if not title:
+            continue
+        if len(title) > title_max:
+            errors.append(f"عنوان دستاورد بیش از {title_max} کاراکتر است.")
+            continue
+        achievements.append(title)
+    return achievements
+
+
+def _clean_blocks(items, errors):
+    """
+    items: [(raw_block, is_required)] ؛ خروجی مرتب‌شده بر اساس ساعت، به شکل PlanPayload.blocks
+    هم‌پوشانی‌ها هم به errors اضافه می‌شوند.
+    """
+    from .validators import validate_time_range
+
+    task_max = DailyScheduleBlock._meta.get_field("task_title").max_length
+    blocks = []
+    for raw, is_required in items:
+        if not isinstance(raw, dict):
+            errors.append("اطلاعات بازه‌ی زمانی نامعتبر است.")
+            continue
+        title = str(raw.get("title") or "").strip()
+        start = _parse_hhmm(raw.get("start"))
+        end = _parse_hhmm(raw.get("end"))
+
+        if not title or start is None or end is None:
+            errors.append("هر بازه باید ساعت شروع، پایان و عنوان داشته باشد.")
+            continue
+        if len(title) > task_max:
+            errors.append(f"عنوان «{title[:20]}…» بیش از {task_max} کاراکتر است.")
+            continue
+        try:
+            validate_time_range(start, end)
+        except ValueError as e:
+            errors.append(f"{title}: {e}")
+            continue
+
+        blocks.append({
+            "start_time": start,
+            "end_time": end,
+            "task_title": title,
+            "description": str(raw.get("desc") or "").strip(),
+            "is_required": bool(is_required),
+        })
+
+    for first, second in analyze_blocks(blocks).overlaps:
+        errors.append(
+            f"بازه‌ی «{second.label}» با «{first.label}» هم‌پوشانی دارد "
+            f"({from_minutes(second.start):%H:%M} < {from_minutes(first.end):%H:%M})."
+        )
+
+    blocks.sort(key=lambda b: (b["start_time"], b["end_time"]))
+    return blocks
+
+
+def validate_plan_payload(member, data):
+    """
+    کل payload را قبل از هر نوشتنی در دیتابیس بررسی می‌کند و PlanPayload تمیز برمی‌گرداند.
+    همه‌ی خطاها با هم در PlanPayloadError.errors برمی‌گردند.
+
+    data: {"jalali_date", "achievements": [str], "blocks": [{start, end, title, desc}], "extras": [...]}
+    """
+    from .dates import parse_jalali_date
+
+    errors = []
+    if not isinstance(data, dict):
+        raise PlanPayloadError(["اطلاعات برنامه نامعتبر است."])
+
+    plan_date = None
+    try:
+        plan_date = parse_jalali_date(str(data.get("jalali_date") or ""))
+    except ValueError:
+        errors.append("فرمت تاریخ شمسی نادرست است")
+
+    achievements = _clean_achievements(_list_value(data, "achievements", errors), errors)
+    blocks = _clean_blocks(
+        [(raw, True) for raw in _list_value(data, "blocks", errors)]
+        + [(raw, False) for raw in _list_value(data, "extras", errors)],
+        errors,
+    )
+
+    if plan_date and DailyPlan.objects.filter(project_member=member, date=plan_date).exists():
+        errors.append("برای این تاریخ قبلاً برنامه ثبت شده است.")
+
+    if errors:
+        raise PlanPayloadError(errors)
+
+    return PlanPayload(date=plan_date, achievements=achievements, blocks=blocks)
+
+
+def create_plan(member, payload):
+    """
+    پلن و همه‌ی دستاوردها و بلاک‌هایش در یک تراکنش و با سه INSERT.
+    payload باید از validate_plan_payload آمده باشد.
+    """
+    try:
+        with transaction.atomic():
+            plan = DailyPlan.objects.create(
+                project_member=member,
+                date=payload.date,
+                locked_at=calc_plan_locked_at(payload.date),
+            )
+            if payload.achievements:
+                DailyAchievement.objects.bulk_create([
+                    DailyAchievement(plan=plan, title=title, sort_order=idx)
+                    for idx, title in enumerate(payload.achievements)
+                ])
+            if payload.blocks:
+                DailyScheduleBlock.objects.bulk_create([
+                    DailyScheduleBlock(plan=plan, **block)
+                    for block in payload.blocks
+                ])
+    except IntegrityError:
+        # درخواست همزمان برای همین تاریخ
+        raise PlanPayloadError(["برای این تاریخ قبلاً برنامه ثبت شده است."])
+
+    return plan
+
+
+def submit_plan(member, data):
+    return create_plan(member, validate_plan_payload(member, data))
+
+
+# ---------- plan templates / clone ----------
+
+MAX_CLONE_DATES = 62
+
+
+def template_payload_from_plan(plan):
+    """payload قالب (همان شکل PlanTemplate.payload) از روی دستاوردها و بلاک‌های یک پلن."""
+    achievements = list(
+        plan.achievements.order_by("sort_order", "id").values_list("title", flat=True)
+    )
+    blocks = [
+        {
+            "start": f"{b.start_time:%H:%M}",
+            "end": f"{b.end_time:%H:%M}",
+            "title": b.task_title,
+            "desc": b.description or "",
+            "is_required": b.is_required,
+        }
+        for b in plan.schedule_blocks.order_by("start_time", "end_time")
+    ]
+    return {"achievements": achievements, "blocks": blocks}
+
+
+def save_plan_as_template(owner, plan, title):
+    title = title.strip() if isinstance(title, str) else ""
+    if not title:
+        raise PlanPayloadError(["عنوان قالب الزامی است."])
+    title_max = PlanTemplate._meta.get_field("title").max_length
+    if len(title) > title_max:
+        raise PlanPayloadError([f"عنوان قالب بیش از {title_max} کاراکتر است."])
+
+    return PlanTemplate.objects.create(
+        owner=owner,
+        title=title,
+        payload=template_payload_from_plan(plan),
+    )
+
+
+@dataclass
+class CloneResult:
+    created: list = field(default_factory=list)  # تاریخ‌هایی که پلن برایشان ساخته شد
+    skipped: list = field(default_factory=list)  # تاریخ‌هایی که از قبل پلن داشتند
+
+
+def clone_plan_to_dates(member, source, dates):
+    """
+    محتوای یک پلن یا قالب را روی چند تاریخ آینده کپی می‌کند.
+
+    - source: DailyPlan یا PlanTemplate
+    - تاریخ‌هایی که از قبل پلن دارند رد می‌شوند (در CloneResult.skipped)
+    - همه در یک تراکنش: یک INSERT برای پلن‌ها، یک SELECT برای idها،
+      و یک INSERT برای دستاوردها و یکی برای بلاک‌ها (نه به ازای هر روز)
+    """
+    payload = source.payload if isinstance(source, PlanTemplate) else template_payload_from_plan(source)
+    if not isinstance(payload, dict):
+        raise PlanPayloadError(["محتوای قالب نامعتبر است."])
+
+    errors = []
+    achievements = _clean_achievements(_list_value(payload, "achievements", errors), errors)
+    blocks = _clean_blocks(
+        [(raw, raw.get("is_required", True) if isinstance(raw, dict) else True)
+         for raw in _list_value(payload, "blocks", errors)],
+        errors,
+    )
+
+    dates = sorted({d for d in dates if d})
+    today = timezone.localdate()
+    if not dates:
+        errors.append("هیچ تاریخی انتخاب نشده است.")
+    elif len(dates) > MAX_CLONE_DATES:
+        errors.append(f"حداکثر {MAX_CLONE_DATES} روز را می‌توان یکجا کپی کرد.")
+    elif dates[0] <= today:
+        errors.append("فقط برای روزهای آینده می‌توان برنامه کپی کرد.")
+
+    if errors:
+        raise PlanPayloadError(errors)
+
+    existing = set(
+        DailyPlan.objects
+        .filter(project_member=member, date__in=dates)
+        .values_list("date", flat=True)
+    )
+    result = CloneResult(
+        created=[d for d in dates if d not in existing],
+        skipped=[d for d in dates if d in existing],
+    )
+    if not result.created:
+        return result
+
+    try:
+        with transaction.atomic():
+            DailyPlan.objects.bulk_create([
+                DailyPlan(project_member=member, date=d, locked_at=calc_plan_locked_at(d))
+                for d in result.created
+            ])
+            # MySQL در bulk_create شناسه برنمی‌گرداند
+            plan_ids = dict(
+                DailyPlan.objects
+                .filter(project_member=member, date__in=result.created)
+                .values_list("date", "id")
+            )
+
+            if achievements:
+                DailyAchievement.objects.bulk_create([
+                    DailyAchievement(plan_id=plan_ids[d], title=title, sort_order=idx)
+                    for d in result.created
+                    for idx, title in enumerate(achievements)
+                ], batch_size=500)
+            if blocks:
+                DailyScheduleBlock.objects.bulk_create([
+                    DailyScheduleBlock(plan_id=plan_ids[d], **block)
+                    for d in result.created
+                    for block in blocks
+                ], batch_size=500)
+
+            # bulk_create سیگنال ندارد
+            refresh_compliance(member.user_id, result.created)
+    except IntegrityError:
+        # درخواست همزمان یکی از همین تاریخ‌ها را ساخته
+        raise PlanPayloadError(["برای بعضی از این تاریخ‌ها همزمان برنامه ثبت شد؛ دوباره تلاش کنید."])
+
+    return result
+
+
 # ---------- report ----------
 
 @transaction.atomic
@@ -64,37 +361,51 @@ def get_or_create_today_report(member, plan):
 
 
 
+def touch_plan(plan_id):
+    """
+    updated_at پلن را جلو می‌برد تا گزارش‌های آن دوباره materialize شوند
+    (بعد از تغییر دستاوردها یا بلاک‌ها؛ signals.py).
+    """
+    DailyPlan.objects.filter(pk=plan_id).update(updated_at=timezone.now())
+
+
 @transaction.atomic
-def sync_report_entries_from_plan(report):
+def materialize_report(report, plan=None):
     """
-    Lazy sync:
-    فقط entry هایی که وجود ندارن ساخته می‌شن
+    ReportEntry و ReportAchievement جاافتاده را برای همه‌ی بلاک‌ها و دستاوردهای پلن می‌سازد.
+
+    - فقط اگر پلن بعد از آخرین sync تغییر کرده باشد (DailyPlan.updated_at != report.plan_synced_at)
+    - ساخت با bulk_create(ignore_conflicts=True): حداکثر دو INSERT، بدون خواندن ردیف‌های موجود
+    - اگر plan با prefetch بلاک‌ها/دستاوردها پاس داده شود، کوئری خواندن هم نمی‌زند
+    خروجی: True اگر sync انجام شد
     """
-    plan_blocks = (
-        DailyScheduleBlock.objects
-        .filter(plan=report.plan)
-        .only("id")
-    )
+    if plan is None or plan.pk != report.plan_id:
+        plan = report.plan
 
-    existing_block_ids = set(
-        ReportEntry.objects
-        .filter(report=report)
-        .values_list("schedule_block_id", flat=True)
-    )
+    if report.plan_synced_at is not None and report.plan_synced_at == plan.updated_at:
+        return False
 
-    new_entries = []
-    for block in plan_blocks:
-        if block.id not in existing_block_ids:
-            new_entries.append(
-                ReportEntry(
-                    report=report,
-                    schedule_block=block,
-                    status=ReportStatus.NOT_DONE,
-                )
-            )
+    block_ids = [b.id for b in plan.schedule_blocks.all()]
+    achievement_ids = [a.id for a in plan.achievements.all()]
 
-    if new_entries:
-        ReportEntry.objects.bulk_create(new_entries)
+    if block_ids:
+        ReportEntry.objects.bulk_create(
+            [
+                ReportEntry(report=report, schedule_block_id=bid, status=ReportStatus.NOT_DONE)
+                for bid in block_ids
+            ],
+            ignore_conflicts=True,
+        )
+    if achievement_ids:
+        ReportAchievement.objects.bulk_create(
+            [ReportAchievement(report=report, achievement_id=aid) for aid in achievement_ids],
+            ignore_conflicts=True,
+        )
+
+    # نسخه‌ای از پلن که sync شد (نه now)؛ تغییری که همزمان برسد دفعه‌ی بعد دیده می‌شود
+    DailyReport.objects.filter(pk=report.pk).update(plan_synced_at=plan.updated_at)
+    report.plan_synced_at = plan.updated_at
+    return True
 
 
 def ensure_report_editable(report):
@@ -102,3 +413,145 @@ def ensure_report_editable(report):
     assert_report_editable(report)
 
 
+# ---------- report submit ----------
+
+@dataclass
+class ReportChanges:
+    entries_updated: int = 0
+    achievements_checked: list = field(default_factory=list)
+    achievements_unchecked: list = field(default_factory=list)
+    extras_created: int = 0
+    extras_updated: int = 0
+    extras_deleted: int = 0
+
+    @property
+    def has_changes(self):
+        return bool(
+            self.entries_updated
+            or self.achievements_checked
+            or self.achievements_unchecked
+            or self.extras_created
+            or self.extras_updated
+            or self.extras_deleted
+        )
+
+    def summary(self):
+        """متن کوتاه فارسی برای پیام و لاگ فعالیت"""
+        parts = []
+        if self.entries_updated:
+            parts.append(f"{self.entries_updated} تسک")
+        if self.achievements_checked or self.achievements_unchecked:
+            parts.append(f"{len(self.achievements_checked) + len(self.achievements_unchecked)} دستاورد")
+        extras = self.extras_created + self.extras_updated + self.extras_deleted
+        if extras:
+            parts.append(f"{extras} کار خارج از برنامه")
+        return "، ".join(parts) if parts else "بدون تغییر"
+
+
+def _save_entries(report, entry_values, changes):
+    """فقط entryهایی که status یا note آن‌ها عوض شده با یک bulk_update ذخیره می‌شوند."""
+    if not entry_values:
+        return
+
+    now = timezone.now()
+    dirty = []
+    for entry in ReportEntry.objects.filter(report=report, id__in=entry_values.keys()):
+        values = entry_values[entry.id]
+        status = values.get("status", entry.status)
+        note = values.get("note", entry.note)
+        if status == entry.status and note == entry.note:
+            continue
+        entry.status = status
+        entry.note = note
+        entry.updated_at = now
+        dirty.append(entry)
+
+    if dirty:
+        ReportEntry.objects.bulk_update(dirty, ["status", "note", "updated_at"])
+    changes.entries_updated = len(dirty)
+
+
+def _save_achievements(report, achieved_ids, changes):
+    """فقط ردیف‌هایی که وضعیتشان عوض شده، با یک UPDATE ... WHERE id IN"""
+    to_check, to_uncheck = [], []
+    states = ReportAchievement.objects.filter(report=report).values_list("id", "achievement_id", "achieved")
+    for state_id, achievement_id, achieved in states:
+        should = achievement_id in achieved_ids
+        if should and not achieved:
+            to_check.append((state_id, achievement_id))
+        elif achieved and not should:
+            to_uncheck.append((state_id, achievement_id))
+
+    if not (to_check or to_uncheck):
+        return
+
+    check_ids = [sid for sid, _ in to_check]
+    ReportAchievement.objects.filter(id__in=check_ids + [sid for sid, _ in to_uncheck]).update(
+        achieved=Case(When(id__in=check_ids, then=Value(True)), default=Value(False))
+    )
+    changes.achievements_checked = [aid for _, aid in to_check]
+    changes.achievements_unchecked = [aid for _, aid in to_uncheck]
+
+
+EXTRA_FIELDS = ("title", "description", "start_time", "end_time")
+
+
+def _save_extras(report, extras, changes):
+    """
+    upsert کارهای خارج از برنامه:
+    - با id موجود: فقط اگر فرقی کرده باشد update
+    - بدون id: اگر دقیقاً مثل یک ردیف موجود باشد همان حفظ می‌شود، وگرنه ساخته می‌شود
+    - ردیف‌های موجودی که دیگر ارسال نشده‌اند حذف می‌شوند
+    """
+    existing = {ex.id: ex for ex in ReportExtraAction.objects.filter(report=report)}
+    by_content = {}
+    for ex in existing.values():
+        by_content.setdefault(tuple(getattr(ex, f) for f in EXTRA_FIELDS), []).append(ex.id)
+
+    kept, to_update, to_create = set(), [], []
+    for item in extras:
+        content = tuple(item.get(f) for f in EXTRA_FIELDS)
+        current = existing.get(item.get("id"))
+
+        if current is None:
+            # کلاینت id نفرستاده: اگر همان ردیف قبلی است دوباره ساخته نشود
+            same = [pk for pk in by_content.get(content, []) if pk not in kept]
+            if same:
+                kept.add(same[0])
+                continue
+            to_create.append(ReportExtraAction(report=report, **dict(zip(EXTRA_FIELDS, content))))
+            continue
+
+        kept.add(current.id)
+        if tuple(getattr(current, f) for f in EXTRA_FIELDS) != content:
+            for f, v in zip(EXTRA_FIELDS, content):
+                setattr(current, f, v)
+            to_update.append(current)
+
+    stale_ids = [pk for pk in existing if pk not in kept]
+    if stale_ids:
+        ReportExtraAction.objects.filter(id__in=stale_ids).delete()
+    if to_update:
+        ReportExtraAction.objects.bulk_update(to_update, list(EXTRA_FIELDS))
+    if to_create:
+        ReportExtraAction.objects.bulk_create(to_create)
+
+    changes.extras_created = len(to_create)
+    changes.extras_updated = len(to_update)
+    changes.extras_deleted = len(stale_ids)
+
+
+@transaction.atomic
+def save_report_submission(report, entry_values, achieved_ids, extras):
+    """
+    ذخیره‌ی فرم گزارش با مقایسه با وضعیت فعلی؛ فقط ردیف‌های تغییرکرده نوشته می‌شوند.
+
+    entry_values: {entry_id: {"status": int, "note": str}}
+    achieved_ids: مجموعه‌ی achievement_idهای تیک‌خورده
+    extras: [{"id": int|None, "title", "description", "start_time", "end_time"}]
+    """
+    changes = ReportChanges()
+    _save_entries(report, entry_values, changes)
+    _save_achievements(report, set(achieved_ids), changes)
+    _save_extras(report, extras, changes)
+    return changes
@@ -0,0 +1,52 @@
+# worklog/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .compliance import refresh_compliance, refresh_member_compliance
+from .models import DailyAchievement, DailyPlan, DailyReport, DailyScheduleBlock, ProjectMember
+from .services import touch_plan
+
+
+def _member_user_id(instance):
+    member = instance._state.fields_cache.get("project_member")
+    if member is not None:
+        return member.user_id
+    return (
+        ProjectMember.objects
+        .filter(pk=instance.project_member_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=DailyPlan)
+@receiver(post_delete, sender=DailyPlan)
+@receiver(post_save, sender=DailyReport)
+@receiver(post_delete, sender=DailyReport)
+def update_compliance_snapshot(sender, instance, **kwargs):
+    # فقط همان (کاربر، روز) دوباره حساب می‌شود
+    refresh_compliance(_member_user_id(instance), [instance.date])
+
+
+@receiver(pre_save, sender=ProjectMember)
+def member_before_save(sender, instance, update_fields=None, **kwargs):
+    old = instance.get_old_tracked_values(update_fields)
+    instance._old_is_active = old.get("is_active") if old else None
+
+
+@receiver(post_save, sender=ProjectMember)
+def update_member_compliance(sender, instance, created, **kwargs):
+    # عضو تازه هنوز پلن و گزارشی ندارد؛ فقط تغییر is_active روی snapshot اثر دارد
+    old_is_active = getattr(instance, "_old_is_active", None)
+    if created or old_is_active is None or old_is_active == instance.is_active:
+        return
+    refresh_member_compliance(instance.pk)
+
+
+@receiver(post_save, sender=DailyAchievement)
+@receiver(post_delete, sender=DailyAchievement)
+@receiver(post_save, sender=DailyScheduleBlock)
+@receiver(post_delete, sender=DailyScheduleBlock)
+def mark_plan_changed(sender, instance, **kwargs):
+    # گزارش‌های این پلن در باز شدن بعدی دوباره materialize می‌شوند
+    touch_plan(instance.plan_id)
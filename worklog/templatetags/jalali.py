@@ -1,6 +1,7 @@
-import jdatetime
 from django import template
 
+from worklog.dates import to_jalali
+
 register = template.Library()
 
 
@@ -10,5 +11,5 @@ def jalali_date(value):
         return ""
     # اگر datetime بود، date بگیر
     g_date = getattr(value, "date", lambda: value)()
-    j = jdatetime.date.fromgregorian(date=g_date)
+    j = to_jalali(g_date)
     return f"{j.year}/{j.month:02d}/{j.day:02d}"
@@ -1,3 +1,273 @@
+import datetime
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from worklog.compliance import FLAG_FIELDS, _upsert_options, rebuild_compliance
+from worklog.dates import format_jalali_date
+from worklog.models import (
+    DailyAchievement,
+    DailyComplianceSnapshot,
+    DailyPlan,
+    DailyReport,
+    DailyScheduleBlock,
+    Project,
+    ProjectMember,
+)
+from worklog.services import (
+    MAX_CLONE_DATES,
+    PlanPayloadError,
+    calc_plan_locked_at,
+    clone_plan_to_dates,
+    save_plan_as_template,
+)
+
+
+def _connection(with_target):
+    return SimpleNamespace(features=SimpleNamespace(supports_update_conflicts_with_target=with_target))
+
+
+class ComplianceSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="member", password="x", phone="09120000001", email="member@example.com",
+        )
+        project = Project.objects.create(title="p", sheet_url="https://example.com/p")
+        cls.member = ProjectMember.objects.create(project=project, user=cls.user)
+        cls.day = timezone.localdate()
+
+    def _snapshot(self):
+        return DailyComplianceSnapshot.objects.get(user=self.user, date=self.day)
+
+    def test_upsert_options_postgres_sqlite(self):
+        options = _upsert_options(_connection(True))
+        self.assertEqual(options["unique_fields"], ["user", "date"])
+        self.assertTrue(options["update_conflicts"])
+
+    def test_upsert_options_mysql(self):
+        # MySQL: unique_fields => NotSupportedError ؛ ON DUPLICATE KEY روی unique (user, date)
+        options = _upsert_options(_connection(False))
+        self.assertNotIn("unique_fields", options)
+        self.assertEqual(options["update_fields"], [*FLAG_FIELDS, "updated_at"])
+
+    def test_signal_write_without_conflict_target(self):
+        # همان مسیری که روی MySQL اجرا می‌شود: ذخیره‌ی پلن => refresh_compliance => bulk_create
+        manager = DailyComplianceSnapshot.objects
+        with mock.patch.object(connection.features, "supports_update_conflicts_with_target", False), \
+                mock.patch.object(manager, "bulk_create", wraps=manager.bulk_create) as bulk_create:
+            DailyPlan.objects.create(project_member=self.member, date=self.day, locked_at=timezone.now())
+
+        self.assertEqual(bulk_create.call_count, 1)
+        self.assertNotIn("unique_fields", bulk_create.call_args.kwargs)
+        self.assertTrue(self._snapshot().has_plan)
+
+    def test_report_updates_existing_snapshot(self):
+        plan = DailyPlan.objects.create(project_member=self.member, date=self.day, locked_at=timezone.now())
+        self.assertFalse(self._snapshot().has_report)
+
+        report = DailyReport.objects.create(
+            project_member=self.member, plan=plan, date=self.day, locked_at=timezone.now(),
+        )
+        snapshot = self._snapshot()
+        self.assertTrue(snapshot.has_plan)
+        self.assertTrue(snapshot.has_active_report)
+        self.assertEqual(DailyComplianceSnapshot.objects.filter(user=self.user).count(), 1)
+
+        report.delete()
+        plan.delete()
+        self.assertFalse(DailyComplianceSnapshot.objects.filter(user=self.user).exists())
+
+    def test_rebuild_restores_missing_rows(self):
+        DailyPlan.objects.create(
+            project_member=self.member, date=self.day - datetime.timedelta(days=1), locked_at=timezone.now(),
+        )
+        DailyComplianceSnapshot.objects.all().delete()
+
+        upserted, deleted = rebuild_compliance()
+
+        self.assertEqual((upserted, deleted), (1, 0))
+        self.assertTrue(
+            DailyComplianceSnapshot.objects.get(user=self.user, date=self.day - datetime.timedelta(days=1)).has_plan
+        )
+
+
+class PlanCreateApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="planner", password="x", phone="09120000002", email="planner@example.com",
+        )
+        project = Project.objects.create(title="p", sheet_url="https://example.com/p")
+        cls.member = ProjectMember.objects.create(project=project, user=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("worklog:api_plan_create")
+
+    def _payload(self, **overrides):
+        # همان شکلی که static/js/users_panel/plan_details.js می‌فرستد
+        day = timezone.localdate() + datetime.timedelta(days=2)
+        payload = {
+            "member_id": str(self.member.id),  # form.dataset.memberId
+            "jalali_date": format_jalali_date(day),
+            "achievements": ["دستاورد اول", "دستاورد دوم"],
+            "blocks": [
+                {"start": "08:00", "end": "09:00", "title": "کار صبح", "desc": ""},
+                {"start": "09:00", "end": "10:00", "title": "جلسه", "desc": ""},
+            ],
+            "extras": [{"start": "20:00", "end": "21:00", "title": "اضافه", "desc": "توضیح"}],
+        }
+        payload.update(overrides)
+        return payload
+
+    def _post(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type="application/json")
+
+    def test_wizard_payload_with_string_member_id(self):
+        response = self._post(self._payload())
+
+        self.assertEqual(response.status_code, 201, response.content)
+        plan = DailyPlan.objects.get(pk=response.json()["plan"]["id"])
+        self.assertEqual(plan.project_member, self.member)
+        self.assertEqual(plan.achievements.count(), 2)
+        self.assertEqual(plan.schedule_blocks.count(), 3)
+
+    def test_numeric_member_id(self):
+        response = self._post(self._payload(member_id=self.member.id))
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_invalid_member_id(self):
+        for value in ("abc", [1], True, "1.5", "۱"):
+            with self.subTest(member_id=value):
+                response = self._post(self._payload(member_id=value))
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()["ok"])
+
+    def test_non_list_fields_are_rejected(self):
+        response = self._post(self._payload(achievements="abc"))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(DailyPlan.objects.exists())
+
+
+class PlanCloneTests(TestCase):
+    """قالب‌ها و کپی برنامه روی چند روز (services.clone_plan_to_dates و APIهایش)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="cloner", password="x", phone="09120000003", email="cloner@example.com",
+        )
+        project = Project.objects.create(title="p", sheet_url="https://example.com/p")
+        cls.member = ProjectMember.objects.create(project=project, user=cls.user)
+        cls.today = timezone.localdate()
+
+        cls.source = DailyPlan.objects.create(
+            project_member=cls.member, date=cls.today - datetime.timedelta(days=1), locked_at=timezone.now(),
+        )
+        for idx, title in enumerate(("الف", "ب")):
+            DailyAchievement.objects.create(plan=cls.source, title=title, sort_order=idx)
+        for hour, required in ((8, True), (9, True), (20, False)):
+            DailyScheduleBlock.objects.create(
+                plan=cls.source,
+                start_time=datetime.time(hour, 0),
+                end_time=datetime.time(hour + 1, 0),
+                task_title=f"کار {hour}",
+                is_required=required,
+            )
+
+    def _future(self, n, offset=1):
+        return [self.today + datetime.timedelta(days=offset + i) for i in range(n)]
+
+    def _inserts(self, dates):
+        with CaptureQueriesContext(connection) as ctx:
+            result = clone_plan_to_dates(self.member, self.source, dates)
+        self.assertEqual(len(result.created), len(dates))
+        return sum(1 for q in ctx.captured_queries if q["sql"].lstrip().upper().startswith("INSERT"))
+
+    def test_clone_copies_content_and_lock_time(self):
+        dates = self._future(3)
+        result = clone_plan_to_dates(self.member, self.source, dates)
+
+        self.assertEqual(result.created, dates)
+        self.assertEqual(result.skipped, [])
+        for day in dates:
+            plan = DailyPlan.objects.get(project_member=self.member, date=day)
+            self.assertEqual(plan.locked_at, calc_plan_locked_at(day))
+            self.assertEqual(
+                list(plan.achievements.order_by("sort_order").values_list("title", flat=True)), ["الف", "ب"],
+            )
+            self.assertEqual(
+                list(plan.schedule_blocks.order_by("start_time").values_list("task_title", "is_required")),
+                [("کار 8", True), ("کار 9", True), ("کار 20", False)],
+            )
+            self.assertTrue(DailyComplianceSnapshot.objects.get(user=self.user, date=day).has_plan)
+
+    def test_constant_number_of_inserts(self):
+        few = self._inserts(self._future(2))
+        many = self._inserts(self._future(12, offset=10))
+        self.assertEqual(few, many)
+        # پلن‌ها، دستاوردها، بلاک‌ها، snapshot
+        self.assertLessEqual(many, 4)
+
+    def test_existing_dates_are_skipped(self):
+        taken, free = self._future(2)
+        DailyPlan.objects.create(project_member=self.member, date=taken, locked_at=timezone.now())
+
+        result = clone_plan_to_dates(self.member, self.source, [taken, free])
+
+        self.assertEqual(result.created, [free])
+        self.assertEqual(result.skipped, [taken])
+        self.assertFalse(DailyPlan.objects.get(project_member=self.member, date=taken).achievements.exists())
+
+    def test_past_or_too_many_dates_are_rejected(self):
+        with self.assertRaises(PlanPayloadError):
+            clone_plan_to_dates(self.member, self.source, [self.today])
+        with self.assertRaises(PlanPayloadError):
+            clone_plan_to_dates(self.member, self.source, self._future(MAX_CLONE_DATES + 1))
+        self.assertEqual(DailyPlan.objects.count(), 1)
+
+    def test_template_round_trip(self):
+        template = save_plan_as_template(self.user, self.source, "روز عادی")
+        result = clone_plan_to_dates(self.member, template, self._future(2))
+
+        self.assertEqual(len(result.created), 2)
+        self.assertEqual(DailyScheduleBlock.objects.filter(is_required=False).count(), 3)
+
+    def test_wizard_panel_and_api_flow(self):
+        # همان درخواست‌هایی که static/js/users_panel/plan_clone.js می‌فرستد
+        self.client.force_login(self.user)
+
+        page = self.client.get(reverse("worklog:plan_wizard", kwargs={"member_id": self.member.id}))
+        self.assertContains(page, 'id="clonePanel"')
+        self.assertContains(page, f'value="plan:{self.source.id}"')
+
+        response = self.client.post(
+            reverse("worklog:api_plan_templates"),
+            json.dumps({"plan_id": self.source.id, "title": "روز عادی"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        template_id = response.json()["template"]["id"]
 
-# Create your tests here.
+        start, end = self._future(2)
+        response = self.client.post(
+            reverse("worklog:api_plan_clone"),
+            json.dumps({
+                "member_id": self.member.id,
+                "start_date": format_jalali_date(start),
+                "end_date": format_jalali_date(end),
+                "skip_fridays": False,
+                "template_id": template_id,
+            }),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["created"], [format_jalali_date(start), format_jalali_date(end)])
@@ -1,7 +1,8 @@
 # worklog/urls.py
 from django.urls import path
 from .views import (UserDashboardView, UserProjectsView, UserPlanListView, PlanWizardCreateView, PlanEditView,
-                    UserReportListView, UserReportView ,PlanDeleteView , UserReportDetailView)
+                    UserReportListView, UserReportView ,PlanDeleteView , UserReportDetailView, PlanCreateApiView,
+                    PlanCloneApiView, PlanTemplateApiView)
 
 app_name = "worklog"
 
@@ -17,4 +18,8 @@ urlpatterns = [
 
     path("plans/<int:plan_id>/delete/", PlanDeleteView.as_view(), name="plan_delete"),
 
+    path("api/plans/", PlanCreateApiView.as_view(), name="api_plan_create"),
+    path("api/plans/clone/", PlanCloneApiView.as_view(), name="api_plan_clone"),
+    path("api/plan-templates/", PlanTemplateApiView.as_view(), name="api_plan_templates"),
+
 ]
@@ -1,14 +1,16 @@
 # worklog/views.py
 import json
 from datetime import timedelta, datetime, time
+from urllib.parse import urlencode
 
-import jdatetime
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
 from django.forms import modelformset_factory
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 from django.views import View
@@ -18,46 +20,53 @@ from worklog.forms import DailyPlanForm
 from worklog.models import (
     ProjectMember,
     DailyPlan,
-    DailyAchievement,
     DailyScheduleBlock,
     DailyReport,
     ReportEntry,
     ReportStatus,
-    ReportExtraAction, ReportAchievement,
+    ReportAchievement,
+    PlanTemplate,
 )
 
-from worklog.locks import is_locked, calc_plan_lock, calc_report_lock
+from worklog.dates import (
+    FRIDAY,
+    PERSIAN_DIGITS,
+    PERSIAN_MONTHS,
+    PERSIAN_WEEKDAYS,
+    format_jalali_date,
+    jalali_month_start,
+    parse_jalali_date,
+    to_jalali,
+    to_persian_digits,
+)
+from worklog.jcalendar import parse_jalali_month
+from worklog.locks import is_locked, calc_report_lock
+from worklog.selectors import (
+    filter_jalali_month,
+    filter_jalali_week,
+    get_report_display_rows,
+    latest_user_plan_date_before,
+    list_user_plans,
+    list_user_report_timeline,
+)
 from worklog.validators import assert_plan_editable, assert_report_editable
 from worklog.services import (
     get_or_create_today_report,
-    sync_report_entries_from_plan,
+    materialize_report,
     ensure_report_editable,
+    save_report_submission,
+    submit_plan,
+    PlanPayloadError,
+    MAX_CLONE_DATES,
+    clone_plan_to_dates,
+    save_plan_as_template,
 )
+from admin_panel.activity import log_activity
+from admin_panel.models import ActivityLog
 
 # -----------------------------
 # UI helpers (Persian date text)
 # -----------------------------
-PERSIAN_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
-PERSIAN_MONTHS = {
-    1: "فروردین", 2: "اردیبهشت", 3: "خرداد", 4: "تیر",
-    5: "مرداد", 6: "شهریور", 7: "مهر", 8: "آبان",
-    9: "آذر", 10: "دی", 11: "بهمن", 12: "اسفند",
-}
-PERSIAN_WEEKDAYS = {
-    0: "شنبه",
-    1: "یکشنبه",
-    2: "دوشنبه",
-    3: "سه‌شنبه",
-    4: "چهارشنبه",
-    5: "پنجشنبه",
-    6: "جمعه",
-}
-
-
-def to_persian_digits(s: str) -> str:
-    return str(s).translate(PERSIAN_DIGITS)
-
-
 def format_remaining(td):
     if td.total_seconds() <= 0:
         return "۰ دقیقه"
@@ -105,7 +114,7 @@ class UserDashboardView(LoginRequiredMixin, TemplateView):
             .order_by("-joined_at")
         )
 
-        today_j = jdatetime.date.today()
+        today_j = to_jalali(timezone.localdate())
         jalali_today = f"{today_j.year}/{today_j.month:02d}/{today_j.day:02d}"
 
         display_name = user.full_name or user.username
@@ -176,7 +185,7 @@ class UserProjectsView(LoginRequiredMixin, TemplateView):
 
         projects = []
         for m in memberships:
-            joined_j = jdatetime.date.fromgregorian(date=m.joined_at.date())
+            joined_j = to_jalali(m.joined_at.date())
 
             projects.append({
                 "id": m.project.id,
@@ -198,6 +207,7 @@ class UserProjectsView(LoginRequiredMixin, TemplateView):
 # -----------------------------
 class UserPlanListView(LoginRequiredMixin, TemplateView):
     template_name = "users_panel/plan_list.html"
+    paginate_by = 24
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -212,38 +222,54 @@ class UserPlanListView(LoginRequiredMixin, TemplateView):
         )
         ctx["default_member_id"] = default_member.id if default_member else None
 
-        plans_qs = (
-            DailyPlan.objects
-            .select_related("project_member", "project_member__project")
-            .prefetch_related("achievements", "schedule_blocks")
-            .filter(project_member__user=user, project_member__is_active=True)
-            .order_by("-date")
-        )
+        plans_qs = list_user_plans(user)
+
+        # جستجوی تاریخ سمت سرور (کارت مورد نظر ممکن است در صفحه‌ی فعلی نباشد)
+        date_j = (self.request.GET.get("date_j") or "").strip()
+        if date_j:
+            try:
+                plans_qs = plans_qs.filter(date=parse_jalali_date(date_j))
+            except ValueError:
+                messages.error(self.request, "تاریخ واردشده نامعتبر است.")
+                date_j = ""
+
+        # ?month_j=1404/09 یا ?week_j=<یک تاریخ از هفته>
+        month_j = (self.request.GET.get("month_j") or "").strip()
+        if month_j and not date_j:
+            try:
+                plans_qs = filter_jalali_month(plans_qs, *parse_jalali_month(month_j))
+            except ValueError:
+                messages.error(self.request, "ماه واردشده نامعتبر است.")
+                month_j = ""
+
+        week_j = (self.request.GET.get("week_j") or "").strip()
+        if week_j and not date_j:
+            try:
+                plans_qs = filter_jalali_week(plans_qs, parse_jalali_date(week_j))
+            except ValueError:
+                messages.error(self.request, "تاریخ واردشده نامعتبر است.")
+                week_j = ""
+
+        paginator = Paginator(plans_qs, self.paginate_by)
+        page_obj = paginator.get_page(self.request.GET.get("page"))
 
-        today_g = timezone.localdate()
+        today = timezone.localdate()
         plans = []
 
-        for plan in plans_qs:
-            if not plan.locked_at:
-                plan.locked_at = calc_plan_lock(plan.date)
-                plan.save(update_fields=["locked_at"])
-
-            j = jdatetime.date.fromgregorian(date=plan.date)
-            weekday = PERSIAN_WEEKDAYS.get(j.weekday(), "")
+        for plan in page_obj.object_list:
+            j = to_jalali(plan.date)
+            weekday = PERSIAN_WEEKDAYS.get(j.weekday, "")
             day_num = str(j.day).translate(PERSIAN_DIGITS)
             month_name = PERSIAN_MONTHS.get(j.month, "")
 
-            ach_qs = list(plan.achievements.all().order_by("sort_order", "id")[:3])
-            ach_list = [a.title for a in ach_qs]
-            ach_count = plan.achievements.count()
-            today = timezone.localdate()
-            has_extra = plan.schedule_blocks.filter(is_required=False).exists()
+            ach_list = [a.title for a in plan.top_achievements]
+            ach_count = plan.ach_count
+            has_extra = plan.has_extra
 
             plans.append({
                 "id": plan.id,
                 "is_today": plan.date == today,
                 "is_future": plan.date > today,
-                "is_today": plan.date == today_g,
                 "weekday": weekday,
                 "day_num": day_num,
                 "month_name": month_name,
@@ -255,6 +281,14 @@ class UserPlanListView(LoginRequiredMixin, TemplateView):
             })
 
         ctx["plans"] = plans
+        ctx["page_obj"] = page_obj
+        ctx["is_paginated"] = paginator.num_pages > 1
+        ctx["date_j"] = date_j
+        ctx["month_j"] = month_j
+        ctx["week_j"] = week_j
+        ctx["query_params"] = urlencode(
+            {k: v for k, v in (("date_j", date_j), ("month_j", month_j), ("week_j", week_j)) if v}
+        )
         return ctx
 
 
@@ -300,12 +334,12 @@ class PlanEditView(LoginRequiredMixin, View):
         qs = plan.schedule_blocks.all().order_by("start_time", "id")
         formset = BlockFormSet(queryset=qs)
 
-        j = jdatetime.date.fromgregorian(date=plan.date)
+        j = to_jalali(plan.date)
         ctx = {
             "plan": plan,
             "formset": formset,
             "is_locked": locked,
-            "weekday": PERSIAN_WEEKDAYS.get(j.weekday(), ""),
+            "weekday": PERSIAN_WEEKDAYS.get(j.weekday, ""),
             "day_num": str(j.day).translate(PERSIAN_DIGITS),
             "month_name": PERSIAN_MONTHS.get(j.month, ""),
             "year_num": str(j.year).translate(PERSIAN_DIGITS),
@@ -334,12 +368,12 @@ class PlanEditView(LoginRequiredMixin, View):
 
         if not formset.is_valid():
             messages.error(request, "لطفاً ورودی‌ها را بررسی کنید.")
-            j = jdatetime.date.fromgregorian(date=plan.date)
+            j = to_jalali(plan.date)
             return render(request, self.template_name, {
                 "plan": plan,
                 "formset": formset,
                 "is_locked": False,
-                "weekday": PERSIAN_WEEKDAYS.get(j.weekday(), ""),
+                "weekday": PERSIAN_WEEKDAYS.get(j.weekday, ""),
                 "day_num": str(j.day).translate(PERSIAN_DIGITS),
                 "month_name": PERSIAN_MONTHS.get(j.month, ""),
                 "year_num": str(j.year).translate(PERSIAN_DIGITS),
@@ -354,6 +388,9 @@ class PlanEditView(LoginRequiredMixin, View):
 # -----------------------------
 # Plan Wizard (Create)
 # -----------------------------
+RECENT_PLANS_FOR_CLONE = 14
+
+
 class PlanWizardCreateView(LoginRequiredMixin, FormView):
     template_name = "users_panel/plan_details.html"
     form_class = DailyPlanForm
@@ -378,112 +415,294 @@ class PlanWizardCreateView(LoginRequiredMixin, FormView):
         ctx = super().get_context_data(**kwargs)
         ctx["member"] = self.member
         ctx["back_url"] = reverse("worklog:plans")
+
+        # پنل «کپی برنامه»: قالب‌های کاربر + برنامه‌های اخیر همین عضویت (api/plans/clone/ و api/plan-templates/)
+        ctx["plan_templates"] = PlanTemplate.objects.filter(owner=self.request.user).only("id", "title")
+        ctx["recent_plans"] = [
+            {
+                "id": plan.id,
+                "label": f"{PERSIAN_WEEKDAYS.get(to_jalali(plan.date).weekday, '')} {format_jalali_date(plan.date)}",
+            }
+            for plan in (
+                DailyPlan.objects
+                .filter(project_member=self.member)
+                .only("id", "date")
+                .order_by("-date")[:RECENT_PLANS_FOR_CLONE]
+            )
+        ]
         return ctx
 
     def form_valid(self, form):
-        plan_date = form.cleaned_data["jalali_date"]
-        locked_at = calc_plan_lock(plan_date)
+        # فرم معمولی (بدون JS): همان سرویس API با hiddenهای JSON
+        try:
+            data = {
+                "jalali_date": self.request.POST.get("jalali_date", ""),
+                "achievements": json.loads(self.request.POST.get("achievements_json") or "[]"),
+                "blocks": json.loads(self.request.POST.get("blocks_json") or "[]"),
+                "extras": json.loads(self.request.POST.get("extras_json") or "[]"),
+            }
+        except json.JSONDecodeError:
+            form.add_error(None, "اطلاعات برنامه نامعتبر است. دوباره تلاش کنید.")
+            return self.form_invalid(form)
+
+        try:
+            submit_plan(self.member, data)
+        except PlanPayloadError as e:
+            for err in e.errors:
+                form.add_error(None, err)
+            return self.form_invalid(form)
+
+        return redirect("worklog:plans")
+
+
+def _id_param(data, key):
+    """
+    id از بدنه‌ی JSON: عدد یا رشته‌ی فقط رقم (dataset در JS همیشه رشته است)؛
+    None اگر نباشد، ValueError برای بقیه (مثل "abc" یا [1])
+    """
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{key} باید عدد صحیح باشد.")
+    return value
 
-        plan, created = DailyPlan.objects.get_or_create(
-            project_member=self.member,
-            date=plan_date,
-            defaults={"locked_at": locked_at}
+
+class PlanCreateApiView(LoginRequiredMixin, View):
+    """
+    POST /users_panel/api/plans/  (JSON)
+        {"member_id", "jalali_date", "achievements": [...], "blocks": [...], "extras": [...]}
+
+    201: {"ok": true, "plan": {...}, "redirect_url": ...}
+    400: {"ok": false, "errors": [...]}
+    """
+
+    def post(self, request):
+        try:
+            data = json.loads(request.body or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return JsonResponse({"ok": False, "errors": ["JSON نامعتبر است."]}, status=400)
+
+        try:
+            member_id = _id_param(data, "member_id") if isinstance(data, dict) else None
+        except ValueError as e:
+            return JsonResponse({"ok": False, "errors": [str(e)]}, status=400)
+
+        member = (
+            ProjectMember.objects
+            .select_related("project")
+            .filter(
+                id=member_id,
+                user=request.user,
+                is_active=True,
+                project__is_active=True,
+            )
+            .first()
         )
+        if not member:
+            return JsonResponse({"ok": False, "errors": ["عضویت پروژه یافت نشد یا دسترسی ندارید."]}, status=404)
+
+        try:
+            plan = submit_plan(member, data)
+        except PlanPayloadError as e:
+            return JsonResponse({"ok": False, "errors": e.errors}, status=400)
+
+        return JsonResponse({
+            "ok": True,
+            "plan": {
+                "id": plan.id,
+                "date": plan.date.isoformat(),
+                "jalali_date": format_jalali_date(plan.date),
+                "project": member.project.title,
+                "locked_at": plan.locked_at.isoformat(),
+                "edit_url": reverse("worklog:plan_edit", kwargs={"plan_id": plan.id}),
+            },
+            "redirect_url": reverse("worklog:plans"),
+        }, status=201)
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
 
-        if not created:
-            form.add_error(None, "برای این تاریخ قبلاً برنامه ثبت شده است.")
-            return self.form_invalid(form)
 
-        achievements_raw = self.request.POST.get("achievements_json", "[]")
-        blocks_raw = self.request.POST.get("blocks_json", "[]")
-        extras_raw = self.request.POST.get("extras_json", "[]")
+def _template_json(template):
+    return {
+        "id": template.id,
+        "title": template.title,
+        "achievements": len(template.payload.get("achievements") or []),
+        "blocks": len(template.payload.get("blocks") or []),
+        "updated_at": template.updated_at.isoformat(),
+    }
+
+
+class PlanTemplateApiView(LoginRequiredMixin, View):
+    """
+    GET  /users_panel/api/plan-templates/           قالب‌های کاربر
+    POST /users_panel/api/plan-templates/  (JSON)   {"plan_id", "title"}  ذخیره‌ی یک پلن به عنوان قالب
+    """
+
+    def get(self, request):
+        templates = PlanTemplate.objects.filter(owner=request.user)
+        return JsonResponse({"ok": True, "templates": [_template_json(t) for t in templates]})
+
+    def post(self, request):
+        data = _json_body(request)
+        if data is None:
+            return JsonResponse({"ok": False, "errors": ["JSON نامعتبر است."]}, status=400)
 
         try:
-            achievements = json.loads(achievements_raw) or []
-            blocks = json.loads(blocks_raw) or []
-            extras = json.loads(extras_raw) or []
-        except json.JSONDecodeError:
-            form.add_error(None, "اطلاعات برنامه نامعتبر است. دوباره تلاش کنید.")
-            plan.delete()
-            return self.form_invalid(form)
+            plan_id = _id_param(data, "plan_id")
+        except ValueError as e:
+            return JsonResponse({"ok": False, "errors": [str(e)]}, status=400)
+
+        plan = DailyPlan.objects.filter(
+            id=plan_id,
+            project_member__user=request.user,
+        ).first()
+        if not plan:
+            return JsonResponse({"ok": False, "errors": ["پلن یافت نشد یا دسترسی ندارید."]}, status=404)
 
-        bulk_ach = []
-        for idx, title in enumerate(achievements):
-            title = (title or "").strip()
-            if not title:
-                continue
-            bulk_ach.append(DailyAchievement(plan=plan, title=title, sort_order=idx))
-        if bulk_ach:
-            DailyAchievement.objects.bulk_create(bulk_ach)
-
-        bulk_blocks = []
-
-        for b in blocks:
-            st = (b.get("start") or "").strip()
-            en = (b.get("end") or "").strip()
-            tt = (b.get("title") or "").strip()
-            ds = (b.get("desc") or "").strip()
-            if not (st and en and tt):
-                continue
-            bulk_blocks.append(DailyScheduleBlock(
-                plan=plan,
-                start_time=st,
-                end_time=en,
-                task_title=tt,
-                description=ds,
-                is_required=True,
-            ))
-
-        for b in extras:
-            st = (b.get("start") or "").strip()
-            en = (b.get("end") or "").strip()
-            tt = (b.get("title") or "").strip()
-            ds = (b.get("desc") or "").strip()
-            if not (st and en and tt):
-                continue
-            bulk_blocks.append(DailyScheduleBlock(
-                plan=plan,
-                start_time=st,
-                end_time=en,
-                task_title=tt,
-                description=ds,
-                is_required=False,
-            ))
-
-        if bulk_blocks:
-            DailyScheduleBlock.objects.bulk_create(bulk_blocks)
+        try:
+            template = save_plan_as_template(request.user, plan, data.get("title"))
+        except PlanPayloadError as e:
+            return JsonResponse({"ok": False, "errors": e.errors}, status=400)
+
+        return JsonResponse({"ok": True, "template": _template_json(template)}, status=201)
 
-        return redirect("worklog:plans")
+
+class PlanCloneApiView(LoginRequiredMixin, View):
+    """
+    POST /users_panel/api/plans/clone/  (JSON)
+        {"member_id", "source_plan_id" | "template_id",
+         "start_date", "end_date" (شمسی) | "dates": [...شمسی],
+         "skip_fridays": true}
+
+    200: {"ok": true, "created": [...], "skipped": [...]}
+    400: {"ok": false, "errors": [...]}
+    """
+
+    def _dates(self, data):
+        try:
+            if data.get("dates"):
+                if not isinstance(data["dates"], list):
+                    raise ValueError
+                return [parse_jalali_date(str(d)) for d in data["dates"]]
+            start = parse_jalali_date(str(data.get("start_date") or ""))
+            end = parse_jalali_date(str(data.get("end_date") or ""))
+        except ValueError:
+            raise ValueError("فرمت تاریخ شمسی نادرست است")
+
+        if end < start:
+            raise ValueError("تاریخ پایان قبل از تاریخ شروع است.")
+        if (end - start).days >= MAX_CLONE_DATES * 2:
+            raise ValueError("بازه‌ی تاریخ بیش از حد طولانی است.")
+
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        if data.get("skip_fridays", True):
+            dates = [d for d in dates if to_jalali(d).weekday != FRIDAY]
+        return dates
+
+    def post(self, request):
+        data = _json_body(request)
+        if data is None:
+            return JsonResponse({"ok": False, "errors": ["JSON نامعتبر است."]}, status=400)
+
+        try:
+            member_id = _id_param(data, "member_id")
+            template_id = _id_param(data, "template_id")
+            source_plan_id = _id_param(data, "source_plan_id")
+        except ValueError as e:
+            return JsonResponse({"ok": False, "errors": [str(e)]}, status=400)
+
+        member = ProjectMember.objects.filter(
+            id=member_id,
+            user=request.user,
+            is_active=True,
+            project__is_active=True,
+        ).first()
+        if not member:
+            return JsonResponse({"ok": False, "errors": ["عضویت پروژه یافت نشد یا دسترسی ندارید."]}, status=404)
+
+        if template_id:
+            source = PlanTemplate.objects.filter(id=template_id, owner=request.user).first()
+        else:
+            source = DailyPlan.objects.filter(
+                id=source_plan_id,
+                project_member__user=request.user,
+            ).first()
+        if not source:
+            return JsonResponse({"ok": False, "errors": ["پلن یا قالب مبدأ یافت نشد."]}, status=404)
+
+        try:
+            dates = self._dates(data)
+        except ValueError as e:
+            return JsonResponse({"ok": False, "errors": [str(e)]}, status=400)
+
+        try:
+            result = clone_plan_to_dates(member, source, dates)
+        except PlanPayloadError as e:
+            return JsonResponse({"ok": False, "errors": e.errors}, status=400)
+
+        return JsonResponse({
+            "ok": True,
+            "created": [format_jalali_date(d) for d in result.created],
+            "skipped": [format_jalali_date(d) for d in result.skipped],
+            "redirect_url": reverse("worklog:plans"),
+        })
 
 
 # -----------------------------
 # Reports List
 # -----------------------------
 class UserReportListView(LoginRequiredMixin, TemplateView):
+    """
+    تایم‌لاین گزارش‌ها ماه به ماه (شمسی):
+    صفحه‌ی اول از اول ماه جاری به بعد؛ «بارگذاری ماه قبل» با ?before=<تاریخ شمسی>
+    ماه بعدیِ دارای پلن را به صورت AJAX برمی‌گرداند.
+    """
     template_name = "users_panel/report_list.html"
+    cards_template_name = "users_panel/partials/report_cards.html"
+
+    def is_ajax(self):
+        return self.request.headers.get("x-requested-with") == "XMLHttpRequest"
+
+    def _window(self, user, today):
+        """(start, end)؛ ValueError اگر before نامعتبر باشد"""
+        raw = (self.request.GET.get("before") or "").strip()
+        if not raw:
+            return jalali_month_start(today), None
+
+        before = parse_jalali_date(raw)
+
+        last = latest_user_plan_date_before(user, before)
+        return (jalali_month_start(last) if last else before), before
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         user = self.request.user
 
-        plans_qs = (
-            DailyPlan.objects
-            .select_related("project_member", "project_member__project")
-            .prefetch_related("achievements")
-            .filter(project_member__user=user, project_member__is_active=True)
-            .order_by("-date")
-        )
-
         today = timezone.localdate()
         now = timezone.localtime(timezone.now())
 
-        report_map = {
-            r.date: r
-            for r in DailyReport.objects.filter(
-                project_member__user=user,
-                project_member__is_active=True,
-            )
-        }
+        try:
+            start, end = self._window(user, today)
+        except ValueError:
+            # before خراب: برگرداندن ماه جاری یعنی تکرار همان کارت‌ها در «ماه قبل»؛ نتیجه‌ی خالی و پایان لیست
+            start = None
+
+        if start is None:
+            plans_qs = []
+            ctx["next_before"] = ""
+        else:
+            plans_qs = list_user_report_timeline(user, start, end)
+            has_more = latest_user_plan_date_before(user, start) is not None
+            ctx["next_before"] = format_jalali_date(start) if has_more else ""
 
         reports = []
         priority = None
@@ -491,17 +710,16 @@ class UserReportListView(LoginRequiredMixin, TemplateView):
         today_now_iso = timezone.localtime(timezone.now()).isoformat()
 
         for plan in plans_qs:
-            j = jdatetime.date.fromgregorian(date=plan.date)
+            j = to_jalali(plan.date)
             day_num = to_persian_digits(j.day)
             month_name = PERSIAN_MONTHS.get(j.month, "")
-            weekday = PERSIAN_WEEKDAYS.get(j.weekday(), "")
+            weekday = PERSIAN_WEEKDAYS.get(j.weekday, "")
 
-            existing_report = report_map.get(plan.date)
             is_today = (plan.date == today)
 
             if plan.date > today:
                 status = "future"
-            elif existing_report:
+            elif plan.report_id:
                 status = "completed"
             elif is_today:
                 status = "pending"  # فقط امروز امکان ثبت دارد
@@ -511,7 +729,7 @@ class UserReportListView(LoginRequiredMixin, TemplateView):
             item = {
                 "plan_id": plan.id,  # ✅ صراحتاً
 
-                "report_id": existing_report.id if existing_report else None,
+                "report_id": plan.report_id,
                 "is_today": is_today,
                 "status": status,
                 "title": f"گزارش {weekday}",
@@ -521,10 +739,10 @@ class UserReportListView(LoginRequiredMixin, TemplateView):
             }
 
             if is_today:
-                ach_count = plan.achievements.count()
+                ach_count = plan.ach_count
 
-                if existing_report and existing_report.locked_at:
-                    lock_dt = timezone.localtime(_aware(existing_report.locked_at))
+                if plan.report_locked_at:
+                    lock_dt = timezone.localtime(_aware(plan.report_locked_at))
                 else:
                     lock_dt = timezone.localtime(calc_report_lock(today))
 
@@ -553,6 +771,15 @@ class UserReportListView(LoginRequiredMixin, TemplateView):
         ctx["reports"] = reports
         return ctx
 
+    def render_to_response(self, context, **response_kwargs):
+        if self.is_ajax():
+            return JsonResponse({
+                "ok": True,
+                "html": render_to_string(self.cards_template_name, context, request=self.request),
+                "next_before": context["next_before"],
+            })
+        return super().render_to_response(context, **response_kwargs)
+
 
 # -----------------------------
 # Report submit (REAL)
@@ -587,10 +814,7 @@ class UserReportView(LoginRequiredMixin, View):
             return redirect("worklog:report_list")
 
         report, _ = get_or_create_today_report(plan.project_member, plan)
-        sync_report_entries_from_plan(report)
-
-        for ach in plan.achievements.all():
-            ReportAchievement.objects.get_or_create(report=report, achievement=ach)
+        materialize_report(report, plan)
 
         locked = False
         try:
@@ -598,7 +822,7 @@ class UserReportView(LoginRequiredMixin, View):
         except PermissionDenied:
             locked = True
 
-        j = jdatetime.date.fromgregorian(date=plan.date)
+        j = to_jalali(plan.date)
 
         now = timezone.localtime(timezone.now())
         lock_dt = timezone.localtime(_aware(report.locked_at)) if report.locked_at else None
@@ -608,7 +832,7 @@ class UserReportView(LoginRequiredMixin, View):
             "plan": plan,
             "report": report,
             "is_locked": locked,
-            "weekday": PERSIAN_WEEKDAYS.get(j.weekday(), ""),
+            "weekday": PERSIAN_WEEKDAYS.get(j.weekday, ""),
             "day_num": to_persian_digits(j.day),
             "month_name": PERSIAN_MONTHS.get(j.month, ""),
             "remaining_text": remaining_text,
@@ -638,7 +862,7 @@ class UserReportView(LoginRequiredMixin, View):
             return redirect("worklog:report_list")
 
         report, _ = get_or_create_today_report(plan.project_member, plan)
-        sync_report_entries_from_plan(report)
+        materialize_report(report, plan)
 
         # ✅ lock واقعی
         try:
@@ -647,69 +871,59 @@ class UserReportView(LoginRequiredMixin, View):
             messages.error(request, str(e))
             return redirect("worklog:report", plan_id=plan.id)
 
-        # -------- save timeline --------
-        entries = list(ReportEntry.objects.filter(report=report))
-        entry_map = {e.id: e for e in entries}
+        # -------- parse form --------
+        entry_values = {}
+        achieved_ids = set()
 
         for key, val in request.POST.items():
-            if key.startswith("status_"):
-                try:
-                    eid = int(key.split("_")[1])
-                    if eid in entry_map:
-                        entry_map[eid].status = int(val)
-                except Exception:
-                    pass
-
-            if key.startswith("note_"):
-                try:
-                    eid = int(key.split("_")[1])
-                    if eid in entry_map:
-                        entry_map[eid].note = (val or "").strip()
-                except Exception:
-                    pass
-
-        if entry_map:
-            ReportEntry.objects.bulk_update(entry_map.values(), ["status", "note", "updated_at"])
-
-        # -------- save achievements --------
-        ReportAchievement.objects.filter(report=report).update(achieved=False)
+            prefix, _, raw_id = key.partition("_")
+            if not raw_id.isdigit():
+                continue
+            obj_id = int(raw_id)
 
-        for key in request.POST.keys():
-            if key.startswith("ach_"):
+            if prefix == "status":
                 try:
-                    aid = int(key.split("_")[1])
-                    ReportAchievement.objects.filter(report=report, achievement_id=aid).update(achieved=True)
-                except Exception:
+                    entry_values.setdefault(obj_id, {})["status"] = int(val)
+                except (TypeError, ValueError):
                     pass
-
-        # -------- save extras --------
-        ReportExtraAction.objects.filter(report=report).delete()
+            elif prefix == "note":
+                entry_values.setdefault(obj_id, {})["note"] = (val or "").strip()
+            elif prefix == "ach":
+                achieved_ids.add(obj_id)
 
         extras_raw = request.POST.get("extras_json", "[]")
         try:
-            extras = json.loads(extras_raw) or []
+            extras_json = json.loads(extras_raw) or []
         except Exception:
-            extras = []
+            extras_json = []
 
-        bulk = []
-        for ex in extras:
+        extras = []
+        for ex in extras_json:
             title = (ex.get("title") or "").strip()
             if not title:
                 continue
-            bulk.append(
-                ReportExtraAction(
-                    report=report,
-                    title=title,
-                    description=(ex.get("desc") or "").strip(),
-                    start_time=_parse_time_hhmm(ex.get("start")),
-                    end_time=_parse_time_hhmm(ex.get("end")),
-                )
-            )
+            extra_id = ex.get("id")
+            extras.append({
+                "id": int(extra_id) if str(extra_id or "").isdigit() else None,
+                "title": title,
+                "description": (ex.get("desc") or "").strip(),
+                "start_time": _parse_time_hhmm(ex.get("start")),
+                "end_time": _parse_time_hhmm(ex.get("end")),
+            })
 
-        if bulk:
-            ReportExtraAction.objects.bulk_create(bulk)
+        # -------- save (فقط تغییرات) --------
+        changes = save_report_submission(report, entry_values, achieved_ids, extras)
 
-        messages.success(request, "گزارش ذخیره شد.")
+        if changes.has_changes:
+            log_activity(
+                title=f"ثبت گزارش روزانه توسط {request.user}",
+                meta=f"تغییرات: {changes.summary()}",
+                category=ActivityLog.CATEGORY_USERS,
+                level=ActivityLog.LEVEL_INFO,
+                actor=request.user,
+            )
+
+        messages.success(request, f"گزارش ذخیره شد ({changes.summary()}).")
         return redirect("worklog:report_list")
 
 
@@ -746,14 +960,10 @@ class UserReportDetailView(LoginRequiredMixin, View):
             messages.error(request, "برای این روز گزارشی ثبت نشده است.")
             return redirect("worklog:report_list")
 
-        # برای نمایشِ درست (اگر entry جا مونده باشه)
-        sync_report_entries_from_plan(report)
+        # این صفحه فقط خواندنی است: ردیف‌های جاافتاده در حافظه پر می‌شوند، نه در دیتابیس
+        achievement_states, entries = get_report_display_rows(report, plan)
 
-        # achievements sync (برای نمایش)
-        for ach in plan.achievements.all():
-            ReportAchievement.objects.get_or_create(report=report, achievement=ach)
-
-        j = jdatetime.date.fromgregorian(date=plan.date)
+        j = to_jalali(plan.date)
 
         ctx = {
             "plan": plan,
@@ -761,21 +971,11 @@ class UserReportDetailView(LoginRequiredMixin, View):
 
             "day_num": to_persian_digits(j.day),
             "month_name": PERSIAN_MONTHS.get(j.month, ""),
-            "weekday": PERSIAN_WEEKDAYS.get(j.weekday(), ""),
+            "weekday": PERSIAN_WEEKDAYS.get(j.weekday, ""),
             "created_at_text": timezone.localtime(report.created_at).strftime("%Y/%m/%d - %H:%M"),
 
-            "achievement_states": (
-                ReportAchievement.objects
-                .select_related("achievement")
-                .filter(report=report)
-                .order_by("achievement__sort_order", "achievement__id")
-            ),
-            "entries": (
-                ReportEntry.objects
-                .select_related("schedule_block")
-                .filter(report=report)
-                .order_by("schedule_block__start_time", "schedule_block__id")
-            ),
+            "achievement_states": achievement_states,
+            "entries": entries,
             "extras": report.extra_actions.all().order_by("created_at"),
         }
         return render(request, self.template_name, ctx)
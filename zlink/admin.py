@@ -1,7 +1,8 @@
 # zlink/admin.py
 
 from django.contrib import admin
-from .models import ReCode, Referrer
+from .models import ReCode, Referrer, SmsOutbox
+from .service.sms import requeue
 
 
 @admin.register(ReCode)
@@ -158,3 +159,41 @@ class ReferrerAdmin(admin.ModelAdmin):
         return obj.recode_requests.count()
 
     recode_count.short_description = "تعداد ثبت‌نام"
+
+
+# ==================================================
+# صف پیامک‌ها
+# ==================================================
+
+@admin.register(SmsOutbox)
+class SmsOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "receptor",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+    list_filter = ("status", "created_at")
+    search_fields = ("receptor", "provider_message_id")
+    ordering = ("-created_at",)
+    list_select_related = ("recode",)
+    raw_id_fields = ("recode",)
+
+    readonly_fields = (
+        "attempts",
+        "last_error",
+        "provider_message_id",
+        "provider_response",
+        "created_at",
+        "updated_at",
+        "sent_at",
+    )
+
+    actions = ("requeue_messages",)
+
+    @admin.action(description="ارسال دوباره پیامک‌های انتخاب‌شده")
+    def requeue_messages(self, request, queryset):
+        updated = requeue(queryset)
+        self.message_user(request, f"{updated} پیامک دوباره در صف قرار گرفت.")
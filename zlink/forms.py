@@ -1,38 +1,36 @@
 import re
 from django import forms
 from django.core.exceptions import ValidationError
+
+from accounts.utils.normalize import NormalizedFieldsMixin, canonical_email, canonical_phone, normalize_text
 from .models import ReCode
 
 
-class ReCodeForm(forms.ModelForm):
+class ReCodeForm(NormalizedFieldsMixin, forms.ModelForm):
+    NORMALIZE_TEXT_FIELDS = ("first_name", "last_name")
+    NORMALIZE_PHONE_FIELDS = ("phone",)
+
     class Meta:
         model = ReCode
         fields = ["first_name", "last_name", "phone", "email", "city"]  # ✅ NEW
 
     def clean_phone(self):
-        phone = (self.cleaned_data.get("phone") or "").strip()
+        # +98 / 0098 / ارقام فارسی => 09xxxxxxxxx
+        phone = canonical_phone(self.cleaned_data.get("phone"))
 
         if not re.match(r"^09\d{9}$", phone):
             raise ValidationError("شماره تماس معتبر وارد کنید (مثال: 09xxxxxxxxx).")
 
-        if ReCode.objects.filter(phone=phone).exists():
-            raise ValidationError("این شماره قبلاً ثبت شده است. منتظر تماس تیم آنام باشید.")
-
+        # تکراری بودن شماره و ایمیل با هم در ReCode.clean (یک کوئری) چک می‌شود
         return phone
 
     # ✅ NEW
     def clean_email(self):
-        email = (self.cleaned_data.get("email") or "").strip().lower()
-
-        # EmailField خودش format رو چک می‌کنه؛ اینجا فقط تکراری رو می‌گیریم
-        if ReCode.objects.filter(email__iexact=email).exists():
-            raise ValidationError("این ایمیل قبلاً ثبت شده است. منتظر تماس تیم آنام باشید.")
-
-        return email
+        return canonical_email(self.cleaned_data.get("email"))
 
     # ✅ NEW
     def clean_city(self):
-        city = (self.cleaned_data.get("city") or "").strip()
+        city = normalize_text(self.cleaned_data.get("city"))
 
         if len(city) < 2:
             raise ValidationError("نام شهر را درست وارد کنید.")
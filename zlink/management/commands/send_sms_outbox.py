@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from zlink.service.sms import dispatch_outbox_batch, get_sms_backend
+
+
+class Command(BaseCommand):
+    help = "ارسال پیامک‌های صف SmsOutbox (یک دور یا به صورت دائمی با --loop)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--loop", action="store_true", help="اجرای دائمی به عنوان worker")
+        parser.add_argument("--interval", type=float, default=5.0, help="فاصله بین دورها وقتی صف خالی است (ثانیه)")
+        parser.add_argument("--backend", default=None, help="مسیر کلاس بک‌اند؛ پیش‌فرض settings.SMS_BACKEND")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or getattr(settings, "SMS_OUTBOX_BATCH_SIZE", 50)
+        backend = get_sms_backend(options["backend"])
+
+        while True:
+            stats = dispatch_outbox_batch(batch_size=batch_size, backend=backend)
+
+            if stats["claimed"]:
+                self.stdout.write(
+                    f"claimed={stats['claimed']} sent={stats['sent']} "
+                    f"retry={stats['retry']} failed={stats['failed']}"
+                )
+
+            if not options["loop"]:
+                break
+
+            # اگر دسته پر بود احتمالاً پیام‌های بیشتری در صف هست
+            if stats["claimed"] < batch_size:
+                time.sleep(options["interval"])
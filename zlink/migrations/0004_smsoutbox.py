@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zlink', '0003_referrer_recode_referrer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SmsOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('receptor', models.CharField(db_index=True, max_length=14, verbose_name='گیرنده')),
+                ('message', models.TextField(verbose_name='متن پیام')),
+                ('status', models.CharField(choices=[('pending', 'در صف ارسال'), ('sending', 'در حال ارسال'), ('sent', 'ارسال شده'), ('failed', 'ناموفق')], default='pending', max_length=20, verbose_name='وضعیت')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='تعداد تلاش')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='زمان تلاش بعدی')),
+                ('last_error', models.TextField(blank=True, verbose_name='آخرین خطا')),
+                ('provider_message_id', models.CharField(blank=True, max_length=64, verbose_name='شناسه پیام در سرویس\u200cدهنده')),
+                ('provider_response', models.TextField(blank=True, verbose_name='پاسخ سرویس\u200cدهنده')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='زمان ثبت')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخرین بروزرسانی')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='زمان ارسال')),
+                ('recode', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sms_messages', to='zlink.recode', verbose_name='درخواست Recode')),
+            ],
+            options={
+                'verbose_name': 'پیامک خروجی',
+                'verbose_name_plural': 'صف پیامک\u200cها',
+                'ordering': ('-created_at',),
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='zlink_smsou_status_59db64_idx')],
+            },
+        ),
+    ]
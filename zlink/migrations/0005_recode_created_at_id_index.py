@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zlink', '0004_smsoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recode',
+            index=models.Index(fields=['created_at', 'id'], name='zlink_recod_created_8bac97_idx'),
+        ),
+    ]
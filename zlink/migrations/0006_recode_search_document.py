@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:42
+
+import accounts.utils.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zlink', '0005_recode_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recode',
+            name='search_document',
+            field=accounts.utils.search.SearchDocumentField(blank=True, default='', editable=False),
+        ),
+        accounts.utils.search.backfill_search_documents(
+            'zlink', 'recode',
+            texts=("first_name", "last_name", "email", "city", "referrer__name", "referrer__code"),
+            phones=("phone",),
+        ),
+        accounts.utils.search.fulltext_index('zlink_recode', 'zlink_recode_search_ft'),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+from accounts.utils.normalize import canonical_email, canonical_phone
+
+
+def fill_dedupe_keys(apps, schema_editor):
+    """
+    phone/email به شکل canonical ذخیره می‌شوند و کلید یکتا فقط به اولین
+    ردیفِ هر شماره/ایمیل می‌رسد؛ تکراری‌های قدیمی کلید NULL می‌گیرند
+    (گزارش تکراری‌ها در پنل ادمین پیدایشان می‌کند).
+    """
+    ReCode = apps.get_model("zlink", "ReCode")
+    manager = ReCode._base_manager.using(schema_editor.connection.alias)
+    qs = manager.order_by("pk").values_list("pk", "phone", "email")
+
+    seen_phones, seen_emails = set(), set()
+    last_pk = None
+    while True:
+        page = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+        rows = list(page[:500])
+        if not rows:
+            return
+        objs = []
+        for pk, phone, email in rows:
+            phone = canonical_phone(phone) or phone
+            email = canonical_email(email) or None
+            obj = ReCode(pk=pk, phone=phone, email=email)
+            if phone and phone not in seen_phones:
+                seen_phones.add(phone)
+                obj.phone_key = phone
+            if email and email not in seen_emails:
+                seen_emails.add(email)
+                obj.email_key = email
+            objs.append(obj)
+        manager.bulk_update(objs, ["phone", "email", "phone_key", "email_key"])
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zlink', '0006_recode_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recode',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='recode',
+            name='phone_key',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True),
+        ),
+        migrations.RunPython(fill_dedupe_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='recode',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='recode',
+            name='phone_key',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+    ]
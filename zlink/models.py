@@ -1,4 +1,9 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+from accounts.utils.normalize import canonical_email, canonical_phone
+from accounts.utils.search import SearchDocumentField, SearchDocumentMixin
+from accounts.utils.tracking import TrackedFieldsMixin
 from home.models import STATUS_CHOICES, STATUS_NEW
 
 
@@ -21,7 +26,15 @@ class Referrer(models.Model):
 
 
 
-class ReCode(models.Model):
+class ReCode(SearchDocumentMixin, TrackedFieldsMixin, models.Model):
+    # فیلدهایی که تغییرشان در ActivityLog ثبت می‌شود
+    TRACKED_FIELDS = ("first_name", "last_name", "phone", "email", "city", "status", "notes")
+
+    SEARCH_FIELDS = ("first_name", "last_name", "email", "city")
+    SEARCH_PHONE_FIELDS = ("phone",)
+    SEARCH_SOURCE_FIELDS = ("referrer",)
+    SEARCH_SELECT_RELATED = ("referrer",)
+
     first_name = models.CharField(
         'نام',
         max_length=150
@@ -91,6 +104,13 @@ class ReCode(models.Model):
         auto_now=True
     )
 
+    # جستجوی پنل ادمین (accounts/utils/search.py)
+    search_document = SearchDocumentField()
+
+    # کلیدهای یکتای ضدتکرار (zlink/service/dedupe.py)؛ NULL برای تکراری‌های قدیمی
+    phone_key = models.CharField(max_length=14, null=True, blank=True, unique=True, editable=False)
+    email_key = models.CharField(max_length=254, null=True, blank=True, unique=True, editable=False)
+
     class Meta:
         verbose_name = 'درخواست Recode'
         verbose_name_plural = 'درخواست‌های Recode'
@@ -98,6 +118,7 @@ class ReCode(models.Model):
         indexes = [
             models.Index(fields=['phone']),
             models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['created_at', 'id']),  # صفحه‌بندی cursor
             models.Index(fields=['email']),  # ✅ NEW
             models.Index(fields=['city']),
         ]
@@ -108,3 +129,107 @@ class ReCode(models.Model):
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
+
+    def _changed_contact_fields(self, update_fields=None):
+        if self._state.adding or self.pk is None:
+            return {"phone", "email"}
+        old = self.get_old_tracked_values(update_fields) or {}
+        return {f for f in ("phone", "email") if f in old and old[f] != getattr(self, f)}
+
+    def save(self, *args, **kwargs):
+        # کلیدها فقط برای رکورد جدید یا وقتی phone/email واقعاً عوض شده ساخته می‌شوند؛
+        # ردیف تکراریِ قدیمی با کلید NULL با save وضعیت/یادداشت به IntegrityError نمی‌خورد
+        update_fields = kwargs.get("update_fields")
+        changed = self._changed_contact_fields(update_fields)
+
+        keys = []
+        if "phone" in changed:
+            self.phone_key = canonical_phone(self.phone) or None
+            keys.append("phone_key")
+        if "email" in changed:
+            self.email_key = canonical_email(self.email) or None
+            keys.append("email_key")
+        if keys and update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *keys}
+
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        super().clean()
+        from .service.dedupe import duplicate_errors
+
+        changed = self._changed_contact_fields()
+        errors = duplicate_errors(
+            self.phone if "phone" in changed else None,
+            self.email if "email" in changed else None,
+            exclude_pk=self.pk,
+        )
+        if errors:
+            raise ValidationError(errors)
+
+    def get_search_texts(self):
+        texts = super().get_search_texts()
+        if self.referrer_id:
+            texts += [self.referrer.name, self.referrer.code]
+        return texts
+
+
+class SmsOutbox(models.Model):
+    """
+    صف پیامک‌های خروجی.
+    ویو فقط یک ردیف اینجا ثبت می‌کند و ارسال واقعی را worker
+    (python manage.py send_sms_outbox) انجام می‌دهد.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "در صف ارسال"),
+        (STATUS_SENDING, "در حال ارسال"),
+        (STATUS_SENT, "ارسال شده"),
+        (STATUS_FAILED, "ناموفق"),
+    )
+
+    recode = models.ForeignKey(
+        ReCode,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="sms_messages",
+        verbose_name="درخواست Recode",
+    )
+
+    receptor = models.CharField("گیرنده", max_length=14, db_index=True)
+    message = models.TextField("متن پیام")
+
+    status = models.CharField(
+        "وضعیت",
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+
+    attempts = models.PositiveSmallIntegerField("تعداد تلاش", default=0)
+    next_attempt_at = models.DateTimeField("زمان تلاش بعدی", default=timezone.now)
+
+    last_error = models.TextField("آخرین خطا", blank=True)
+    provider_message_id = models.CharField("شناسه پیام در سرویس‌دهنده", max_length=64, blank=True)
+    provider_response = models.TextField("پاسخ سرویس‌دهنده", blank=True)
+
+    created_at = models.DateTimeField("زمان ثبت", auto_now_add=True)
+    updated_at = models.DateTimeField("آخرین بروزرسانی", auto_now=True)
+    sent_at = models.DateTimeField("زمان ارسال", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "پیامک خروجی"
+        verbose_name_plural = "صف پیامک‌ها"
+        ordering = ("-created_at",)
+        indexes = [
+            # کوئری اصلی worker: status + next_attempt_at
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.receptor} - {self.get_status_display()}"
@@ -0,0 +1,123 @@
+# zlink/service/dedupe.py
+"""
+تشخیص درخواست تکراری ReCode با کلیدهای canonical.
+
+- phone_key / email_key (یکتا، روی ReCode) شکل canonical شماره و ایمیل‌اند
+  (canonical_phone / canonical_email)؛ چک قبل از ثبت یک کوئری روی دو ایندکس یکتاست
+  و یکتایی خود دیتابیس جلوی ثبت هم‌زمان دو درخواست یکسان را می‌گیرد.
+- تکراری‌هایی که قبل از این کلیدها ثبت شده‌اند کلید NULL دارند؛ گزارش
+  find_duplicates آن‌ها را با GROUP BY روی phone/email (که خودشان canonical
+  ذخیره می‌شوند) پیدا می‌کند، نه با مقایسه‌ی دوبه‌دو.
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+from django.db.models import CharField, Count, Max, Min, Q, Value
+
+from accounts.utils.normalize import canonical_email, canonical_phone
+from zlink.models import ReCode
+
+PHONE_TAKEN = "این شماره قبلاً ثبت شده است. منتظر تماس تیم آنام باشید."
+EMAIL_TAKEN = "این ایمیل قبلاً ثبت شده است. منتظر تماس تیم آنام باشید."
+
+KIND_PHONE = "phone"
+KIND_EMAIL = "email"
+
+
+def duplicate_errors(phone=None, email=None, exclude_pk=None):
+    """
+    {"phone": [...], "email": [...]} برای فیلدهایی که قبلاً ثبت شده‌اند (یا {}).
+    هر دو کلید در یک کوئری چک می‌شوند.
+    """
+    phone_key = canonical_phone(phone) or None
+    email_key = canonical_email(email) or None
+
+    lookup = Q()
+    if phone_key:
+        lookup |= Q(phone_key=phone_key)
+    if email_key:
+        lookup |= Q(email_key=email_key)
+    if not lookup:
+        return {}
+
+    qs = ReCode.objects.filter(lookup).order_by()
+    if exclude_pk:
+        qs = qs.exclude(pk=exclude_pk)
+
+    errors = {}
+    for found_phone, found_email in qs.values_list("phone_key", "email_key")[:2]:
+        if phone_key and found_phone == phone_key:
+            errors["phone"] = [PHONE_TAKEN]
+        if email_key and found_email == email_key:
+            errors["email"] = [EMAIL_TAKEN]
+    return errors
+
+
+def integrity_errors(exc):
+    """IntegrityError یکتایی phone_key/email_key (ثبت هم‌زمان) => همان errors بالا"""
+    message = str(exc)
+    errors = {}
+    if "phone_key" in message:
+        errors["phone"] = [PHONE_TAKEN]
+    if "email_key" in message:
+        errors["email"] = [EMAIL_TAKEN]
+    return errors
+
+
+# ---------- report ----------
+
+@dataclass
+class DuplicateGroup:
+    kind: str
+    key: str
+    count: int
+    first_at: object
+    last_at: object
+    items: List[ReCode] = field(default_factory=list)
+
+
+def find_duplicates(limit=200):
+    """
+    گروه‌های تکراری (شماره یا ایمیل یکسان) به ترتیب تعداد.
+    یک کوئری GROUP BY (UNION روی phone و email) + یک کوئری برای ردیف‌های گروه‌ها.
+    """
+    def grouped(kind, column):
+        return (
+            ReCode.objects
+            .exclude(**{f"{column}__isnull": True})
+            .exclude(**{column: ""})
+            .order_by()
+            .values(column)
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+            .values_list(
+                Value(kind, output_field=CharField()),
+                column,
+                "n",
+                Min("created_at"),
+                Max("created_at"),
+            )
+        )
+
+    rows = grouped(KIND_PHONE, "phone").union(grouped(KIND_EMAIL, "email"), all=True)
+    groups = [DuplicateGroup(*row) for row in rows]
+    groups.sort(key=lambda g: (-g.count, g.kind, g.key))
+    groups = groups[:limit]
+    if not groups:
+        return []
+
+    phones = {g.key for g in groups if g.kind == KIND_PHONE}
+    emails = {g.key for g in groups if g.kind == KIND_EMAIL}
+    by_key = {(g.kind, g.key): g for g in groups}
+    items = (
+        ReCode.objects
+        .filter(Q(phone__in=phones) | Q(email__in=emails))
+        .select_related("referrer")
+        .order_by("created_at", "id")
+    )
+    for obj in items:
+        for kind, key in ((KIND_PHONE, obj.phone), (KIND_EMAIL, obj.email)):
+            group = by_key.get((kind, key))
+            if group is not None:
+                group.items.append(obj)
+    return groups
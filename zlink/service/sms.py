@@ -0,0 +1,233 @@
+# zlink/service/sms.py
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from zlink.models import SmsOutbox
+
+DEFAULT_LINE_NUMBER = "30005006008562"
+
+
+# ---------- messages ----------
+
+def build_recode_message(first_name):
+    return (
+        f"{first_name} عزیز،\n"
+        "ثبت درخواست شما با موفقیت انجام شد.\n"
+        "کارشناسان ما در اسرع وقت با شما در ارتباط خواهند بود."
+    )
+
+
+def enqueue_sms(receptor, message, recode=None):
+    """
+    فقط یک ردیف در صف ثبت می‌شود؛ ارسال واقعی با worker است.
+    """
+    return SmsOutbox.objects.create(
+        recode=recode,
+        receptor=receptor,
+        message=message,
+    )
+
+
+# ---------- backends ----------
+
+@dataclass
+class SendResult:
+    ok: bool
+    message_id: str = ""
+    error: str = ""
+    response: str = ""
+
+
+class BaseSmsBackend:
+    def send_messages(self, messages: List[SmsOutbox]) -> List[SendResult]:
+        """
+        برای هر پیام دقیقاً یک SendResult (به همان ترتیب) برمی‌گرداند.
+        """
+        raise NotImplementedError
+
+
+class GhasedakBackend(BaseSmsBackend):
+    """
+    ارسال دسته‌ای با SendPairToPairSMS (هر گیرنده متن خودش را دارد).
+    """
+
+    def __init__(self):
+        import ghasedak_sms
+
+        self.sdk = ghasedak_sms
+        self.api = ghasedak_sms.Ghasedak(settings.GHASEDAK_API_KEY)
+        self.line_number = str(getattr(settings, "GHASEDAK_LINE_NUMBER", "") or DEFAULT_LINE_NUMBER)
+
+    def send_messages(self, messages):
+        dto = self.sdk.SendPairToPairInput
+        items = [
+            dto.SendPairToPairSmsWebServiceDto(
+                line_number=self.line_number,
+                receptor=m.receptor,
+                message=m.message,
+                client_reference_id=str(m.pk),
+            )
+            for m in messages
+        ]
+
+        try:
+            response = self.api.send_pair_to_pair_sms(dto(items=items))
+        except Exception as e:
+            return [SendResult(ok=False, error=str(e)) for _ in messages]
+
+        if not isinstance(response, dict):
+            # ResponseDto در حالت خطای شبکه
+            error = getattr(response, "message", "") or str(response)
+            return [SendResult(ok=False, error=error) for _ in messages]
+
+        raw = json.dumps(response, ensure_ascii=False, default=str)
+        if not response.get("isSuccess"):
+            error = str(response.get("message") or "ارسال ناموفق")
+            return [SendResult(ok=False, error=error, response=raw) for _ in messages]
+
+        data = response.get("data") or {}
+        items_out = data.get("items") if isinstance(data, dict) else data
+        items_out = items_out or []
+
+        results = []
+        for i, _ in enumerate(messages):
+            item = items_out[i] if i < len(items_out) else {}
+            results.append(SendResult(
+                ok=True,
+                message_id=str(item.get("messageId") or ""),
+                response=raw,
+            ))
+        return results
+
+
+class LocalStubBackend(BaseSmsBackend):
+    """
+    بک‌اند محلی برای توسعه و تست؛ هیچ درخواستی به قاصدک نمی‌رود.
+    پیام‌ها در self.sent همان instance جمع می‌شوند (بین instanceها و تست‌ها مشترک نیست).
+    اگر شماره گیرنده در fail_receptors باشد، ارسال ناموفق برمی‌گردد.
+    """
+
+    def __init__(self, fail_receptors=()):
+        self.sent: List[SmsOutbox] = []
+        self.fail_receptors = set(fail_receptors)
+
+    def send_messages(self, messages):
+        results = []
+        for m in messages:
+            if m.receptor in self.fail_receptors:
+                results.append(SendResult(ok=False, error="stub failure"))
+                continue
+            self.sent.append(m)
+            results.append(SendResult(ok=True, message_id=f"stub-{m.pk}", response="stub"))
+        return results
+
+
+def get_sms_backend(path=None):
+    path = path or getattr(settings, "SMS_BACKEND", "zlink.service.sms.GhasedakBackend")
+    return import_string(path)()
+
+
+# ---------- worker ----------
+
+def retry_delay(attempts):
+    """
+    backoff نمایی: 30s, 60s, 120s, ... (با سقف)
+    """
+    base = getattr(settings, "SMS_OUTBOX_RETRY_BASE_SECONDS", 30)
+    cap = getattr(settings, "SMS_OUTBOX_RETRY_MAX_SECONDS", 3600)
+    return timedelta(seconds=min(cap, base * (2 ** max(attempts - 1, 0))))
+
+
+def claim_batch(batch_size):
+    """
+    یک دسته از پیام‌های آماده را قفل و به حالت «در حال ارسال» می‌برد.
+    پیام‌های sending که lease آن‌ها تمام شده (worker قبلی crash کرده) دوباره برداشته می‌شوند.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, "SMS_OUTBOX_LEASE_SECONDS", 300))
+
+    with transaction.atomic():
+        batch = list(
+            SmsOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=SmsOutbox.STATUS_PENDING) | Q(status=SmsOutbox.STATUS_SENDING),
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+
+        for m in batch:
+            m.status = SmsOutbox.STATUS_SENDING
+            m.attempts += 1
+            m.next_attempt_at = now + lease
+            m.updated_at = now
+
+        if batch:
+            SmsOutbox.objects.bulk_update(batch, ["status", "attempts", "next_attempt_at", "updated_at"])
+
+    return batch
+
+
+def dispatch_outbox_batch(batch_size=None, backend=None):
+    """
+    یک دور از worker: برداشتن دسته، ارسال، ثبت نتیجه.
+    خروجی: {"claimed": n, "sent": n, "retry": n, "failed": n}
+    """
+    batch_size = batch_size or getattr(settings, "SMS_OUTBOX_BATCH_SIZE", 50)
+    max_attempts = getattr(settings, "SMS_OUTBOX_MAX_ATTEMPTS", 5)
+
+    batch = claim_batch(batch_size)
+    stats = {"claimed": len(batch), "sent": 0, "retry": 0, "failed": 0}
+    if not batch:
+        return stats
+
+    backend = backend or get_sms_backend()
+    results = backend.send_messages(batch)
+    now = timezone.now()
+
+    for m, result in zip(batch, results):
+        m.provider_response = result.response or ""
+        m.updated_at = now
+
+        if result.ok:
+            m.status = SmsOutbox.STATUS_SENT
+            m.sent_at = now
+            m.provider_message_id = result.message_id or ""
+            m.last_error = ""
+            stats["sent"] += 1
+        elif m.attempts >= max_attempts:
+            m.status = SmsOutbox.STATUS_FAILED
+            m.last_error = result.error
+            stats["failed"] += 1
+        else:
+            m.status = SmsOutbox.STATUS_PENDING
+            m.next_attempt_at = now + retry_delay(m.attempts)
+            m.last_error = result.error
+            stats["retry"] += 1
+
+    SmsOutbox.objects.bulk_update(
+        batch,
+        ["status", "sent_at", "provider_message_id", "provider_response", "last_error", "next_attempt_at",
+         "updated_at"],
+    )
+    return stats
+
+
+def requeue(queryset):
+    """برای اکشن ادمین: پیام‌های ناموفق دوباره به صف برمی‌گردند."""
+    now = timezone.now()
+    return queryset.exclude(status=SmsOutbox.STATUS_SENT).update(
+        status=SmsOutbox.STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        updated_at=now,
+    )
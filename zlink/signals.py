@@ -1,25 +1,16 @@
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import ReCode
+from .models import ReCode, Referrer
 from admin_panel.models import ActivityLog
+from admin_panel.activity import log_activity
+from accounts.utils.search import rebuild_search_documents
 from accounts.utils.threadlocal import get_current_user
 
 
-# ✅ NEW: email و city اضافه شد
-TRACKED_FIELDS = ["first_name", "last_name", "phone", "email", "city", "status", "notes"]
-
-
 @receiver(pre_save, sender=ReCode)
-def recode_pre_save(sender, instance, **kwargs):
-    if not instance.pk:
-        instance._old_state = None
-        return
-
-    try:
-        old_obj = sender.objects.get(pk=instance.pk)
-        instance._old_state = old_obj
-    except sender.DoesNotExist:
-        instance._old_state = None
+def recode_pre_save(sender, instance, update_fields=None, **kwargs):
+    # مقادیر قبلی از snapshot خود instance (بدون SELECT اضافه)
+    instance._old_state = instance.get_old_tracked_values(update_fields)
 
 
 @receiver(post_save, sender=ReCode)
@@ -27,7 +18,7 @@ def recode_post_save(sender, instance, created, **kwargs):
     user = get_current_user()
 
     if created:
-        ActivityLog.objects.create(
+        log_activity(
             title="ثبت درخواست جدید Recode",
             meta=f"{instance.full_name} · شماره تماس: {instance.phone}",
             category=ActivityLog.CATEGORY_CONTRACTS,
@@ -43,8 +34,7 @@ def recode_post_save(sender, instance, created, **kwargs):
     changed_fields = []
     changes_detail = []
 
-    for field in TRACKED_FIELDS:
-        old_val = getattr(old, field, None)
+    for field, old_val in old.items():
         new_val = getattr(instance, field, None)
 
         if old_val != new_val:
@@ -56,7 +46,7 @@ def recode_post_save(sender, instance, created, **kwargs):
 
     changes_str = " | ".join(changes_detail)
 
-    ActivityLog.objects.create(
+    log_activity(
         title="ویرایش درخواست Recode",
         meta=f"{instance.full_name} – تغییرات: {changes_str}",
         category=ActivityLog.CATEGORY_CONTRACTS,
@@ -69,10 +59,18 @@ def recode_post_save(sender, instance, created, **kwargs):
 def recode_post_delete(sender, instance, **kwargs):
     user = get_current_user()
 
-    ActivityLog.objects.create(
+    log_activity(
         title="حذف درخواست Recode",
         meta=f"{instance.full_name} · {instance.phone}",
         category=ActivityLog.CATEGORY_CONTRACTS,
         level=ActivityLog.LEVEL_WARNING,
         actor=user,
     )
+
+
+@receiver(post_save, sender=Referrer)
+def referrer_post_save(sender, instance, created, **kwargs):
+    # نام/کد معرف داخل search_document درخواست‌هایش هست
+    if created:
+        return
+    rebuild_search_documents(ReCode, ReCode.objects.filter(referrer=instance))
@@ -1,3 +1,165 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from zlink.models import SmsOutbox
+from zlink.service.sms import (
+    LocalStubBackend,
+    claim_batch,
+    dispatch_outbox_batch,
+    enqueue_sms,
+    get_sms_backend,
+    requeue,
+)
+
+
+@override_settings(
+    SMS_OUTBOX_BATCH_SIZE=50,
+    SMS_OUTBOX_MAX_ATTEMPTS=3,
+    SMS_OUTBOX_RETRY_BASE_SECONDS=30,
+    SMS_OUTBOX_RETRY_MAX_SECONDS=3600,
+    SMS_OUTBOX_LEASE_SECONDS=300,
+)
+class SmsOutboxWorkerTests(TestCase):
+    """worker صف پیامک (dispatch_outbox_batch) روی LocalStubBackend"""
+
+    OK = "09120000001"
+    BAD = "09120000002"
+
+    def setUp(self):
+        self.backend = LocalStubBackend(fail_receptors={self.BAD})
+
+    def _make_due(self, *messages):
+        # به جای صبر برای backoff، زمان تلاش بعدی را به گذشته می‌بریم
+        SmsOutbox.objects.filter(pk__in=[m.pk for m in messages]).update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+
+    def test_sends_and_records_status(self):
+        first = enqueue_sms(self.OK, "سلام")
+        second = enqueue_sms(self.OK, "سلام دوباره")
+
+        stats = dispatch_outbox_batch(backend=self.backend)
+
+        self.assertEqual(stats, {"claimed": 2, "sent": 2, "retry": 0, "failed": 0})
+        self.assertEqual([m.pk for m in self.backend.sent], [first.pk, second.pk])
+        for m in (first, second):
+            m.refresh_from_db()
+            self.assertEqual(m.status, SmsOutbox.STATUS_SENT)
+            self.assertEqual(m.attempts, 1)
+            self.assertEqual(m.provider_message_id, f"stub-{m.pk}")
+            self.assertEqual(m.provider_response, "stub")
+            self.assertEqual(m.last_error, "")
+            self.assertIsNotNone(m.sent_at)
+
+        # چیزی برای ارسال دوباره نمانده
+        self.assertEqual(dispatch_outbox_batch(backend=self.backend)["claimed"], 0)
+
+    def test_failure_is_retried_with_backoff(self):
+        msg = enqueue_sms(self.BAD, "x")
+
+        before = timezone.now()
+        stats = dispatch_outbox_batch(backend=self.backend)
+        after = timezone.now()
+
+        self.assertEqual(stats, {"claimed": 1, "sent": 0, "retry": 1, "failed": 0})
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, SmsOutbox.STATUS_PENDING)
+        self.assertEqual(msg.attempts, 1)
+        self.assertEqual(msg.last_error, "stub failure")
+        self.assertTrue(before + timedelta(seconds=30) <= msg.next_attempt_at <= after + timedelta(seconds=30))
+
+        # تا زمان تلاش بعدی برداشته نمی‌شود
+        self.assertEqual(dispatch_outbox_batch(backend=self.backend)["claimed"], 0)
+
+        self._make_due(msg)
+        before = timezone.now()
+        dispatch_outbox_batch(backend=self.backend)
+        after = timezone.now()
+
+        msg.refresh_from_db()
+        self.assertEqual(msg.attempts, 2)
+        self.assertTrue(before + timedelta(seconds=60) <= msg.next_attempt_at <= after + timedelta(seconds=60))
+
+    def test_gives_up_after_max_attempts(self):
+        msg = enqueue_sms(self.BAD, "x")
+
+        for _ in range(3):
+            self._make_due(msg)
+            stats = dispatch_outbox_batch(backend=self.backend)
+
+        self.assertEqual(stats, {"claimed": 1, "sent": 0, "retry": 0, "failed": 1})
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, SmsOutbox.STATUS_FAILED)
+        self.assertEqual(msg.attempts, 3)
+
+        self._make_due(msg)
+        self.assertEqual(dispatch_outbox_batch(backend=self.backend)["claimed"], 0)
+
+    def test_mixed_batch_records_each_result(self):
+        ok = enqueue_sms(self.OK, "a")
+        bad = enqueue_sms(self.BAD, "b")
+
+        stats = dispatch_outbox_batch(backend=self.backend)
+
+        self.assertEqual(stats, {"claimed": 2, "sent": 1, "retry": 1, "failed": 0})
+        ok.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual(ok.status, SmsOutbox.STATUS_SENT)
+        self.assertEqual(bad.status, SmsOutbox.STATUS_PENDING)
+        self.assertEqual([m.pk for m in self.backend.sent], [ok.pk])
+
+    def test_claim_respects_batch_size_and_order(self):
+        messages = [enqueue_sms(self.OK, str(i)) for i in range(3)]
+        future = enqueue_sms(self.OK, "later")
+        SmsOutbox.objects.filter(pk=future.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        first = claim_batch(2)
+        second = claim_batch(2)
+
+        self.assertEqual([m.pk for m in first], [messages[0].pk, messages[1].pk])
+        self.assertEqual([m.pk for m in second], [messages[2].pk])
+        for m in first + second:
+            m.refresh_from_db()
+            self.assertEqual(m.status, SmsOutbox.STATUS_SENDING)
+            self.assertEqual(m.attempts, 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        msg = enqueue_sms(self.OK, "x")
+        claim_batch(10)  # worker قبلی برداشت و crash کرد
+
+        self.assertEqual(claim_batch(10), [])
+
+        self._make_due(msg)
+        stats = dispatch_outbox_batch(backend=self.backend)
+
+        self.assertEqual(stats["sent"], 1)
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, SmsOutbox.STATUS_SENT)
+        self.assertEqual(msg.attempts, 2)
+
+    def test_requeue_resets_failed_only(self):
+        sent = enqueue_sms(self.OK, "a")
+        failed = enqueue_sms(self.BAD, "b")
+        SmsOutbox.objects.filter(pk=sent.pk).update(status=SmsOutbox.STATUS_SENT, attempts=1)
+        SmsOutbox.objects.filter(pk=failed.pk).update(status=SmsOutbox.STATUS_FAILED, attempts=3)
+
+        self.assertEqual(requeue(SmsOutbox.objects.all()), 1)
+
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, SmsOutbox.STATUS_PENDING)
+        self.assertEqual(failed.attempts, 0)
+        sent.refresh_from_db()
+        self.assertEqual(sent.status, SmsOutbox.STATUS_SENT)
+
+    def test_stub_state_is_per_instance(self):
+        enqueue_sms(self.OK, "a")
+        dispatch_outbox_batch(backend=self.backend)
+
+        self.assertEqual(len(self.backend.sent), 1)
+        self.assertEqual(LocalStubBackend().sent, [])
+
+    @override_settings(SMS_BACKEND="zlink.service.sms.LocalStubBackend")
+    def test_backend_from_settings(self):
+        self.assertIsInstance(get_sms_backend(), LocalStubBackend)
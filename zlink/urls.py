@@ -1,10 +1,12 @@
 from django.urls import path
+
+from Config.ratelimit import ratelimit
 from . import views
 
 app_name = 'zlink'
 
 urlpatterns = [
-    path('ReCode/', views.ReCodeView.as_view(), name='recode'),
-    path("ReCode/<slug:ref>/", views.ReCodeView.as_view(), name="recode_ref"),
+    path('ReCode/', ratelimit("recode")(views.ReCodeView.as_view()), name='recode'),
+    path("ReCode/<slug:ref>/", ratelimit("recode")(views.ReCodeView.as_view()), name="recode_ref"),
 
 ]
\ No newline at end of file
@@ -1,12 +1,12 @@
+from django.db import IntegrityError, transaction
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 from django.http import JsonResponse, HttpResponseRedirect
-from django.conf import settings
-
-import ghasedak_sms
 
 from .models import ReCode, Referrer
 from .forms import ReCodeForm
+from .service.dedupe import integrity_errors
+from .service.sms import enqueue_sms, build_recode_message
 
 
 class ReCodeView(CreateView):
@@ -37,56 +37,31 @@ class ReCodeView(CreateView):
         else:
             obj.referrer = None  # ✅ وقتی خالیه برای هیچکس ثبت نشه
 
-        obj.save()
-        self.object = obj
-
-        # ===== SMS =====
-        phone = obj.phone
-        first_name = obj.first_name
-
-        sms_sent = False
-        sms_error = None
-
         try:
-            sms_api = ghasedak_sms.Ghasedak(settings.GHASEDAK_API_KEY)
-
-            message = (
-                f"{first_name} عزیز،\n"
-                "ثبت درخواست شما با موفقیت انجام شد.\n"
-                "کارشناسان ما در اسرع وقت با شما در ارتباط خواهند بود."
-            )
+            with transaction.atomic():
+                obj.save()
+
+                # ===== SMS =====
+                # ارسال واقعی در worker انجام می‌شود (python manage.py send_sms_outbox)
+                enqueue_sms(obj.phone, build_recode_message(obj.first_name), recode=obj)
+        except IntegrityError as exc:
+            # دو ثبت هم‌زمان با یک شماره/ایمیل: ایندکس یکتای phone_key/email_key
+            errors = integrity_errors(exc)
+            if not errors:
+                raise
+            for name, messages in errors.items():
+                form.add_error(name, messages)
+            return self.form_invalid(form)
 
-            line_number = getattr(settings, "GHASEDAK_LINE_NUMBER", "") or "30005006008562"
-
-            response = sms_api.send_single_sms(
-                ghasedak_sms.SendSingleSmsInput(
-                    message=message,
-                    receptor=phone,
-                    line_number=str(line_number),
-                )
-            )
-
-            print("✅ SMS API RESPONSE:", response)
-            sms_sent = True
-
-        except ghasedak_sms.error.ApiException as e:
-            sms_error = str(e)
-            print("❌ SMS ApiException:", sms_error)
-
-        except Exception as e:
-            sms_error = str(e)
-            print("❌ SMS Unexpected Exception:", sms_error)
+        self.object = obj
 
         # ===== AJAX =====
         if self.is_ajax():
-            payload = {
+            return JsonResponse({
                 "ok": True,
                 "message": "درخواستت ثبت شد. تیم آنام به‌زودی با تو تماس می‌گیرد.",
-                "sms_sent": sms_sent,
-            }
-            if sms_error:
-                payload["sms_error"] = sms_error
-            return JsonResponse(payload, status=200)
+                "sms_queued": True,
+            }, status=200)
 
         return HttpResponseRedirect(self.get_success_url())
 